@@ -0,0 +1,179 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import aspecd.exceptions
+
+import uvvispy.benchmark
+import uvvispy.dataset
+
+
+
+def run_coroutine(coroutine):
+    # asyncio.run() requires Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestSyntheticDataGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.generator = uvvispy.benchmark.SyntheticDataGenerator(
+            directory=self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_generate_without_directory_raises(self):
+        self.generator.directory = ''
+        with self.assertRaises(aspecd.exceptions.MissingTargetError):
+            self.generator.generate()
+
+    def test_generate_writes_files_with_metadata(self):
+        self.generator.n_files = 3
+        filenames = self.generator.generate()
+        self.assertEqual(3, len(filenames))
+        for filename in filenames:
+            self.assertTrue(os.path.exists(filename))
+            self.assertTrue(os.path.exists(
+                os.path.splitext(filename)[0] + '.yaml'))
+
+    def test_generate_without_metadata_writes_no_metadata_files(self):
+        self.generator.metadata = False
+        self.generator.generate()
+        self.assertEqual(1, len(os.listdir(self.directory)))
+
+    def test_generated_files_can_be_imported(self):
+        self.generator.n_points = 123
+        self.generator.n_files = 2
+        filenames = self.generator.generate()
+        factory = uvvispy.dataset.DatasetFactory()
+        dataset = factory.get_dataset(source=filenames[1])
+        self.assertEqual((123,), dataset.data.data.shape)
+        self.assertEqual('synthetic-1', dataset.metadata.sample.name)
+
+
+class TestDelayedFileReader(unittest.TestCase):
+
+    def setUp(self):
+        self.reader = uvvispy.benchmark.DelayedFileReader(delay=0.05)
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_read_is_delayed(self):
+        start = time.perf_counter()
+        contents = run_coroutine(self.reader.read('testdata/sa281-02-280K.txt'))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+        self.assertTrue(contents)
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.benchmark = uvvispy.benchmark.Benchmark()
+        self.benchmark.cases = [(100, 2)]
+        self.benchmark.repeat = 1
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'baseline.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write_baseline(self, time=1.):
+        results = [dict(result, time=time)
+                   for result in self.benchmark.results]
+        with open(self.filename, 'w') as file:
+            json.dump({'results': results}, file)
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_run_returns_result_for_each_target(self):
+        results = self.benchmark.run()
+        self.assertEqual(self.benchmark.targets,
+                         [result['target'] for result in results])
+
+    def test_results_contain_throughput_and_memory(self):
+        result = self.benchmark.run()[0]
+        for key in ['time', 'files_per_second', 'points_per_second',
+                    'megabytes_per_second', 'peak_memory']:
+            self.assertGreater(result[key], 0)
+
+    def test_save_writes_results_and_environment(self):
+        self.benchmark.run()
+        self.benchmark.save(self.filename)
+        with open(self.filename) as file:
+            contents = json.load(file)
+        self.assertIn('environment', contents)
+        self.assertEqual(self.benchmark.results, contents['results'])
+
+    def test_compare_returns_slowdowns(self):
+        self.benchmark.targets = ['importer']
+        self.benchmark.run()
+        self._write_baseline(time=self.benchmark.results[0]['time'] / 2)
+        slowdowns = self.benchmark.compare(self.filename)
+        self.assertEqual(1, len(slowdowns))
+        self.assertAlmostEqual(2., slowdowns[0]['ratio'])
+
+    def test_compare_ignores_slowdowns_within_tolerance(self):
+        self.benchmark.targets = ['importer']
+        self.benchmark.run()
+        self._write_baseline(time=self.benchmark.results[0]['time'] / 1.1)
+        self.assertEqual([], self.benchmark.compare(self.filename))
+
+    def test_compare_ignores_cases_missing_in_baseline(self):
+        self.benchmark.targets = ['importer']
+        self.benchmark.run()
+        with open(self.filename, 'w') as file:
+            json.dump({'results': []}, file)
+        self.assertEqual([], self.benchmark.compare(self.filename))
+
+    def test_report_contains_line_for_each_result(self):
+        self.benchmark.run()
+        self.assertEqual(len(self.benchmark.results) + 1,
+                         len(self.benchmark.report().splitlines()))
+
+
+class TestMain(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'results.json')
+        self.arguments = ['--case', '100', '1', '--target', 'importer',
+                          '--repeat', '1']
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _main(self, arguments):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return uvvispy.benchmark.main(arguments)
+
+    def test_main_saves_results(self):
+        self.assertEqual(0, self._main(self.arguments
+                                       + ['--save', self.filename]))
+        self.assertTrue(os.path.exists(self.filename))
+
+    def test_main_with_slowdown_returns_nonzero_status(self):
+        self._main(self.arguments + ['--save', self.filename])
+        with open(self.filename) as file:
+            contents = json.load(file)
+        contents['results'][0]['time'] /= 100
+        with open(self.filename, 'w') as file:
+            json.dump(contents, file)
+        self.assertEqual(1, self._main(self.arguments
+                                       + ['--baseline', self.filename]))
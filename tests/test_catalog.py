@@ -0,0 +1,185 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import aspecd.exceptions
+import aspecd.tasks
+
+import uvvispy.catalog
+
+
+class TestCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.data_directory = os.path.join(self.directory, 'data')
+        os.makedirs(os.path.join(self.data_directory, 'sub'))
+        self.txt_source = os.path.join(self.data_directory, 'sub', 'foo.txt')
+        self.spc_source = os.path.join(self.data_directory, 'bar.spc')
+        shutil.copy('testdata/sa281-02-280K.txt', self.txt_source)
+        shutil.copy('testdata/sa281-02-280K.yaml',
+                    os.path.join(self.data_directory, 'sub', 'foo.yaml'))
+        shutil.copy('testdata/sa281-02-280K.spc', self.spc_source)
+        self.filename = os.path.join(self.directory, 'catalog.sqlite')
+        self.catalog = uvvispy.catalog.Catalog(filename=self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_instantiate_without_filename_raises(self):
+        with self.assertRaises(aspecd.exceptions.MissingSourceError):
+            uvvispy.catalog.Catalog()
+
+    def test_instantiate_creates_database(self):
+        self.assertTrue(os.path.exists(self.filename))
+
+    def test_scan_adds_datasets_in_subdirectories(self):
+        self.catalog.scan(self.data_directory)
+        self.assertEqual([self.spc_source, self.txt_source],
+                         self.catalog.query())
+
+    def test_scan_stores_metadata(self):
+        self.catalog.scan(self.data_directory)
+        metadata = self.catalog.metadata(self.txt_source)
+        self.assertEqual('toluene', metadata['sample.solvent'])
+        self.assertEqual('280.0 K',
+                         metadata['temperature_control.temperature'])
+
+    def test_scan_omits_empty_metadata(self):
+        self.catalog.scan(self.data_directory)
+        self.assertNotIn('sample.loi',
+                         self.catalog.metadata(self.txt_source))
+
+    def test_scan_again_reads_only_changed_datasets(self):
+        self.catalog.scan(self.data_directory)
+        self.assertEqual([], self.catalog.scan(self.data_directory))
+        with open(os.path.join(self.data_directory, 'sub', 'foo.yaml'),
+                  'a') as file:
+            file.write('\n')
+        self.assertEqual([self.txt_source],
+                         self.catalog.scan(self.data_directory))
+
+    def test_scan_removes_deleted_datasets(self):
+        self.catalog.scan(self.data_directory)
+        os.remove(self.spc_source)
+        self.catalog.scan(self.data_directory)
+        self.assertEqual([self.txt_source], self.catalog.query())
+
+    def test_scan_keeps_datasets_outside_directory(self):
+        self.catalog.scan(self.data_directory)
+        self.catalog.scan(os.path.join(self.data_directory, 'sub'))
+        self.assertEqual([self.spc_source, self.txt_source],
+                         self.catalog.query())
+
+    def test_scan_collects_errors(self):
+        other_source = os.path.join(self.data_directory, 'other.txt')
+        with open(other_source, 'w') as file:
+            file.write('1.0 2.0\n')
+        self.catalog.scan(self.data_directory)
+        self.assertIn(other_source, self.catalog.errors)
+        self.assertNotIn(other_source, self.catalog.query())
+
+    def test_add_with_many_sources(self):
+        sources = []
+        for number in range(1001):
+            source = os.path.join(self.data_directory, '%04i.txt' % number)
+            os.link(self.txt_source, source)
+            sources.append(source)
+        self.assertEqual(1001, len(self.catalog.add(sources)))
+        self.assertEqual([], self.catalog.add(sources))
+
+    def test_query_with_string(self):
+        self.catalog.scan(self.data_directory)
+        self.assertEqual([self.txt_source],
+                         self.catalog.query({'sample.solvent': 'toluene'}))
+
+    def test_query_with_number_compares_value(self):
+        self.catalog.scan(self.data_directory)
+        self.assertEqual([self.txt_source], self.catalog.query(
+            {'temperature_control.temperature': 280}))
+        self.assertEqual([], self.catalog.query(
+            {'temperature_control.temperature': 285}))
+
+    def test_query_with_several_criteria(self):
+        self.catalog.scan(self.data_directory)
+        self.assertEqual([self.txt_source], self.catalog.query(
+            {'sample.solvent': 'toluene', 'cell.type': '100-QS'}))
+        self.assertEqual([], self.catalog.query(
+            {'sample.solvent': 'toluene', 'cell.type': 'foo'}))
+
+    def test_catalog_persists(self):
+        self.catalog.scan(self.data_directory)
+        catalog = uvvispy.catalog.Catalog(filename=self.filename)
+        self.assertEqual([self.spc_source, self.txt_source], catalog.query())
+
+
+class TestDatasetSelector(unittest.TestCase):
+
+    def setUp(self):
+        self.selector = uvvispy.catalog.DatasetSelector()
+        self.directory = tempfile.mkdtemp()
+        self.source = os.path.join(self.directory, 'foo.txt')
+        shutil.copy('testdata/sa281-02-280K.txt', self.source)
+        shutil.copy('testdata/sa281-02-280K.yaml',
+                    os.path.join(self.directory, 'foo.yaml'))
+        self.filename = os.path.join(self.directory, 'catalog.sqlite')
+        uvvispy.catalog.Catalog(filename=self.filename).scan(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_resolve_keeps_other_datasets(self):
+        datasets = ['foo', {'source': 'bar'}]
+        self.assertEqual(datasets, self.selector.resolve(datasets))
+
+    def test_resolve_replaces_selector(self):
+        datasets = [{'catalog': self.filename,
+                     'select': {'sample.solvent': 'toluene'},
+                     'importer': 'ShimadzuASCIIImporter'}]
+        self.assertEqual([{'source': self.source,
+                           'importer': 'ShimadzuASCIIImporter'}],
+                         self.selector.resolve(datasets))
+
+    def test_resolve_uses_default_catalog(self):
+        self.selector.catalog = self.filename
+        datasets = [{'select': {'sample.solvent': 'acetonitrile'}}]
+        self.assertEqual([], self.selector.resolve(datasets))
+
+
+class TestChefDeService(unittest.TestCase):
+
+    def setUp(self):
+        self.chef = uvvispy.catalog.ChefDeService()
+        self.directory = tempfile.mkdtemp()
+        self.source = os.path.join(self.directory, 'foo.txt')
+        shutil.copy('testdata/sa281-02-280K.txt', self.source)
+        self.filename = os.path.join(self.directory, 'catalog.sqlite')
+        uvvispy.catalog.Catalog(filename=self.filename).scan(self.directory)
+        self.recipe_filename = os.path.join(self.directory, 'recipe.yaml')
+        with open(self.recipe_filename, 'w') as file:
+            file.write('default_package: uvvispy\n'
+                       'datasets:\n'
+                       '  - catalog: %s\n'
+                       '    select: {}\n'
+                       'tasks: []\n' % self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_is_correct_type(self):
+        self.assertTrue(isinstance(self.chef, aspecd.tasks.ChefDeService))
+
+    def test_serve_imports_selected_datasets(self):
+        self.chef.recipe_filename = self.recipe_filename
+        # noinspection PyProtectedMember
+        self.chef._create_recipe()
+        # noinspection PyProtectedMember
+        self.assertEqual([self.source],
+                         list(self.chef._recipe.datasets.keys()))
@@ -1,10 +1,33 @@
+import asyncio
+import concurrent.futures
+import copy
+import glob
+import os
+import pickle
+import shutil
+import tempfile
+import time
 import unittest
 
 import aspecd.dataset
+import aspecd.exceptions
 import aspecd.metadata
+import numpy as np
 
+import uvvispy.benchmark
 import uvvispy.dataset
 import uvvispy.metadata
+import uvvispy.processing
+
+
+
+def run_coroutine(coroutine):
+    # asyncio.run() requires Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
 
 
 class TestExperimentalDataset(unittest.TestCase):
@@ -43,6 +66,22 @@ class TestDatasetFactory(unittest.TestCase):
     def setUp(self):
         self.factory = uvvispy.dataset.DatasetFactory()
         self.dataset_filename = "testdata/sa281-02-280K.txt"
+        self.directory = ''
+
+    def tearDown(self):
+        if self.directory:
+            shutil.rmtree(self.directory)
+
+    def _create_directory(self, broken_file=False):
+        self.directory = tempfile.mkdtemp()
+        for temperature in [290, 280, 285]:
+            shutil.copy(self.dataset_filename,
+                        os.path.join(self.directory,
+                                     'sample-%sK.txt' % temperature))
+        shutil.copy("testdata/sa281-02-280K.yaml", self.directory)
+        if broken_file:
+            with open(os.path.join(self.directory, 'broken.txt'), 'w') as f:
+                f.write('foo\nbar\n1,0\t2,0\t3,0\n')
 
     def test_instantiate_class(self):
         pass
@@ -55,3 +94,361 @@ class TestDatasetFactory(unittest.TestCase):
         dataset = self.factory.get_dataset(source=self.dataset_filename)
         self.assertTrue(isinstance(dataset,
                                    uvvispy.dataset.ExperimentalDataset))
+
+    def test_get_dataset_async_returns_same_dataset_as_get_dataset(self):
+        dataset = self.factory.get_dataset(source=self.dataset_filename)
+        async_dataset = run_coroutine(self.factory.get_dataset_async(
+            source=self.dataset_filename))
+        self.assertTrue(isinstance(async_dataset,
+                                   uvvispy.dataset.ExperimentalDataset))
+        np.testing.assert_array_equal(dataset.data.data,
+                                      async_dataset.data.data)
+        self.assertEqual(dataset.metadata.to_dict(),
+                         async_dataset.metadata.to_dict())
+        self.assertEqual(dataset.id, async_dataset.id)
+
+    def test_get_dataset_async_without_source_raises(self):
+        with self.assertRaises(aspecd.exceptions.MissingSourceError):
+            run_coroutine(self.factory.get_dataset_async())
+
+    def test_get_dataset_async_chooses_importer_by_contents(self):
+        self.directory = tempfile.mkdtemp()
+        source = os.path.join(self.directory, 'foo.txt')
+        with open(source, 'w') as file:
+            file.write('1.0 2.0\n3.0 4.0\n')
+        dataset = run_coroutine(self.factory.get_dataset_async(source=source))
+        np.testing.assert_array_equal([2., 4.], dataset.data.data)
+
+    def test_get_dataset_async_with_importer_for_series(self):
+        self._create_directory()
+        dataset = run_coroutine(self.factory.get_dataset_async(
+            source=self.directory, importer='SeriesImporter',
+            parameters={'axis_value_pattern': r'-(\d+)K', 'processes': 1}))
+        self.assertEqual((601, 3), dataset.data.data.shape)
+
+    def test_get_dataset_async_concurrently_is_faster(self):
+        self._create_directory()
+        sources = sorted(glob.glob(os.path.join(self.directory, '*.txt')))
+        reader = uvvispy.benchmark.DelayedFileReader(delay=0.1)
+        reader.executor = concurrent.futures.ThreadPoolExecutor(8)
+
+        async def import_serially():
+            return [await self.factory.get_dataset_async(source=source,
+                                                         reader=reader)
+                    for source in sources]
+
+        async def import_concurrently():
+            return await asyncio.gather(*[
+                self.factory.get_dataset_async(source=source, reader=reader)
+                for source in sources])
+
+        start = time.perf_counter()
+        run_coroutine(import_serially())
+        serial_time = time.perf_counter() - start
+        start = time.perf_counter()
+        datasets = run_coroutine(import_concurrently())
+        concurrent_time = time.perf_counter() - start
+        reader.executor.shutdown()
+        self.assertEqual(sources, [dataset.id for dataset in datasets])
+        self.assertLess(concurrent_time, serial_time / 2)
+
+    def test_get_datasets_without_source_raises(self):
+        with self.assertRaises(aspecd.exceptions.MissingSourceError):
+            self.factory.get_datasets()
+
+    def test_get_datasets_from_directory_returns_sorted_datasets(self):
+        self._create_directory()
+        datasets = self.factory.get_datasets(source=self.directory)
+        self.assertEqual(['sample-280K', 'sample-285K', 'sample-290K'],
+                         [os.path.splitext(os.path.basename(dataset.id))[0]
+                          for dataset in datasets])
+
+    def test_get_datasets_from_glob_pattern(self):
+        self._create_directory()
+        datasets = self.factory.get_datasets(
+            source=os.path.join(self.directory, '*-28?K.txt'))
+        self.assertEqual(2, len(datasets))
+        self.assertTrue(isinstance(datasets[0],
+                                   uvvispy.dataset.ExperimentalDataset))
+
+    def test_get_datasets_with_one_process(self):
+        self._create_directory()
+        datasets = self.factory.get_datasets(source=self.directory,
+                                             processes=1)
+        self.assertEqual(3, len(datasets))
+
+    def test_get_datasets_collects_errors(self):
+        self._create_directory(broken_file=True)
+        datasets = self.factory.get_datasets(source=self.directory,
+                                             processes=2)
+        self.assertEqual(3, len(datasets))
+        self.assertEqual([os.path.join(self.directory, 'broken.txt')],
+                         list(self.factory.errors.keys()))
+
+
+class TestLazyData(unittest.TestCase):
+
+    def setUp(self):
+        self.source = 'testdata/sa281-02-280K.txt'
+        self.data = self._create_data()
+
+    def _create_data(self, eviction_policy=None):
+        return uvvispy.dataset.LazyData(
+            importer='uvvispy.io.ShimadzuASCIIImporter', source=self.source,
+            eviction_policy=eviction_policy)
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_is_correct_type(self):
+        self.assertTrue(isinstance(self.data, aspecd.dataset.Data))
+
+    def test_is_not_loaded_on_instantiation(self):
+        self.assertFalse(self.data.loaded)
+
+    def test_without_source_is_loaded(self):
+        self.assertTrue(uvvispy.dataset.LazyData().loaded)
+
+    def test_access_to_data_loads_data(self):
+        self.assertEqual((601,), self.data.data.shape)
+        self.assertTrue(self.data.loaded)
+
+    def test_access_to_axes_loads_data(self):
+        self.assertEqual(601, len(self.data.axes[0].values))
+        self.assertEqual('absorbance', self.data.axes[1].quantity)
+
+    def test_unload_drops_data(self):
+        _ = self.data.data
+        self.data.unload()
+        self.assertFalse(self.data.loaded)
+
+    def test_access_after_unload_reads_data_again(self):
+        data = np.array(self.data.data)
+        self.data.unload()
+        self.assertTrue(np.array_equal(data, self.data.data))
+
+    def test_setting_data_detaches_from_source(self):
+        self.data.data = self.data.data * 2
+        self.data.unload()
+        self.assertTrue(self.data.loaded)
+
+    def test_to_dict_contains_only_data_and_axes(self):
+        self.assertEqual(['calculated', 'data', 'axes'],
+                         list(self.data.to_dict().keys()))
+
+    def test_copy_is_not_loaded(self):
+        self.assertFalse(copy.deepcopy(self.data).loaded)
+
+    def test_can_be_pickled(self):
+        eviction_policy = uvvispy.dataset.EvictionPolicy()
+        data = self._create_data(eviction_policy=eviction_policy)
+        _ = data.data
+        self.assertEqual((601,), pickle.loads(pickle.dumps(data)).data.shape)
+
+    def test_data_with_eviction_policy_are_writeable(self):
+        eviction_policy = uvvispy.dataset.EvictionPolicy()
+        data = self._create_data(eviction_policy=eviction_policy)
+        self.assertTrue(data.data.flags.writeable)
+
+    def test_unload_retains_data_changed_in_place(self):
+        self.data.data[0] = 42.
+        self.data.unload()
+        self.assertTrue(self.data.loaded)
+        self.assertEqual(42., self.data.data[0])
+
+    def test_eviction_retains_changed_axis_values(self):
+        eviction_policy = uvvispy.dataset.EvictionPolicy(max_loaded=1)
+        data = self._create_data(eviction_policy=eviction_policy)
+        data.axes[0].values = data.axes[0].values + 1000
+        _ = self._create_data(eviction_policy=eviction_policy).data
+        self.assertTrue(data.loaded)
+        self.assertEqual(1300., data.axes[0].values[0])
+        self.assertIsNone(data.eviction_policy)
+
+    def test_processing_with_eviction_policy_is_retained(self):
+        eviction_policy = uvvispy.dataset.EvictionPolicy(max_loaded=1)
+        dataset = uvvispy.dataset.ExperimentalDataset()
+        dataset.data = self._create_data(eviction_policy=eviction_policy)
+        dataset.process(uvvispy.processing.BaselineCorrection())
+        data = np.array(dataset.data.data)
+        _ = self._create_data(eviction_policy=eviction_policy).data
+        self.assertTrue(np.array_equal(data, dataset.data.data))
+
+    def test_setting_data_with_eviction_policy_removes_policy(self):
+        eviction_policy = uvvispy.dataset.EvictionPolicy()
+        data = self._create_data(eviction_policy=eviction_policy)
+        data.data = data.data * 2
+        self.assertIsNone(data.eviction_policy)
+        self.assertEqual(0, eviction_policy.size)
+
+
+class TestDeferredData(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset = uvvispy.dataset.ExperimentalDataset()
+        self.dataset.data.data = np.linspace(1, 2, 11)
+        processing_step = uvvispy.processing.ScalarAlgebra()
+        processing_step.parameters["kind"] = "multiply"
+        processing_step.parameters["value"] = 2
+        processing = uvvispy.processing.Pipeline(steps=[processing_step])
+        processing.dataset = self.dataset
+        self.source = self.dataset.data
+        self.data = uvvispy.dataset.DeferredData(source=self.source,
+                                                 processing=processing)
+        self.dataset.data = self.data
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_is_correct_type(self):
+        self.assertTrue(isinstance(self.data, aspecd.dataset.Data))
+
+    def test_is_pending_on_instantiation(self):
+        self.assertTrue(self.data.pending)
+
+    def test_without_source_is_not_pending(self):
+        self.assertFalse(uvvispy.dataset.DeferredData().pending)
+
+    def test_access_to_data_processes_data(self):
+        np.testing.assert_allclose(np.linspace(2, 4, 11), self.data.data)
+        self.assertFalse(self.data.pending)
+
+    def test_access_to_axes_processes_data(self):
+        self.assertEqual(11, len(self.data.axes[0].values))
+        self.assertFalse(self.data.pending)
+        self.assertEqual(1, len(self.dataset.history))
+
+    def test_setting_data_processes_data_first(self):
+        self.data.data = np.zeros(5)
+        self.assertEqual(1, len(self.dataset.history))
+        self.assertEqual((5,), self.data.data.shape)
+
+    def test_copy_is_pending(self):
+        dataset = copy.deepcopy(self.dataset)
+        self.assertTrue(dataset.data.pending)
+        np.testing.assert_allclose(np.linspace(2, 4, 11), dataset.data.data)
+        self.assertTrue(self.data.pending)
+
+
+class TestEvictionPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.eviction_policy = uvvispy.dataset.EvictionPolicy()
+
+    def _create_data(self):
+        return uvvispy.dataset.LazyData(
+            importer='uvvispy.io.ShimadzuASCIIImporter',
+            source='testdata/sa281-02-280K.txt',
+            eviction_policy=self.eviction_policy)
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_tracks_size_of_loaded_data(self):
+        data = self._create_data()
+        _ = data.data
+        self.assertEqual(2 * 601 * 8, self.eviction_policy.size)
+
+    def test_drops_least_recently_loaded_data(self):
+        self.eviction_policy.max_loaded = 1
+        first, second = self._create_data(), self._create_data()
+        _ = first.data
+        _ = second.data
+        self.assertFalse(first.loaded)
+        self.assertTrue(second.loaded)
+
+    def test_drops_least_recently_used_data(self):
+        self.eviction_policy.max_loaded = 2
+        datasets = [self._create_data() for _ in range(3)]
+        _ = datasets[0].data
+        _ = datasets[1].data
+        _ = datasets[0].axes
+        _ = datasets[2].data
+        self.assertEqual([True, False, True],
+                         [data.loaded for data in datasets])
+
+    def test_keeps_limit_with_data_loaded_from_many_threads(self):
+        self.eviction_policy.max_loaded = 4
+        datasets = [self._create_data() for _ in range(40)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) \
+                as executor:
+            shapes = list(executor.map(lambda data: data.data.shape,
+                                       datasets))
+        self.assertEqual([(601,)] * 40, shapes)
+        self.assertLessEqual(sum(data.loaded for data in datasets), 4)
+
+    def test_drops_data_exceeding_maximum_size(self):
+        self.eviction_policy.max_size = 3 * 601 * 8
+        first, second = self._create_data(), self._create_data()
+        _ = first.data
+        _ = second.data
+        self.assertFalse(first.loaded)
+        self.assertEqual(2 * 601 * 8, self.eviction_policy.size)
+
+    def test_retains_most_recent_data_exceeding_maximum_size(self):
+        self.eviction_policy.max_size = 1
+        data = self._create_data()
+        _ = data.data
+        self.assertTrue(data.loaded)
+
+
+class TestUniformAxis(unittest.TestCase):
+
+    def setUp(self):
+        self.axis = uvvispy.dataset.UniformAxis()
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_is_correct_type(self):
+        self.assertTrue(isinstance(self.axis, aspecd.dataset.Axis))
+
+    def test_uniform_values_are_stored_compactly(self):
+        self.axis.values = np.linspace(300, 900, 601)
+        self.assertTrue(self.axis.compact)
+        self.assertEqual(300., self.axis.start)
+        self.assertEqual(1., self.axis.step)
+        self.assertEqual(601, self.axis.length)
+
+    def test_returns_uniform_values(self):
+        values = np.linspace(300, 900, 1201)
+        self.axis.values = values
+        self.assertTrue(np.allclose(values, self.axis.values,
+                                    rtol=0, atol=1e-12))
+
+    def test_non_uniform_values_are_stored_as_values(self):
+        values = np.asarray([1., 2., 4.])
+        self.axis.values = values
+        self.assertFalse(self.axis.compact)
+        self.assertTrue(np.array_equal(values, self.axis.values))
+        self.assertEqual(3, self.axis.length)
+
+    def test_integer_values_are_stored_as_values(self):
+        self.axis.values = np.arange(5)
+        self.assertFalse(self.axis.compact)
+
+    def test_retains_data_type_of_values(self):
+        self.axis.values = np.linspace(0, 1, 11, dtype=np.float32)
+        self.assertEqual(np.float32, self.axis.values.dtype)
+
+    def test_is_equidistant(self):
+        self.axis.values = np.linspace(300, 900, 601)
+        self.assertTrue(self.axis.equidistant)
+
+    def test_from_axis_retains_properties(self):
+        axis = aspecd.dataset.Axis()
+        axis.values = np.linspace(300, 900, 601)
+        axis.quantity = 'wavelength'
+        axis.unit = 'nm'
+        uniform_axis = uvvispy.dataset.UniformAxis.from_axis(axis)
+        self.assertEqual('wavelength', uniform_axis.quantity)
+        self.assertEqual('nm', uniform_axis.unit)
+        self.assertTrue(uniform_axis.compact)
+
+    def test_to_dict_contains_values(self):
+        self.axis.values = np.linspace(300, 900, 601)
+        self.assertEqual(601, len(self.axis.to_dict()['values']))
+
+    def test_copy_is_compact(self):
+        self.axis.values = np.linspace(300, 900, 601)
+        self.assertTrue(copy.deepcopy(self.axis).compact)
@@ -0,0 +1,156 @@
+import os
+import shutil
+import struct
+import tempfile
+import time
+import unittest
+
+import aspecd.exceptions
+
+import uvvispy.catalog
+import uvvispy.ingest
+
+
+class TestIngestor(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.target_directory = tempfile.mkdtemp()
+        self.ingestor = uvvispy.ingest.Ingestor(directory=self.directory)
+        self.ingestor.target_directory = self.target_directory
+        self.ingestor.debounce = 0.
+        self.ingestor.use_inotify = False
+        self.source = os.path.join(self.directory, 'foo.txt')
+
+    def tearDown(self):
+        self.ingestor.close()
+        shutil.rmtree(self.directory)
+        shutil.rmtree(self.target_directory)
+
+    def _copy_dataset(self, source='foo.txt'):
+        shutil.copy('testdata/sa281-02-280K.txt',
+                    os.path.join(self.directory, source))
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_poll_without_directory_raises(self):
+        with self.assertRaises(aspecd.exceptions.MissingSourceError):
+            uvvispy.ingest.Ingestor().poll()
+
+    def test_poll_ingests_existing_files(self):
+        self._copy_dataset()
+        self.assertEqual([self.source], self.ingestor.poll())
+        self.assertTrue(os.path.exists(
+            os.path.join(self.target_directory, 'foo.txt.uvd')))
+
+    def test_poll_ingests_sources_differing_only_in_extension(self):
+        for extension in ('.txt', '.spc'):
+            shutil.copy('testdata/sa281-02-280K' + extension,
+                        os.path.join(self.directory,
+                                     'sa281-02-280K' + extension))
+        self.assertEqual(2, len(self.ingestor.poll()))
+        self.assertEqual(
+            ['sa281-02-280K.spc.uvd', 'sa281-02-280K.txt.uvd'],
+            sorted(os.listdir(self.target_directory)))
+
+    def test_poll_ingests_new_files(self):
+        self.ingestor.poll()
+        self._copy_dataset()
+        self.assertEqual([self.source], self.ingestor.poll())
+
+    def test_poll_ignores_unchanged_files(self):
+        self._copy_dataset()
+        self.ingestor.poll()
+        self.assertEqual([], self.ingestor.poll())
+
+    def test_poll_ignores_other_files(self):
+        with open(os.path.join(self.directory, 'foo.bar'), 'w') as file:
+            file.write('foo')
+        self.assertEqual([], self.ingestor.poll())
+
+    def test_poll_ingests_files_with_changed_metadata(self):
+        self._copy_dataset()
+        self.ingestor.poll()
+        time.sleep(0.01)
+        shutil.copy('testdata/sa281-02-280K.yaml',
+                    os.path.join(self.directory, 'foo.yaml'))
+        self.assertEqual([self.source], self.ingestor.poll())
+
+    def test_poll_skips_files_already_stored(self):
+        self._copy_dataset()
+        self.ingestor.poll()
+        self.ingestor.close()
+        ingestor = uvvispy.ingest.Ingestor(directory=self.directory)
+        ingestor.target_directory = self.target_directory
+        ingestor.debounce = 0.
+        ingestor.use_inotify = False
+        self.assertEqual([], ingestor.poll())
+
+    def test_poll_debounces_files(self):
+        self.ingestor.debounce = 60.
+        self._copy_dataset()
+        self.assertEqual([], self.ingestor.poll())
+
+    def test_poll_limits_number_of_files_imported(self):
+        for number in range(3):
+            self._copy_dataset('foo%i.txt' % number)
+        self.ingestor.max_queued = 2
+        self.assertEqual(2, len(self.ingestor.poll()))
+        self.assertEqual(1, len(self.ingestor.poll()))
+
+    def test_poll_collects_errors(self):
+        with open(self.source, 'w') as file:
+            file.write('"foo - RawData"\n"Wavelength nm."\t"Abs."\nfoo\n')
+        self.assertEqual([], self.ingestor.poll())
+        self.assertIn(self.source, self.ingestor.errors)
+
+    def test_poll_adds_datasets_to_catalog(self):
+        self.ingestor.catalog = uvvispy.catalog.Catalog(
+            filename=os.path.join(self.target_directory, 'catalog.sqlite'))
+        self._copy_dataset()
+        self.ingestor.poll()
+        self.assertEqual([self.source], self.ingestor.catalog.query())
+
+    def test_poll_with_inotify_ingests_new_files(self):
+        self.ingestor.use_inotify = True
+        self.ingestor.poll()
+        self._copy_dataset()
+        self.assertEqual([self.source], self.ingestor.poll(timeout=1.))
+
+    def test_inotify_watcher_rescans_directory_on_overflow(self):
+        try:
+            watcher = uvvispy.ingest._InotifyWatcher(self.directory)
+        except (AttributeError, OSError):
+            self.skipTest('inotify not available')
+        watcher.changes()
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        # pylint: disable=protected-access
+        os.close(watcher._fd)
+        watcher._fd = read_fd
+        self._copy_dataset()
+        os.write(write_fd, struct.pack('iIII', -1, 0x4000, 0, 0))
+        self.assertEqual({self.source}, watcher.changes())
+        watcher.close()
+        os.close(write_fd)
+
+    def test_poll_keeps_only_most_recently_ingested(self):
+        for number in range(3):
+            self._copy_dataset('foo%i.txt' % number)
+        self.ingestor.max_ingested = 2
+        self.ingestor.poll()
+        self.assertEqual(2, len(self.ingestor.ingested))
+
+    def test_poll_with_several_processes(self):
+        self.ingestor.processes = 2
+        self._copy_dataset()
+        self.ingestor.poll()
+        self.ingestor.close()
+        self.assertEqual([self.source], self.ingestor.ingested)
+
+    def test_run_stops_after_duration(self):
+        self._copy_dataset()
+        self.ingestor.interval = 0.01
+        self.ingestor.run(duration=0.05)
+        self.assertEqual([self.source], self.ingestor.ingested)
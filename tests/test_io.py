@@ -1,14 +1,38 @@
+import asyncio
+import concurrent.futures
 import datetime
+import io
+import json
 import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
 import unittest
+import unittest.mock
+import warnings
 
+import aspecd.exceptions
 import aspecd.io
+import aspecd.processing
 import aspecd.utils
+import numpy as np
 
 import uvvispy.dataset
 import uvvispy.io
 
 
+
+def run_coroutine(coroutine):
+    # asyncio.run() requires Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
 class TestDatasetImporter(unittest.TestCase):
 
     def setUp(self):
@@ -45,6 +69,18 @@ class TestDatasetImporter(unittest.TestCase):
         self.assertEqual(metadata_dict["experiment"]["type"],
                          self.dataset.metadata.experiment.type)
 
+    def test_import_metadata_into_reads_metadata(self):
+        metadata_dict = {
+            'format': {'version': '0.1.4'},
+            'experiment': {'type': 'spectrum'},
+            'measurement': {'labbook': ''},
+        }
+        self._write_metadata_file(metadata_dict)
+        self.importer.source = self.dataset_file
+        self.importer.import_metadata_into(self.dataset)
+        self.assertEqual(metadata_dict["experiment"]["type"],
+                         self.dataset.metadata.experiment.type)
+
     def test_import_reads_datetime_from_metadata(self):
         metadata_dict = {
             'format': {'version': '0.1.4'},
@@ -86,6 +122,20 @@ class TestDatasetImporter(unittest.TestCase):
         self.assertEqual(metadata_dict["measurement"]["labbook"],
                          self.dataset.metadata.measurement.labbook_entry)
 
+    def test_import_maps_temperature_to_temperature_control(self):
+        metadata_dict = {
+            'format': {'version': '0.1.4'},
+            'measurement': {'labbook': 'loi:42.1001/lb/tb/uvvis/yyyy-mm-dd_id'},
+            'temperature': {'temperature': '280 K', 'cryogen': 'LN2'}
+        }
+        self._write_metadata_file(metadata_dict)
+        self.importer.source = self.dataset_file
+        self.dataset.import_from(self.importer)
+        self.assertEqual(
+            280., self.dataset.metadata.temperature_control.temperature.value)
+        self.assertEqual('LN2',
+                         self.dataset.metadata.temperature_control.cryogen)
+
     def test_import_maps_labbook_entry_in_old_format(self):
         metadata_dict = {
             'format': {'version': '0.1.3'},
@@ -97,6 +147,76 @@ class TestDatasetImporter(unittest.TestCase):
         self.assertEqual(metadata_dict["general"]["labbook"],
                          self.dataset.metadata.measurement.labbook_entry)
 
+    def test_import_maps_temperature_in_old_format(self):
+        metadata_dict = {
+            'format': {'version': '0.1.3'},
+            'general': {'labbook': 'loi:42.1001/lb/tb/uvvis/yyyy-mm-dd_id'},
+            'temperature': {'temperature': '280 K', 'cryogen': 'LN2'}
+        }
+        self._write_metadata_file(metadata_dict)
+        self.importer.source = self.dataset_file
+        self.dataset.import_from(self.importer)
+        self.assertEqual('LN2',
+                         self.dataset.metadata.temperature_control.cryogen)
+
+    def test_import_twice_maps_metadata_both_times(self):
+        metadata_dict = {
+            'format': {'version': '0.1.4'},
+            'measurement': {'labbook': 'loi:42.1001/lb/tb/uvvis/yyyy-mm-dd_id'}
+        }
+        self._write_metadata_file(metadata_dict)
+        for _ in range(2):
+            dataset = uvvispy.dataset.ExperimentalDataset()
+            dataset.import_from(
+                uvvispy.io.DatasetImporter(source=self.dataset_file))
+            self.assertEqual(metadata_dict["measurement"]["labbook"],
+                             dataset.metadata.measurement.labbook_entry)
+
+    def test_import_reads_changed_metadata_file(self):
+        metadata_dict = {
+            'format': {'version': '0.1.4'},
+            'experiment': {'type': 'spectrum'},
+            'measurement': {'labbook': ''},
+        }
+        self._write_metadata_file(metadata_dict)
+        self.importer.source = self.dataset_file
+        self.dataset.import_from(self.importer)
+        metadata_dict["experiment"]["type"] = 'kinetics'
+        self._write_metadata_file(metadata_dict)
+        dataset = uvvispy.dataset.ExperimentalDataset()
+        dataset.import_from(
+            uvvispy.io.DatasetImporter(source=self.dataset_file))
+        self.assertEqual('kinetics', dataset.metadata.experiment.type)
+
+    def test_import_reads_metadata_of_same_name_in_other_directory(self):
+        cwd = os.getcwd()
+        directory = tempfile.mkdtemp()
+        try:
+            for type_ in ('spectrum', 'kinetics'):
+                os.chdir(directory)
+                os.mkdir(type_)
+                os.chdir(type_)
+                self._write_metadata_file({
+                    'format': {'version': '0.1.4'},
+                    'experiment': {'type': type_},
+                    'measurement': {'labbook': ''},
+                })
+                os.utime(self.metadata_file, ns=(0, 0))
+                dataset = uvvispy.dataset.ExperimentalDataset()
+                dataset.import_from(
+                    uvvispy.io.DatasetImporter(source=self.dataset_file))
+                self.assertEqual(type_, dataset.metadata.experiment.type)
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(directory)
+
+    def test_import_reads_metadata_next_to_source(self):
+        self.importer.source = 'testdata/sa281-02-280K.txt'
+        self.dataset.import_from(self.importer)
+        self.assertEqual('DPPTh2', self.dataset.metadata.sample.name)
+        self.assertEqual(datetime.datetime(2017, 9, 6, 8, 31),
+                         self.dataset.metadata.measurement.start)
+
     def test_import_assigns_comment_as_annotation(self):
         metadata_dict = {
             'format': {'version': '0.1.4'},
@@ -111,6 +231,18 @@ class TestDatasetImporter(unittest.TestCase):
                              "comment"])
 
 
+class TestClearCaches(unittest.TestCase):
+
+    def test_clear_caches_clears_metadata_file_cache(self):
+        uvvispy.dataset.ExperimentalDataset().import_from(
+            uvvispy.io.ShimadzuASCIIImporter(
+                source='testdata/sa281-02-280K.txt'))
+        uvvispy.io.clear_caches()
+        # pylint: disable=protected-access
+        self.assertEqual(
+            0, uvvispy.io.importer._read_metadata_file.cache_info().currsize)
+
+
 class TestShimadzuASCIIImporter(unittest.TestCase):
 
     def setUp(self):
@@ -175,6 +307,63 @@ class TestShimadzuASCIIImporter(unittest.TestCase):
         self.assertEqual(metadata_dict["experiment"]["type"],
                          self.dataset.metadata.experiment.type)
 
+    def test_read_from_file_gives_same_values_as_loadtxt(self):
+        filename = 'testdata/sa281-02-280K.txt'
+        with open(filename) as file:
+            contents = file.read()
+        raw_data = np.loadtxt(io.StringIO(contents.replace(',', '.')),
+                              skiprows=2)
+        self.importer.source = filename
+        self.dataset.import_from(self.importer)
+        self.assertTrue(np.array_equal(raw_data[:, 0].view(np.int64),
+                                       self.dataset.data.axes[0].values.view(
+                                           np.int64)))
+        self.assertTrue(np.array_equal(raw_data[:, 1].view(np.int64),
+                                       self.dataset.data.data.view(np.int64)))
+
+    def test_read_from_file_with_negative_values(self):
+        self.data = [
+            '"filename - RawData"',
+            '"Wavelength nm."	"Abs."',
+            '300,00	-0,322',
+            '301,00	-0,000',
+        ]
+        self._write_dataset_file()
+        self.importer.source = self.dataset_file
+        self.dataset.import_from(self.importer)
+        self.assertEqual(-0.322, self.dataset.data.data[0])
+        self.assertTrue(np.signbit(self.dataset.data.data[1]))
+
+    def test_read_from_file_with_irregular_format(self):
+        self.data = [
+            '"filename - RawData"',
+            '"Wavelength nm."	"Abs."',
+            '300,00	0,322',
+            '301,0	3,1e-1',
+        ]
+        self._write_dataset_file()
+        self.importer.source = self.dataset_file
+        self.dataset.import_from(self.importer)
+        self.assertEqual(301., self.dataset.data.axes[0].values[1])
+        self.assertEqual(0.31, self.dataset.data.data[1])
+
+    def test_read_from_file_with_invalid_values_does_not_warn(self):
+        self.data = [
+            '"filename - RawData"',
+            '"Wavelength nm."	"Abs."',
+            '300,00	0,322',
+            '301,00	0,3-1',
+        ]
+        self._write_dataset_file()
+        self.importer.source = self.dataset_file
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter('always')
+            with self.assertRaises(ValueError):
+                self.dataset.import_from(self.importer)
+        self.assertFalse([warning for warning in caught_warnings
+                          if issubclass(warning.category,
+                                        DeprecationWarning)])
+
     def test_read_from_file_sets_first_axis_descriptions(self):
         self.data = [
             '"filename - RawData"',
@@ -201,6 +390,670 @@ class TestShimadzuASCIIImporter(unittest.TestCase):
         self.assertEqual("absorbance", self.dataset.data.axes[1].quantity)
         self.assertEqual("", self.dataset.data.axes[1].unit)
 
+    def test_read_from_file_with_several_columns_creates_2d_dataset(self):
+        self.data = [
+            '"filename - RawData"',
+            '"Wavelength nm."	"0"	"10,5"	"21"',
+            '300,00	0,322	0,321	0,320',
+            '301,00	0,310	0,309	0,308',
+        ]
+        self._write_dataset_file()
+        self.importer.source = self.dataset_file
+        self.dataset.import_from(self.importer)
+        self.assertEqual((2, 3), self.dataset.data.data.shape)
+        self.assertEqual(0.309, self.dataset.data.data[1, 1])
+        self.assertEqual([300., 301.],
+                         list(self.dataset.data.axes[0].values))
+        self.assertEqual([0., 10.5, 21.],
+                         list(self.dataset.data.axes[1].values))
+        self.assertEqual("wavelength", self.dataset.data.axes[0].quantity)
+        self.assertEqual("absorbance", self.dataset.data.axes[2].quantity)
+
+    def test_read_from_file_with_non_numeric_labels_numbers_columns(self):
+        self.data = [
+            '"filename - RawData"',
+            '"Wavelength nm."	"Abs."	"Abs."',
+            '300,00	0,322	0,321',
+            '301,00	0,310	0,309',
+        ]
+        self._write_dataset_file()
+        self.importer.source = self.dataset_file
+        self.dataset.import_from(self.importer)
+        self.assertEqual([0., 1.], list(self.dataset.data.axes[1].values))
+
+    def test_read_from_file_in_chunks(self):
+        self.data = [
+            '"filename - RawData"',
+            '"Wavelength nm."	"0"	"10"',
+        ]
+        self.data.extend('%i,00	0,%03i	-0,%03i' % (300 + i, i, i)
+                         for i in range(100))
+        self._write_dataset_file()
+        self.importer.source = self.dataset_file
+        self.dataset.import_from(self.importer)
+        dataset = uvvispy.dataset.ExperimentalDataset()
+        importer = uvvispy.io.ShimadzuASCIIImporter(source=self.dataset_file)
+        importer.parameters["chunk_size"] = 100
+        dataset.import_from(importer)
+        self.assertTrue(np.array_equal(self.dataset.data.data,
+                                       dataset.data.data))
+        self.assertTrue(np.array_equal(self.dataset.data.axes[0].values,
+                                       dataset.data.axes[0].values))
+
+    def test_read_from_file_in_chunks_without_final_newline(self):
+        self.data = [
+            '"filename - RawData"',
+            '"Wavelength nm."	"Abs."',
+        ]
+        self.data.extend('%i,00	0,%03i' % (300 + i, i) for i in range(20))
+        self._write_dataset_file()
+        with open(self.dataset_file, 'rb+') as file:
+            file.truncate(os.path.getsize(self.dataset_file) - 1)
+        self.importer.source = self.dataset_file
+        self.importer.parameters["chunk_size"] = 50
+        self.dataset.import_from(self.importer)
+        self.assertEqual(20, self.dataset.data.data.shape[0])
+        self.assertEqual(0.019, self.dataset.data.data[-1])
+
+    def test_import_with_dtype_converts_data(self):
+        self.importer.source = 'testdata/sa281-02-280K.txt'
+        self.importer.parameters["dtype"] = 'float32'
+        self.dataset.import_from(self.importer)
+        self.assertEqual(np.float32, self.dataset.data.data.dtype)
+        self.assertEqual(np.float64, self.dataset.data.axes[0].values.dtype)
+
+    def test_import_with_compact_axes_sets_uniform_axis(self):
+        self.importer.source = 'testdata/sa281-02-280K.txt'
+        self.importer.parameters["compact_axes"] = True
+        self.dataset.import_from(self.importer)
+        axis = self.dataset.data.axes[0]
+        self.assertIsInstance(axis, uvvispy.dataset.UniformAxis)
+        self.assertTrue(axis.compact)
+        self.assertEqual("wavelength", axis.quantity)
+
+    def test_lazy_import_does_not_read_data(self):
+        self.importer.source = 'testdata/sa281-02-280K.txt'
+        self.importer.parameters["lazy"] = True
+        self.dataset.import_from(self.importer)
+        self.assertIsInstance(self.dataset.data, uvvispy.dataset.LazyData)
+        self.assertFalse(self.dataset.data.loaded)
+
+    def test_lazy_import_reads_metadata(self):
+        self.importer.source = 'testdata/sa281-02-280K.txt'
+        self.importer.parameters["lazy"] = True
+        self.dataset.import_from(self.importer)
+        self.assertEqual('DPPTh2', self.dataset.metadata.sample.name)
+
+    def test_lazy_import_reads_header(self):
+        self.importer.source = 'testdata/sa281-02-280K.txt'
+        self.importer.parameters["lazy"] = True
+        self.dataset.import_from(self.importer)
+        self.assertEqual([300., 900.], self.dataset.data.header['range'])
+        self.assertEqual((601,), self.dataset.data.header['shape'])
+
+    def test_lazy_import_reads_header_of_2d_dataset(self):
+        self.data = [
+            '"filename - RawData"',
+            '"Wavelength nm."	"0"	"10,5"	"21"',
+            '300,00	0,322	0,321	0,320',
+            '300,50	0,310	0,309	0,308',
+            '301,00	0,310	0,309	0,308',
+        ]
+        self._write_dataset_file()
+        self.importer.source = self.dataset_file
+        self.importer.parameters["lazy"] = True
+        self.dataset.import_from(self.importer)
+        self.assertEqual([300., 301.], self.dataset.data.header['range'])
+        self.assertEqual((3, 3), self.dataset.data.header['shape'])
+
+    def test_lazy_import_reads_data_on_access(self):
+        self.importer.source = 'testdata/sa281-02-280K.txt'
+        self.dataset.import_from(self.importer)
+        dataset = uvvispy.dataset.ExperimentalDataset()
+        importer = uvvispy.io.ShimadzuASCIIImporter(
+            source='testdata/sa281-02-280K.txt')
+        importer.parameters["lazy"] = True
+        dataset.import_from(importer)
+        self.assertTrue(np.array_equal(self.dataset.data.data,
+                                       dataset.data.data))
+        self.assertTrue(np.array_equal(self.dataset.data.axes[0].values,
+                                       dataset.data.axes[0].values))
+        self.assertEqual("wavelength", dataset.data.axes[0].quantity)
+
+
+    def test_import_into_async_imports_same_as_import_into(self):
+        self.importer.source = 'testdata/sa281-02-280K.txt'
+        self.importer.parameters['chunk_size'] = 1000
+        dataset = uvvispy.dataset.ExperimentalDataset()
+        dataset.import_from(self.importer)
+        run_coroutine(self.importer.import_into_async(self.dataset))
+        np.testing.assert_array_equal(dataset.data.data,
+                                      self.dataset.data.data)
+        np.testing.assert_array_equal(dataset.data.axes[0].values,
+                                      self.dataset.data.axes[0].values)
+        self.assertEqual(dataset.metadata.to_dict(),
+                         self.dataset.metadata.to_dict())
+        self.assertEqual(self.importer.source, self.dataset.id)
+
+    def test_import_into_async_with_lazy_reads_header(self):
+        self.importer.source = 'testdata/sa281-02-280K.txt'
+        self.importer.parameters['lazy'] = True
+        run_coroutine(self.importer.import_into_async(self.dataset))
+        self.assertEqual((601,), self.dataset.data.header['shape'])
+
+    def test_import_into_async_with_missing_file_raises(self):
+        self.importer.source = 'foo.txt'
+        with self.assertRaises(FileNotFoundError):
+            run_coroutine(self.importer.import_into_async(self.dataset))
+
+    def test_import_with_same_importer_from_many_threads(self):
+        self.importer.source = 'testdata/sa281-02-280K.txt'
+        datasets = [uvvispy.dataset.ExperimentalDataset()
+                    for _ in range(50)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) \
+                as executor:
+            list(executor.map(self.importer.import_into, datasets))
+        for dataset in datasets:
+            np.testing.assert_array_equal(datasets[0].data.data,
+                                          dataset.data.data)
+            self.assertEqual('DPPTh2', dataset.metadata.sample.name)
+            self.assertEqual(1, len(dataset.annotations))
+
+class TestShimadzuASCIIExporter(unittest.TestCase):
+
+    def setUp(self):
+        self.exporter = uvvispy.io.ShimadzuASCIIExporter()
+        self.dataset = uvvispy.dataset.ExperimentalDataset()
+        self.directory = tempfile.mkdtemp()
+        self.target = os.path.join(self.directory, 'sa281-02-280K.txt')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _export(self):
+        self.exporter.target = self.target
+        self.dataset.export_to(self.exporter)
+        with open(self.target, 'rb') as file:
+            return file.read()
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_is_correct_type(self):
+        self.assertTrue(isinstance(self.exporter, aspecd.io.DatasetExporter))
+
+    def test_export_without_target_raises(self):
+        with self.assertRaises(aspecd.exceptions.MissingTargetError):
+            self.dataset.export_to(self.exporter)
+
+    def test_export_creates_file_with_extension(self):
+        self.target = os.path.join(self.directory, 'foo')
+        self.exporter.target = self.target
+        self.dataset.export_to(self.exporter)
+        self.assertTrue(os.path.exists(self.target + '.txt'))
+
+    def test_export_writes_file_identical_to_uvprobe(self):
+        self.dataset.import_from(uvvispy.io.ShimadzuASCIIImporter(
+            source='testdata/sa281-02-280K.txt'))
+        with open('testdata/sa281-02-280K.txt', 'rb') as file:
+            self.assertEqual(file.read(), self._export())
+
+    def test_export_of_2d_dataset_can_be_imported(self):
+        self.dataset.data.data = np.random.random((20, 3)) - 0.5
+        self.dataset.data.axes[0].values = np.linspace(300, 319, 20)
+        self.dataset.data.axes[1].values = np.asarray([0., 10.5, 21.])
+        self._export()
+        dataset = uvvispy.dataset.ExperimentalDataset()
+        dataset.import_from(uvvispy.io.ShimadzuASCIIImporter(
+            source=self.target))
+        self.assertTrue(np.allclose(self.dataset.data.data,
+                                    dataset.data.data, atol=5e-4))
+        self.assertTrue(np.array_equal(self.dataset.data.axes[1].values,
+                                       dataset.data.axes[1].values))
+
+    def test_export_writes_header(self):
+        self.dataset.data.data = np.zeros(2)
+        self.dataset.data.axes[1].quantity = 'transmittance'
+        lines = self._export().split(b'\r\n')
+        self.assertEqual(b'"sa281-02-280K - RawData"', lines[0])
+        self.assertEqual(b'"Wavelength nm."\t"%T"', lines[1])
+
+    def test_export_formats_numbers_like_printf(self):
+        values = [0.0005, -0.0005, 1.0005, 2.5e-3, -12.3456, 1234567.891]
+        self.dataset.data.data = np.asarray(values)
+        lines = self._export().split(b'\r\n')[2:-1]
+        expected = [('%.3f' % value).replace('.', ',').encode()
+                    for value in values]
+        self.assertEqual(expected, [line.split(b'\t')[1] for line in lines])
+
+    def test_export_writes_sign_of_negative_values_rounded_to_zero(self):
+        self.dataset.data.data = np.asarray([-0.0001])
+        self.assertTrue(self._export().endswith(b'0,00\t-0,000\r\n'))
+
+    def test_export_writes_non_finite_values(self):
+        self.dataset.data.data = np.asarray([np.nan, 1.])
+        lines = self._export().split(b'\r\n')
+        self.assertEqual(b'0,00\tnan', lines[2])
+        self.assertEqual(b'1,00\t1,000', lines[3])
+
+
+class TestCompoundDocument(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def setUp(self):
+        self.document = uvvispy.io.spc._CompoundDocument(
+            filename='testdata/sa281-02-280K.spc')
+        self.sector_size = self.document._sector_size
+
+    def _sector(self, sector):
+        begin = (sector + 1) * self.sector_size
+        return np.asarray(self.document._map[begin:begin + self.sector_size])
+
+    def test_read_chain_with_cycle_raises(self):
+        fat = np.full(8, 0xFFFFFFFE, dtype='<u4')
+        fat[[2, 3]] = [3, 2]
+        with self.assertRaises(ValueError):
+            self.document._read_chain(2, fat=fat)
+
+    def test_read_chain_with_invalid_sector_raises(self):
+        fat = np.full(8, 0xFFFFFFFE, dtype='<u4')
+        fat[2] = 42
+        with self.assertRaises(ValueError):
+            self.document._read_chain(2, fat=fat)
+
+    def test_read_chain_out_of_order_reads_sectors_in_chain_order(self):
+        fat = np.full(8, 0xFFFFFFFE, dtype='<u4')
+        fat[[3, 5, 4]] = [5, 4, 6]
+        contents = self.document._read_chain(3, fat=fat)
+        expected = np.concatenate([self._sector(sector)
+                                   for sector in [3, 5, 4, 6]])
+        self.assertTrue(np.array_equal(expected, contents))
+
+
+class TestShimadzuSPCImporter(unittest.TestCase):
+
+    def setUp(self):
+        self.importer = uvvispy.io.ShimadzuSPCImporter()
+        self.dataset = uvvispy.dataset.ExperimentalDataset()
+        self.dataset_file = 'testdata/sa281-02-280K.spc'
+        self.ascii_file = 'testdata/sa281-02-280K.txt'
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_is_correct_type(self):
+        self.assertTrue(isinstance(self.importer,
+                                   uvvispy.io.DatasetImporter))
+
+    def test_import_reads_data_matching_ascii_export(self):
+        ascii_dataset = uvvispy.dataset.ExperimentalDataset()
+        ascii_dataset.import_from(
+            uvvispy.io.ShimadzuASCIIImporter(source=self.ascii_file))
+        self.importer.source = self.dataset_file
+        self.dataset.import_from(self.importer)
+        self.assertTrue(np.array_equal(ascii_dataset.data.axes[0].values,
+                                       self.dataset.data.axes[0].values))
+        self.assertTrue(np.allclose(ascii_dataset.data.data,
+                                    self.dataset.data.data, atol=5e-4))
+
+    def test_import_does_not_alter_file(self):
+        with open(self.dataset_file, 'rb') as file:
+            contents = file.read()
+        self.importer.source = self.dataset_file
+        self.dataset.import_from(self.importer)
+        self.dataset.data.data *= 2
+        with open(self.dataset_file, 'rb') as file:
+            self.assertEqual(contents, file.read())
+
+    def test_import_reads_metadata_if_present(self):
+        self.importer.source = self.dataset_file
+        self.dataset.import_from(self.importer)
+        self.assertEqual('DPPTh2', self.dataset.metadata.sample.name)
+
+    def test_import_maps_measurement_parameters(self):
+        self.importer.source = self.dataset_file
+        self.dataset.import_from(self.importer)
+        self.assertEqual('Fast', self.dataset.metadata.experiment.scan_speed)
+        self.assertEqual(1.0, self.dataset.metadata.experiment.
+                         sampling_interval.value)
+        self.assertEqual(2.0, self.dataset.metadata.spectrometer.
+                         slit_width.value)
+        self.assertEqual('nm', self.dataset.metadata.spectrometer.
+                         slit_width.unit)
+
+    def test_import_sets_axes_descriptions(self):
+        self.importer.source = self.dataset_file
+        self.dataset.import_from(self.importer)
+        self.assertEqual("wavelength", self.dataset.data.axes[0].quantity)
+        self.assertEqual("absorbance", self.dataset.data.axes[1].quantity)
+
+    def test_import_with_dtype_and_compact_axes(self):
+        self.importer.source = self.dataset_file
+        self.importer.parameters["dtype"] = 'float32'
+        self.importer.parameters["compact_axes"] = True
+        self.dataset.import_from(self.importer)
+        self.assertEqual(np.float32, self.dataset.data.data.dtype)
+        self.assertTrue(self.dataset.data.axes[0].compact)
+
+    def test_import_with_other_file_raises(self):
+        self.importer.source = self.ascii_file
+        with self.assertRaises(ValueError):
+            self.dataset.import_from(self.importer)
+
+
+    def test_import_into_async_imports_same_as_import_into(self):
+        self.importer.source = self.dataset_file
+        dataset = uvvispy.dataset.ExperimentalDataset()
+        dataset.import_from(self.importer)
+        run_coroutine(self.importer.import_into_async(self.dataset))
+        np.testing.assert_array_equal(dataset.data.data,
+                                      self.dataset.data.data)
+        self.assertEqual(dataset.metadata.to_dict(),
+                         self.dataset.metadata.to_dict())
+
+
+class TestSeriesImporter(unittest.TestCase):
+
+    def setUp(self):
+        self.importer = uvvispy.io.SeriesImporter()
+        self.dataset = uvvispy.dataset.ExperimentalDataset()
+        self.directory = tempfile.mkdtemp()
+        with open('testdata/sa281-02-280K.yaml') as file:
+            metadata = file.read()
+        for temperature in (285, 280, 290):
+            basename = os.path.join(self.directory, 'sa-%iK' % temperature)
+            shutil.copy('testdata/sa281-02-280K.txt', basename + '.txt')
+            with open(basename + '.yaml', 'w') as file:
+                file.write(metadata.replace('280 K', '%i K' % temperature))
+        self.importer.source = os.path.join(self.directory, 'sa-*K.txt')
+        self.importer.parameters["processes"] = 1
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_is_correct_type(self):
+        self.assertTrue(isinstance(self.importer, uvvispy.io.DatasetImporter))
+
+    def test_import_creates_2d_dataset(self):
+        self.dataset.import_from(self.importer)
+        self.assertEqual((601, 3), self.dataset.data.data.shape)
+        self.assertTrue(self.dataset.data.data.flags['C_CONTIGUOUS'])
+
+    def test_import_keeps_first_axis(self):
+        self.dataset.import_from(self.importer)
+        self.assertEqual(300., self.dataset.data.axes[0].values[0])
+        self.assertEqual("wavelength", self.dataset.data.axes[0].quantity)
+        self.assertEqual("absorbance", self.dataset.data.axes[2].quantity)
+
+    def test_import_without_rule_numbers_datasets(self):
+        self.dataset.import_from(self.importer)
+        self.assertEqual([0., 1., 2.],
+                         list(self.dataset.data.axes[1].values))
+
+    def test_import_with_pattern_sets_sorted_axis_values(self):
+        self.importer.parameters["axis_value_pattern"] = r'-(\d+)K'
+        self.importer.parameters["axis_quantity"] = 'temperature'
+        self.importer.parameters["axis_unit"] = 'K'
+        self.dataset.import_from(self.importer)
+        self.assertEqual([280., 285., 290.],
+                         list(self.dataset.data.axes[1].values))
+        self.assertEqual('temperature', self.dataset.data.axes[1].quantity)
+        self.assertEqual('K', self.dataset.data.axes[1].unit)
+
+    def test_import_with_metadata_key_sets_axis(self):
+        self.importer.parameters["axis_value_metadata"] = \
+            'temperature_control.temperature'
+        self.dataset.import_from(self.importer)
+        self.assertEqual([280., 285., 290.],
+                         list(self.dataset.data.axes[1].values))
+        self.assertEqual('temperature', self.dataset.data.axes[1].quantity)
+        self.assertEqual('K', self.dataset.data.axes[1].unit)
+
+    def test_import_sets_metadata_of_first_dataset(self):
+        self.importer.parameters["axis_value_pattern"] = r'-(\d+)K'
+        self.dataset.import_from(self.importer)
+        self.assertEqual(
+            280., self.dataset.metadata.temperature_control.temperature.value)
+
+    def test_import_with_differing_axes_raises(self):
+        with open(os.path.join(self.directory, 'sa-290K.txt'), 'a') as file:
+            file.write('901,00\t1,000\n')
+        self.importer.source = os.path.join(self.directory, 'sa-2[89]0K.txt')
+        self.importer.parameters["axis_value_pattern"] = r'-(\d+)K'
+        with self.assertRaises(ValueError):
+            self.dataset.import_from(self.importer)
+
+    def test_import_with_several_processes(self):
+        self.importer.parameters["processes"] = 2
+        self.dataset.import_from(self.importer)
+        self.assertEqual((601, 3), self.dataset.data.data.shape)
+
+    def test_import_without_matching_files_raises(self):
+        self.importer.source = os.path.join(self.directory, '*.foo')
+        with self.assertRaises(FileNotFoundError):
+            self.dataset.import_from(self.importer)
+
+
+class TestUvdExporter(unittest.TestCase):
+
+    def setUp(self):
+        self.exporter = uvvispy.io.UvdExporter()
+        self.dataset = uvvispy.dataset.ExperimentalDataset()
+        self.dataset.import_from(uvvispy.io.ShimadzuASCIIImporter(
+            source='testdata/sa281-02-280K.txt'))
+        self.directory = tempfile.mkdtemp()
+        self.target = os.path.join(self.directory, 'foo')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_is_correct_type(self):
+        self.assertTrue(isinstance(self.exporter, aspecd.io.DatasetExporter))
+
+    def test_export_without_target_raises(self):
+        with self.assertRaises(aspecd.exceptions.MissingTargetError):
+            self.dataset.export_to(self.exporter)
+
+    def test_export_creates_file_with_extension(self):
+        self.exporter.target = self.target
+        self.dataset.export_to(self.exporter)
+        self.assertTrue(os.path.exists(self.target + '.uvd'))
+
+    def test_export_writes_magic_string(self):
+        self.exporter.target = self.target
+        self.dataset.export_to(self.exporter)
+        with open(self.target + '.uvd', 'rb') as file:
+            self.assertEqual(b'\x93UVVISPY', file.read(8))
+
+    def test_export_aligns_arrays(self):
+        self.exporter.target = self.target
+        self.dataset.export_to(self.exporter)
+        with open(self.target + '.uvd', 'rb') as file:
+            contents = file.read()
+        header_end = 20 + int.from_bytes(contents[12:20], 'little')
+        arrays = json.loads(contents[20:header_end])['arrays']
+        arrays_start = header_end + -header_end % 64
+        self.assertEqual(0, arrays_start % 64)
+        for array in arrays:
+            self.assertEqual(0, array['offset'] % 64)
+        data = np.frombuffer(contents, dtype=arrays[0]['dtype'],
+                             count=arrays[0]['shape'][0],
+                             offset=arrays_start + arrays[0]['offset'])
+        self.assertTrue(np.array_equal(self.dataset.data.data, data))
+
+
+class TestUvdImporter(unittest.TestCase):
+
+    def setUp(self):
+        self.importer = uvvispy.io.UvdImporter()
+        self.dataset = uvvispy.dataset.ExperimentalDataset()
+        self.dataset.import_from(uvvispy.io.ShimadzuASCIIImporter(
+            source='testdata/sa281-02-280K.txt'))
+        self.directory = tempfile.mkdtemp()
+        self.source = os.path.join(self.directory, 'foo.uvd')
+        self.dataset.export_to(uvvispy.io.UvdExporter(target=self.source))
+        self.imported_dataset = uvvispy.dataset.ExperimentalDataset()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_is_correct_type(self):
+        self.assertTrue(isinstance(self.importer, uvvispy.io.DatasetImporter))
+
+    def test_import_restores_data_and_axes(self):
+        self.importer.source = self.source
+        self.imported_dataset.import_from(self.importer)
+        self.assertTrue(np.array_equal(self.dataset.data.data,
+                                       self.imported_dataset.data.data))
+        for axis, imported_axis in zip(self.dataset.data.axes,
+                                       self.imported_dataset.data.axes):
+            self.assertTrue(np.array_equal(axis.values,
+                                           imported_axis.values))
+            self.assertEqual(axis.quantity, imported_axis.quantity)
+            self.assertEqual(axis.unit, imported_axis.unit)
+
+    def test_import_into_async_restores_writeable_data(self):
+        self.importer.source = self.source
+        run_coroutine(self.importer.import_into_async(self.imported_dataset))
+        self.assertTrue(np.array_equal(self.dataset.data.data,
+                                       self.imported_dataset.data.data))
+        self.imported_dataset.data.data[0] = 0.
+
+    def test_import_restores_metadata(self):
+        self.importer.source = self.source
+        self.imported_dataset.import_from(self.importer)
+        self.assertEqual(self.dataset.metadata.to_dict(),
+                         self.imported_dataset.metadata.to_dict())
+
+    def test_import_restores_annotations(self):
+        self.importer.source = self.source
+        self.imported_dataset.import_from(self.importer)
+        self.assertEqual(self.dataset.annotations[0].annotation.content,
+                         self.imported_dataset.annotations[0].annotation.content)
+
+    def test_import_restores_history(self):
+        self.dataset.process(aspecd.processing.Normalisation())
+        self.dataset.export_to(uvvispy.io.UvdExporter(target=self.source))
+        self.importer.source = self.source
+        self.imported_dataset.import_from(self.importer)
+        self.assertEqual(1, len(self.imported_dataset.history))
+        self.assertEqual('aspecd.processing.Normalisation',
+                         self.imported_dataset.history[0].processing.class_name)
+
+    def test_import_metadata_into_reads_metadata(self):
+        self.importer.source = self.source
+        self.importer.import_metadata_into(self.imported_dataset)
+        self.assertEqual(self.dataset.metadata.to_dict(),
+                         self.imported_dataset.metadata.to_dict())
+        self.assertEqual(0, self.imported_dataset.data.data.size)
+
+    def test_import_memory_maps_data(self):
+        self.importer.source = self.source
+        self.imported_dataset.import_from(self.importer)
+        self.assertTrue(isinstance(self.imported_dataset.data.data,
+                                   np.memmap))
+
+    def test_import_does_not_alter_file(self):
+        with open(self.source, 'rb') as file:
+            contents = file.read()
+        self.importer.source = self.source
+        self.imported_dataset.import_from(self.importer)
+        self.imported_dataset.data.data[:] = 0
+        with open(self.source, 'rb') as file:
+            self.assertEqual(contents, file.read())
+
+    def test_import_with_other_file_raises(self):
+        shutil.copy('testdata/sa281-02-280K.spc', self.source)
+        self.importer.source = self.source
+        with self.assertRaises(ValueError):
+            self.imported_dataset.import_from(self.importer)
+
+
+class TestImporterRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = uvvispy.io.ImporterRegistry()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _create_file(self, filename='foo.txt', contents=b''):
+        path = os.path.join(self.directory, filename)
+        with open(path, 'wb') as file:
+            file.write(contents)
+        return path
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_register_adds_extensions(self):
+        self.registry.register(importer=uvvispy.io.ShimadzuASCIIImporter,
+                               extensions=['.txt', '.TSV'])
+        self.assertEqual(['.txt', '.tsv'], self.registry.extensions)
+
+    def test_get_importer_with_unregistered_extension_returns_none(self):
+        self.assertIsNone(self.registry.get_importer(source='foo.bar'))
+
+    def test_get_importer_returns_importer_with_source(self):
+        self.registry.register(importer=uvvispy.io.ShimadzuASCIIImporter,
+                               extensions=['.txt'])
+        source = 'testdata/sa281-02-280K.txt'
+        importer = self.registry.get_importer(source=source)
+        self.assertTrue(isinstance(importer,
+                                   uvvispy.io.ShimadzuASCIIImporter))
+        self.assertEqual(source, importer.source)
+
+    def test_get_importer_returns_first_importer_recognising_file(self):
+        self.registry.register(importer=uvvispy.io.ShimadzuSPCImporter,
+                               extensions=['.txt'])
+        self.registry.register(importer=uvvispy.io.ShimadzuASCIIImporter,
+                               extensions=['.txt'])
+        importer = self.registry.get_importer(
+            source='testdata/sa281-02-280K.txt')
+        self.assertTrue(isinstance(importer,
+                                   uvvispy.io.ShimadzuASCIIImporter))
+
+    def test_get_importer_with_unrecognised_file_returns_none(self):
+        self.registry.register(importer=uvvispy.io.ShimadzuASCIIImporter,
+                               extensions=['.txt'])
+        source = self._create_file(contents=b'1.0 2.0\n3.0 4.0\n')
+        self.assertIsNone(self.registry.get_importer(source=source))
+
+    def test_get_importer_reads_only_header(self):
+        self.registry.register(importer=uvvispy.io.ShimadzuASCIIImporter,
+                               extensions=['.txt'])
+        self.registry.header_size = 8
+        self.assertIsNone(self.registry.get_importer(
+            source='testdata/sa281-02-280K.txt'))
+
+    def test_get_importer_with_header_does_not_read_file(self):
+        self.registry.register(importer=uvvispy.io.ShimadzuSPCImporter,
+                               extensions=['.txt'])
+        self.registry.register(importer=uvvispy.io.ShimadzuASCIIImporter,
+                               extensions=['.txt'])
+        with open('testdata/sa281-02-280K.spc', 'rb') as file:
+            header = file.read()
+        importer = self.registry.get_importer(
+            source='testdata/sa281-02-280K.txt', header=header)
+        self.assertTrue(isinstance(importer, uvvispy.io.ShimadzuSPCImporter))
+
+    def test_get_importer_with_missing_file_returns_first_importer(self):
+        self.registry.register(importer=uvvispy.io.ShimadzuASCIIImporter,
+                               extensions=['.txt'])
+        importer = self.registry.get_importer(source='foo.txt')
+        self.assertTrue(isinstance(importer,
+                                   uvvispy.io.ShimadzuASCIIImporter))
+
 
 class TestDatasetImporterFactory(unittest.TestCase):
 
@@ -223,3 +1076,327 @@ class TestDatasetImporterFactory(unittest.TestCase):
         source = './testdata/sa281-02-280K.txt'
         importer = self.factory.get_importer(source=source)
         self.assertTrue(isinstance(importer, uvvispy.io.ShimadzuASCIIImporter))
+
+    def test_get_importer_with_shimadzu_spc_returns_correct_importer(self):
+        source = './testdata/sa281-02-280K.spc'
+        importer = self.factory.get_importer(source=source)
+        self.assertTrue(isinstance(importer, uvvispy.io.ShimadzuSPCImporter))
+
+    def test_get_importer_with_other_txt_file_returns_aspecd_importer(self):
+        directory = tempfile.mkdtemp()
+        source = os.path.join(directory, 'foo.txt')
+        with open(source, 'w') as file:
+            file.write('1.0 2.0\n3.0 4.0\n')
+        importer = self.factory.get_importer(source=source)
+        shutil.rmtree(directory)
+        self.assertTrue(isinstance(importer, aspecd.io.TxtImporter))
+
+    def test_get_importer_with_registered_importer_returns_it(self):
+        class Importer(uvvispy.io.DatasetImporter):
+            pass
+        self.factory.registry.register(importer=Importer,
+                                       extensions=['.foo'])
+        importer = self.factory.get_importer(source='bar.foo')
+        self.assertTrue(isinstance(importer, Importer))
+
+    def test_extensions_contain_registered_extensions(self):
+        for extension in ['.txt', '.spc', '.uvd']:
+            self.assertIn(extension, self.factory.extensions)
+
+    def test_get_importer_with_uvd_returns_correct_importer(self):
+        source = './testdata/foo.uvd'
+        importer = self.factory.get_importer(source=source)
+        self.assertTrue(isinstance(importer, uvvispy.io.UvdImporter))
+
+    def test_get_importer_sets_cache(self):
+        self.factory.cache = uvvispy.io.ImportCache()
+        importer = self.factory.get_importer(source='foo')
+        self.assertIs(self.factory.cache, importer.cache)
+
+    def test_get_importer_sets_eviction_policy(self):
+        self.factory.eviction_policy = uvvispy.dataset.EvictionPolicy()
+        importer = self.factory.get_importer(source='foo')
+        self.assertIs(self.factory.eviction_policy,
+                      importer.eviction_policy)
+
+    def test_get_importer_adds_parameters_to_defaults(self):
+        source = './testdata/sa281-02-280K.txt'
+        importer = self.factory.get_importer(source=source,
+                                             parameters={'lazy': True})
+        self.assertTrue(importer.parameters['lazy'])
+        self.assertEqual(2, importer.parameters['skiprows'])
+
+    def test_get_importer_from_many_threads_returns_correct_importers(self):
+        sources = ['./testdata/sa281-02-280K.txt',
+                   './testdata/sa281-02-280K.spc'] * 200
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) \
+                as executor:
+            importers = list(executor.map(
+                lambda source: self.factory.get_importer(source=source),
+                sources))
+        for source, importer in zip(sources, importers):
+            self.assertEqual(os.path.abspath(source),
+                             os.path.abspath(importer.source))
+            self.assertEqual(os.path.splitext(source)[1] == '.txt',
+                             isinstance(importer,
+                                        uvvispy.io.ShimadzuASCIIImporter))
+
+    def test_import_from_many_threads_imports_correct_datasets(self):
+        directory = tempfile.mkdtemp()
+        with open('testdata/sa281-02-280K.yaml') as file:
+            metadata = file.read()
+        sources = []
+        for number in range(20):
+            source = os.path.join(directory, 'sample-%i.txt' % number)
+            shutil.copy('testdata/sa281-02-280K.txt', source)
+            with open(source.replace('.txt', '.yaml'), 'w') as file:
+                file.write(metadata.replace('DPPTh2', 'sample-%i' % number))
+            sources.append(source)
+        dataset_factory = uvvispy.dataset.DatasetFactory()
+        dataset_factory.importer_factory = self.factory
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) \
+                as executor:
+            datasets = list(executor.map(
+                lambda source: dataset_factory.get_dataset(source=source),
+                sources * 5))
+        shutil.rmtree(directory)
+        for source, dataset in zip(sources * 5, datasets):
+            self.assertEqual(source, dataset.id)
+            self.assertEqual(os.path.basename(source)[:-4],
+                             dataset.metadata.sample.name)
+            self.assertEqual(datasets[0].data.data.shape,
+                             dataset.data.data.shape)
+
+
+class TestImportCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = uvvispy.io.ImportCache(directory=self.directory)
+        self.source = os.path.join(self.directory, 'sa281-02-280K.txt')
+        shutil.copy('testdata/sa281-02-280K.txt', self.source)
+        shutil.copy('testdata/sa281-02-280K.yaml',
+                    os.path.join(self.directory, 'sa281-02-280K.yaml'))
+        self.importer = uvvispy.io.ShimadzuASCIIImporter(source=self.source)
+        self.importer.cache = self.cache
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _import(self):
+        dataset = uvvispy.dataset.ExperimentalDataset()
+        dataset.import_from(self.importer)
+        return dataset
+
+    def _entries(self):
+        return [name for name in os.listdir(self.directory)
+                if name.endswith('.pickle')]
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_has_default_directory(self):
+        self.assertTrue(uvvispy.io.ImportCache().directory)
+
+    def test_import_stores_dataset_in_cache(self):
+        self._import()
+        self.assertEqual(1, len(self._entries()))
+
+    def test_import_retrieves_dataset_from_cache(self):
+        self._import()
+        with open(os.path.join(self.directory, self._entries()[0]),
+                  'wb') as file:
+            pickle.dump({'references': ['cached']}, file)
+        cached_dataset = self._import()
+        self.assertEqual(['cached'], cached_dataset.references)
+        self.assertEqual(self.source, cached_dataset.id)
+
+    def test_cached_dataset_equals_imported_dataset(self):
+        dataset = self._import()
+        cached_dataset = self._import()
+        self.assertTrue(np.array_equal(dataset.data.data,
+                                       cached_dataset.data.data))
+        self.assertTrue(np.array_equal(dataset.data.axes[0].values,
+                                       cached_dataset.data.axes[0].values))
+        self.assertEqual(dataset.metadata.to_dict(),
+                         cached_dataset.metadata.to_dict())
+        self.assertEqual(len(dataset.annotations),
+                         len(cached_dataset.annotations))
+
+    def test_cached_dataset_has_original_data(self):
+        self._import()
+        cached_dataset = self._import()
+        # noinspection PyProtectedMember
+        self.assertTrue(np.array_equal(cached_dataset.data.data,
+                                       cached_dataset._origdata.data))
+
+    def test_changed_source_is_imported_anew(self):
+        self._import()
+        with open(self.source, 'ab') as file:
+            file.write(b'901,00\t0,100\r\n')
+        dataset = self._import()
+        self.assertEqual(2, len(self._entries()))
+        self.assertEqual(0.1, dataset.data.data[-1])
+
+    def test_changed_metadata_file_is_imported_anew(self):
+        self._import()
+        with open(os.path.join(self.directory, 'sa281-02-280K.yaml'),
+                  'a') as file:
+            file.write('\n')
+        self._import()
+        self.assertEqual(2, len(self._entries()))
+
+    def test_changed_parameters_are_imported_anew(self):
+        self._import()
+        self.importer.parameters["skiprows"] = 3
+        self._import()
+        self.assertEqual(2, len(self._entries()))
+
+    def test_corrupt_entry_is_imported_anew(self):
+        dataset = self._import()
+        with open(os.path.join(self.directory, self._entries()[0]),
+                  'wb') as file:
+            file.write(b'foo')
+        cached_dataset = self._import()
+        self.assertTrue(np.array_equal(dataset.data.data,
+                                       cached_dataset.data.data))
+
+    def test_retrieve_removes_stale_entry(self):
+        self._import()
+        key = self.cache.key(self.importer)
+        for contents in (b'cnonexistent_module\nfoo\n.', b'cos\nfoo\n.'):
+            with self.subTest(contents=contents):
+                with open(os.path.join(self.directory, key + '.pickle'),
+                          'wb') as file:
+                    file.write(contents)
+                dataset = uvvispy.dataset.ExperimentalDataset()
+                self.assertFalse(self.cache.retrieve(key, dataset))
+                self.assertEqual(0, len(self._entries()))
+
+    def test_failing_store_leaves_no_temporary_file(self):
+        dataset = self._import()
+        self.cache.clear()
+        dataset.references = [lambda: None]
+        with self.assertRaises(Exception):
+            self.cache.store(self.cache.key(self.importer), dataset)
+        self.assertFalse([name for name in os.listdir(self.directory)
+                          if name.endswith('.tmp')])
+
+    def test_eviction_respects_max_entries(self):
+        self.cache.max_entries = 1
+        self._import()
+        self.importer.parameters["skiprows"] = 3
+        self._import()
+        self.assertEqual(1, len(self._entries()))
+
+    def test_eviction_respects_max_size(self):
+        self.cache.max_size = 1
+        self._import()
+        self.assertEqual(0, len(self._entries()))
+
+    def test_eviction_removes_least_recently_used_entries(self):
+        self.cache.max_entries = 2
+        first_key = self.cache.key(self.importer)
+        self._import()
+        os.utime(os.path.join(self.directory, self._entries()[0]),
+                 ns=(0, 0))
+        self.importer.parameters["skiprows"] = 3
+        self._import()
+        self.importer.parameters["skiprows"] = 2
+        self._import()
+        self.importer.parameters["skiprows"] = 4
+        self._import()
+        self.assertIn(first_key + '.pickle', self._entries())
+
+    def test_clear_removes_all_entries(self):
+        self._import()
+        self.cache.clear()
+        self.assertEqual(0, len(self._entries()))
+
+    def test_eviction_removes_entries_down_to_low_water_mark(self):
+        self.cache.max_entries = 4
+        for skiprows in range(2, 7):
+            self.importer.parameters["skiprows"] = skiprows
+            self._import()
+        self.assertEqual(3, len(self._entries()))
+
+    def test_store_below_limits_does_not_scan_directory(self):
+        class Cache(uvvispy.io.ImportCache):
+            def __init__(self, directory=''):
+                super().__init__(directory=directory)
+                self.scans = 0
+
+            def _entries(self):
+                self.scans += 1
+                return super()._entries()
+
+        self.importer.cache = Cache(directory=self.directory)
+        for skiprows in range(2, 5):
+            self.importer.parameters["skiprows"] = skiprows
+            self._import()
+        self.assertEqual(1, self.importer.cache.scans)
+
+    def test_store_creates_directory_accessible_by_owner_only(self):
+        self.cache.directory = os.path.join(self.directory, 'cache')
+        self._import()
+        self.assertEqual(0o700,
+                         os.stat(self.cache.directory).st_mode & 0o777)
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), 'no user IDs on platform')
+    def test_retrieve_ignores_entries_of_other_users(self):
+        self._import()
+        key = self.cache.key(self.importer)
+        dataset = uvvispy.dataset.ExperimentalDataset()
+        with unittest.mock.patch('os.getuid', return_value=os.getuid() + 1):
+            self.assertFalse(self.cache.retrieve(key, dataset))
+        self.assertEqual(1, len(self._entries()))
+
+
+class TestFileReader(unittest.TestCase):
+
+    def setUp(self):
+        self.reader = uvvispy.io.FileReader()
+        self.filename = 'testdata/sa281-02-280K.txt'
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_read_returns_contents(self):
+        with open(self.filename, 'rb') as file:
+            contents = file.read()
+        self.assertEqual(contents,
+                         run_coroutine(self.reader.read(self.filename)))
+
+    def test_read_with_missing_file_returns_none(self):
+        self.assertIsNone(run_coroutine(self.reader.read('foo.txt')))
+
+    def test_read_all_returns_contents_in_order(self):
+        contents = run_coroutine(self.reader.read_all(
+            ['foo.txt', self.filename, 'testdata/sa281-02-280K.yaml']))
+        self.assertIsNone(contents[0])
+        self.assertTrue(contents[1].startswith(b'"sa281-02-280K'))
+        self.assertTrue(contents[2].startswith(b'---'))
+
+    def test_read_all_reads_at_most_max_concurrency_files(self):
+        class Reader(uvvispy.io.FileReader):
+            def __init__(self):
+                super().__init__()
+                self.running = 0
+                self.max_running = 0
+                self.lock = threading.Lock()
+
+            def _read(self, filename):
+                with self.lock:
+                    self.running += 1
+                    self.max_running = max(self.running, self.max_running)
+                time.sleep(0.01)
+                with self.lock:
+                    self.running -= 1
+                return b''
+
+        reader = Reader()
+        reader.max_concurrency = 2
+        reader.executor = concurrent.futures.ThreadPoolExecutor(8)
+        run_coroutine(reader.read_all(['foo.txt'] * 10))
+        reader.executor.shutdown()
+        self.assertEqual(2, reader.max_running)
@@ -127,11 +127,16 @@ class TestExperiment(unittest.TestCase):
 
     def test_has_attributes(self):
         attributes = [
-            'type', 'measurement_mode',
+            'type', 'measurement_mode', 'scan_speed', 'sampling_interval',
+            'scan_mode',
             ]
         for attr in attributes:
             self.assertTrue(hasattr(self.metadata, attr))
 
+    def test_sampling_interval_is_physical_quantity(self):
+        self.assertTrue(isinstance(self.metadata.sampling_interval,
+                                   aspecd.metadata.PhysicalQuantity))
+
 
 class TestSpectrometer(unittest.TestCase):
 
@@ -146,7 +151,12 @@ class TestSpectrometer(unittest.TestCase):
 
     def test_has_attributes(self):
         attributes = [
-            'manufacturer', 'model', 'software',
+            'manufacturer', 'model', 'software', 'slit_width',
+            'light_source_change_wavelength',
             ]
         for attr in attributes:
             self.assertTrue(hasattr(self.metadata, attr))
+
+    def test_slit_width_is_physical_quantity(self):
+        self.assertTrue(isinstance(self.metadata.slit_width,
+                                   aspecd.metadata.PhysicalQuantity))
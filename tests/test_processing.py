@@ -1,8 +1,14 @@
+import copy
 import importlib
 import unittest
 
+import aspecd.exceptions
 import aspecd.processing
+import numpy as np
+import scipy.interpolate
+import scipy.signal
 
+import uvvispy.dataset
 import uvvispy.processing
 
 
@@ -35,3 +41,781 @@ class TestProcessingStepsFromAspecd(unittest.TestCase):
     def test_baseline_correction_area_by_default_only_from_right(self):
         processing = uvvispy.processing.BaselineCorrection()
         self.assertEqual([0, 10], processing.parameters["fit_area"])
+
+
+class TestBaselineCorrection(unittest.TestCase):
+
+    def setUp(self):
+        self.processing = uvvispy.processing.BaselineCorrection()
+        self.dataset = uvvispy.dataset.ExperimentalDataset()
+        rng = np.random.default_rng(0)
+        self.dataset.data.data = rng.random((601, 20)) \
+            + np.linspace(0, 1, 601)[:, np.newaxis] ** 2
+        self.dataset.data.axes[0].values = np.linspace(300, 900, 601)
+        self.dataset.data.axes[1].values = np.linspace(0, 10, 20)
+
+    def _process_trace_by_trace(self):
+        processing = aspecd.processing.BaselineCorrection()
+        processing.parameters.update(copy.deepcopy(self.processing.parameters))
+        dataset = copy.deepcopy(self.dataset)
+        return dataset.process(processing), dataset
+
+    def test_result_equals_fit_of_each_trace(self):
+        for order in range(4):
+            with self.subTest(order=order):
+                self.processing.parameters["order"] = order
+                expected, expected_dataset = self._process_trace_by_trace()
+                dataset = copy.deepcopy(self.dataset)
+                processing = dataset.process(self.processing)
+                np.testing.assert_allclose(expected_dataset.data.data,
+                                           dataset.data.data, atol=1e-12)
+                np.testing.assert_allclose(
+                    expected.parameters["coefficients"],
+                    processing.parameters["coefficients"], atol=1e-12)
+
+    def test_result_along_second_axis_equals_fit_of_each_trace(self):
+        self.dataset.data.data = self.dataset.data.data[:20]
+        self.dataset.data.axes[0].values = np.linspace(300, 900, 20)
+        self.processing.parameters["axis"] = 1
+        self.processing.parameters["order"] = 1
+        _, expected_dataset = self._process_trace_by_trace()
+        self.dataset.process(self.processing)
+        np.testing.assert_allclose(expected_dataset.data.data,
+                                   self.dataset.data.data, atol=1e-12)
+
+    def test_result_for_1d_data_equals_fit(self):
+        data = self.dataset.data.data[:, 0]
+        self.dataset = uvvispy.dataset.ExperimentalDataset()
+        self.dataset.data.data = data
+        self.dataset.data.axes[0].values = np.linspace(300, 900, 601)
+        self.processing.parameters["fit_area"] = [10, 10]
+        self.processing.parameters["order"] = 2
+        _, expected_dataset = self._process_trace_by_trace()
+        self.dataset.process(self.processing)
+        np.testing.assert_allclose(expected_dataset.data.data,
+                                   self.dataset.data.data, atol=1e-12)
+
+    def test_retains_data_type(self):
+        self.dataset.data.data = self.dataset.data.data.astype(np.float32)
+        self.dataset.process(self.processing)
+        self.assertEqual(np.float32, self.dataset.data.data.dtype)
+
+    def test_corrects_read_only_data(self):
+        _, expected_dataset = self._process_trace_by_trace()
+        self.dataset.data.data.flags.writeable = False
+        self.dataset.process(self.processing)
+        np.testing.assert_allclose(expected_dataset.data.data,
+                                   self.dataset.data.data, atol=1e-12)
+
+    def test_with_too_few_points_for_order_falls_back_to_fit(self):
+        self.processing.parameters["fit_area"] = [0, 0.2]
+        self.processing.parameters["order"] = 2
+        _, expected_dataset = self._process_trace_by_trace()
+        self.dataset.process(self.processing)
+        np.testing.assert_allclose(expected_dataset.data.data,
+                                   self.dataset.data.data, atol=1e-12)
+
+
+class TestNormalisation(unittest.TestCase):
+
+    def setUp(self):
+        self.processing = uvvispy.processing.Normalisation()
+        self.dataset = uvvispy.dataset.ExperimentalDataset()
+        rng = np.random.default_rng(0)
+        self.dataset.data.data = rng.random((601, 20)) - 0.3
+        self.dataset.data.axes[0].values = np.linspace(300, 900, 601)
+        self.dataset.data.axes[1].values = np.linspace(0, 10, 20)
+
+    def _normalise_trace_by_trace(self, dataset):
+        data = np.empty_like(dataset.data.data)
+        for index in range(data.shape[1]):
+            trace = uvvispy.dataset.ExperimentalDataset()
+            trace.data.data = dataset.data.data[:, index].copy()
+            trace.data.axes[0].values = dataset.data.axes[0].values
+            processing = aspecd.processing.Normalisation()
+            parameters = copy.deepcopy(self.processing.parameters)
+            parameters.pop("axis")
+            processing.parameters.update(parameters)
+            trace.process(processing)
+            data[:, index] = trace.data.data
+        return data
+
+    def test_result_for_whole_data_equals_aspecd_normalisation(self):
+        processing = aspecd.processing.Normalisation()
+        processing.parameters["kind"] = 'amplitude'
+        self.processing.parameters["kind"] = 'amplitude'
+        expected_dataset = copy.deepcopy(self.dataset)
+        expected_dataset.process(processing)
+        self.dataset.process(self.processing)
+        np.testing.assert_allclose(expected_dataset.data.data,
+                                   self.dataset.data.data)
+
+    def test_normalises_each_trace_along_axis(self):
+        self.processing.parameters["axis"] = 0
+        for kind in ('maximum', 'minimum', 'amplitude', 'area'):
+            for range_ in (None, [340, 350]):
+                with self.subTest(kind=kind, range=range_):
+                    self.processing.parameters["kind"] = kind
+                    self.processing.parameters["range"] = range_
+                    self.processing.parameters["range_unit"] = 'axis'
+                    self.processing.parameters["noise_range"] = [0, 10]
+                    expected = self._normalise_trace_by_trace(self.dataset)
+                    dataset = copy.deepcopy(self.dataset)
+                    dataset.process(self.processing)
+                    np.testing.assert_allclose(expected, dataset.data.data)
+
+    def test_normalises_along_second_axis(self):
+        self.processing.parameters["axis"] = 1
+        self.dataset.process(self.processing)
+        np.testing.assert_allclose(np.ones(601),
+                                   self.dataset.data.data.max(axis=1))
+
+    def test_normalises_in_place(self):
+        data = self.dataset.data.data
+        self.dataset.process(self.processing)
+        self.assertIs(data, self.dataset.data.data)
+
+    def test_normalises_read_only_data(self):
+        self.dataset.data.data.flags.writeable = False
+        self.dataset.process(self.processing)
+        self.assertAlmostEqual(1., self.dataset.data.data.max())
+
+    def test_with_unknown_kind_raises(self):
+        self.processing.parameters["kind"] = 'foo'
+        with self.assertRaises(ValueError):
+            self.dataset.process(self.processing)
+
+    def test_with_axis_outside_data_dimensions_raises(self):
+        self.processing.parameters["axis"] = 2
+        with self.assertRaises(ValueError):
+            self.dataset.process(self.processing)
+
+    def test_process_datasets_normalises_each_dataset(self):
+        self.processing.parameters["kind"] = 'area'
+        self.processing.parameters["range"] = [[340, 350], [2, 8]]
+        self.processing.parameters["range_unit"] = 'axis'
+        datasets = [copy.deepcopy(self.dataset) for _ in range(5)]
+        for index, dataset in enumerate(datasets):
+            dataset.data.data += index
+        expected_datasets = copy.deepcopy(datasets)
+        for dataset in expected_datasets:
+            dataset.process(self.processing)
+        self.processing.process_datasets(datasets)
+        for dataset, expected_dataset in zip(datasets, expected_datasets):
+            np.testing.assert_allclose(expected_dataset.data.data,
+                                       dataset.data.data)
+            self.assertEqual(1, len(dataset.history))
+            self.assertEqual('uvvispy.processing.Normalisation',
+                             dataset.history[0].processing.class_name)
+
+    def test_process_datasets_with_different_axes_raises(self):
+        other_dataset = copy.deepcopy(self.dataset)
+        other_dataset.data.axes[0].values = np.linspace(200, 800, 601)
+        with self.assertRaises(ValueError):
+            self.processing.process_datasets([self.dataset, other_dataset])
+
+
+class TestRangeExtraction(unittest.TestCase):
+
+    def setUp(self):
+        self.processing = uvvispy.processing.RangeExtraction()
+        self.dataset = uvvispy.dataset.ExperimentalDataset()
+        self.dataset.data.data = np.random.random(601)
+        self.dataset.data.axes[0] = uvvispy.dataset.UniformAxis()
+        self.dataset.data.axes[0].values = np.linspace(300, 900, 601)
+
+    def test_keeps_uniform_axis_compact(self):
+        self.processing.parameters["range"] = [400, 500]
+        self.processing.parameters["unit"] = 'axis'
+        self.dataset.process(self.processing)
+        axis = self.dataset.data.axes[0]
+        self.assertTrue(axis.compact)
+        self.assertEqual(400., axis.start)
+        self.assertEqual(100, axis.length)
+
+    def test_result_equals_aspecd_range_extraction(self):
+        for unit, range_ in (('index', [5, 50, 2]), ('axis', [400, 500]),
+                             ('percentage', [10, 20])):
+            with self.subTest(unit=unit):
+                self.processing.parameters["range"] = range_
+                self.processing.parameters["unit"] = unit
+                processing = aspecd.processing.RangeExtraction()
+                processing.parameters.update(range=range_, unit=unit)
+                expected_dataset = copy.deepcopy(self.dataset)
+                expected_dataset.process(processing)
+                dataset = copy.deepcopy(self.dataset)
+                dataset.process(self.processing)
+                np.testing.assert_array_equal(expected_dataset.data.data,
+                                              dataset.data.data)
+
+
+class TestInterpolation(unittest.TestCase):
+
+    def setUp(self):
+        self.processing = uvvispy.processing.Interpolation()
+        self.processing.parameters["range"] = [400, 700]
+        self.processing.parameters["npoints"] = 1201
+        self.processing.parameters["unit"] = 'axis'
+        self.dataset = uvvispy.dataset.ExperimentalDataset()
+        self.dataset.data.data = np.random.random(601)
+        self.dataset.data.axes[0].values = np.linspace(300, 900, 601)
+
+    def test_retains_data_type(self):
+        self.dataset.data.data = self.dataset.data.data.astype(np.float32)
+        self.dataset.process(self.processing)
+        self.assertEqual(np.float32, self.dataset.data.data.dtype)
+
+    def test_keeps_uniform_axis_compact(self):
+        self.dataset.data.axes[0] = uvvispy.dataset.UniformAxis.from_axis(
+            self.dataset.data.axes[0])
+        self.dataset.process(self.processing)
+        axis = self.dataset.data.axes[0]
+        self.assertTrue(axis.compact)
+        self.assertEqual(0.25, axis.step)
+        self.assertEqual(1201, axis.length)
+
+    def test_result_equals_aspecd_interpolation(self):
+        processing = aspecd.processing.Interpolation()
+        processing.parameters.update(copy.deepcopy(self.processing.parameters))
+        expected_dataset = copy.deepcopy(self.dataset)
+        expected_dataset.process(processing)
+        self.dataset.process(self.processing)
+        np.testing.assert_allclose(expected_dataset.data.data,
+                                   self.dataset.data.data, atol=1e-14)
+        np.testing.assert_array_equal(expected_dataset.data.axes[0].values,
+                                      self.dataset.data.axes[0].values)
+
+    def test_with_descending_axis_values(self):
+        expected_dataset = copy.deepcopy(self.dataset)
+        expected_dataset.process(self.processing)
+        self.dataset.data.data = self.dataset.data.data[::-1]
+        self.dataset.data.axes[0].values = np.linspace(900, 300, 601)
+        self.processing.parameters["range"] = [700, 400]
+        self.dataset.process(self.processing)
+        np.testing.assert_allclose(expected_dataset.data.data[::-1],
+                                   self.dataset.data.data, atol=1e-14)
+
+    def test_interpolates_2d_data_bilinearly(self):
+        data = np.random.random((61, 11))
+        self.dataset.data.data = data
+        self.dataset.data.axes[0].values = np.linspace(300, 900, 61)
+        self.dataset.data.axes[1].values = np.linspace(0, 10, 11)
+        self.processing.parameters["range"] = [[400, 700], [2, 8]]
+        self.processing.parameters["npoints"] = [31, 13]
+        self.dataset.process(self.processing)
+        interpolator = scipy.interpolate.RegularGridInterpolator(
+            (np.linspace(300, 900, 61), np.linspace(0, 10, 11)), data)
+        grid = np.meshgrid(np.linspace(400, 700, 31), np.linspace(2, 8, 13),
+                           indexing='ij')
+        np.testing.assert_allclose(interpolator(tuple(grid)),
+                                   self.dataset.data.data, atol=1e-14)
+
+    def test_caches_interpolation_weights(self):
+        self.dataset.process(self.processing)
+        info = uvvispy.processing._interpolation_weights.cache_info()
+        dataset = copy.deepcopy(self.dataset)
+        dataset.data.axes[0].values = np.linspace(300, 900, 601)
+        dataset.data.data = np.random.random(601)
+        dataset.process(self.processing)
+        self.assertEqual(
+            info.hits + 1,
+            uvvispy.processing._interpolation_weights.cache_info().hits)
+
+    def test_process_datasets_interpolates_each_dataset(self):
+        datasets = [copy.deepcopy(self.dataset) for _ in range(5)]
+        for dataset in datasets:
+            dataset.data.data = np.random.random(601)
+        expected_datasets = copy.deepcopy(datasets)
+        for dataset in expected_datasets:
+            dataset.process(self.processing)
+        self.processing.process_datasets(datasets)
+        for dataset, expected_dataset in zip(datasets, expected_datasets):
+            np.testing.assert_allclose(expected_dataset.data.data,
+                                       dataset.data.data)
+            np.testing.assert_array_equal(expected_dataset.data.axes[0].values,
+                                          dataset.data.axes[0].values)
+            self.assertEqual(1, len(dataset.history))
+
+    def test_process_datasets_writes_to_given_array(self):
+        datasets = [copy.deepcopy(self.dataset) for _ in range(5)]
+        expected_datasets = copy.deepcopy(datasets)
+        for dataset in expected_datasets:
+            dataset.process(self.processing)
+        self.processing.chunk_size = 2
+        out = np.zeros((5, 1201))
+        self.processing.process_datasets(datasets, out=out)
+        for index, dataset in enumerate(datasets):
+            self.assertIs(out, dataset.data.data.base)
+            np.testing.assert_allclose(expected_datasets[index].data.data,
+                                       out[index])
+
+    def test_process_datasets_with_different_axes_raises(self):
+        other_dataset = copy.deepcopy(self.dataset)
+        other_dataset.data.axes[0].values = np.linspace(200, 800, 601)
+        with self.assertRaises(ValueError):
+            self.processing.process_datasets([self.dataset, other_dataset])
+
+
+class TestCommonRangeExtraction(unittest.TestCase):
+
+    def setUp(self):
+        self.processing = uvvispy.processing.CommonRangeExtraction()
+        self.datasets = []
+        for index in range(6):
+            dataset = uvvispy.dataset.ExperimentalDataset()
+            dataset.data.data = np.random.random(601)
+            dataset.data.axes[0].values = \
+                np.linspace(300, 900, 601) + 50 * (index % 2)
+            self.datasets.append(dataset)
+
+    def test_result_equals_aspecd_common_range_extraction(self):
+        expected_datasets = copy.deepcopy(self.datasets)
+        processing = aspecd.processing.CommonRangeExtraction()
+        processing.datasets = expected_datasets
+        processing.process()
+        self.processing.datasets = self.datasets
+        self.processing.process()
+        for dataset, expected_dataset in zip(self.datasets,
+                                             expected_datasets):
+            np.testing.assert_allclose(expected_dataset.data.data,
+                                       dataset.data.data, atol=1e-14)
+            np.testing.assert_array_equal(expected_dataset.data.axes[0].values,
+                                          dataset.data.axes[0].values)
+            self.assertEqual(len(expected_dataset.history),
+                             len(dataset.history))
+
+    def test_result_for_different_grids_equals_aspecd(self):
+        for index, dataset in enumerate(self.datasets):
+            dataset.data.data = np.random.random(401 + 100 * (index % 3))
+            dataset.data.axes[0].values = np.linspace(
+                300 + 10 * (index % 3), 900, 401 + 100 * (index % 3))
+        self.test_result_equals_aspecd_common_range_extraction()
+
+    def test_data_of_datasets_are_views_of_one_array(self):
+        self.processing.datasets = self.datasets
+        self.processing.process()
+        buffer = self.datasets[0].data.data.base
+        self.assertEqual((6, 551), buffer.shape)
+        for dataset in self.datasets:
+            self.assertIs(buffer, dataset.data.data.base)
+            self.assertTrue(dataset.data.data.flags.c_contiguous)
+
+    def test_retains_data_type(self):
+        for dataset in self.datasets:
+            dataset.data.data = dataset.data.data.astype(np.float32)
+        self.processing.datasets = self.datasets
+        self.processing.process()
+        for dataset in self.datasets:
+            self.assertEqual(np.float32, dataset.data.data.dtype)
+
+    def test_with_different_dimensions_raises(self):
+        self.datasets[1].data.data = np.random.random((601, 2))
+        self.processing.datasets = self.datasets
+        with self.assertRaisesRegex(ValueError, "dimensions"):
+            self.processing.process()
+
+    def test_with_disjoint_axes_raises(self):
+        self.datasets[1].data.axes[0].values = np.linspace(1000, 1600, 601)
+        self.processing.datasets = self.datasets
+        with self.assertRaisesRegex(ValueError, "disjoint"):
+            self.processing.process()
+
+    def test_with_different_units_raises(self):
+        self.datasets[1].data.axes[0].unit = 'eV'
+        self.processing.datasets = self.datasets
+        with self.assertRaisesRegex(ValueError, "units"):
+            self.processing.process()
+
+    def test_with_different_units_and_ignore_units(self):
+        self.datasets[1].data.axes[0].unit = 'eV'
+        self.processing.parameters["ignore_units"] = True
+        self.processing.datasets = self.datasets
+        self.processing.process()
+        self.assertEqual(551, self.datasets[1].data.data.size)
+
+    def test_calculates_weights_once_per_axis(self):
+        uvvispy.processing._interpolation_weights.cache_clear()
+        self.processing.datasets = self.datasets
+        self.processing.process()
+        self.assertEqual(
+            2, uvvispy.processing._interpolation_weights.cache_info().misses)
+
+
+class TestFiltering(unittest.TestCase):
+
+    def setUp(self):
+        self.processing = uvvispy.processing.Filtering()
+        self.processing.parameters["window_length"] = 11
+        self.processing.parameters["order"] = 3
+        self.dataset = uvvispy.dataset.ExperimentalDataset()
+        rng = np.random.default_rng(0)
+        self.dataset.data.data = rng.random(601)
+        self.dataset.data.axes[0].values = np.linspace(300, 900, 601)
+
+    def test_result_for_1d_data_equals_aspecd_filter(self):
+        for type_ in ('savitzky-golay', 'uniform', 'gaussian'):
+            for window_length in (5, 6):
+                with self.subTest(type=type_, window_length=window_length):
+                    self.processing.parameters["type"] = type_
+                    self.processing.parameters["window_length"] = \
+                        window_length
+                    processing = aspecd.processing.Filtering()
+                    processing.parameters.update(
+                        type=type_, window_length=window_length, order=3)
+                    expected_dataset = copy.deepcopy(self.dataset)
+                    expected_dataset.process(processing)
+                    dataset = copy.deepcopy(self.dataset)
+                    dataset.process(self.processing)
+                    np.testing.assert_allclose(expected_dataset.data.data,
+                                               dataset.data.data, atol=1e-12)
+
+    def test_result_for_2d_data_equals_aspecd_filter(self):
+        self.dataset.data.data = np.random.default_rng(1).random((601, 20))
+        self.dataset.data.axes[1].values = np.linspace(0, 19, 20)
+        self.processing.parameters["window_length"] = 5
+        for type_ in ('savitzky-golay', 'uniform', 'gaussian'):
+            with self.subTest(type=type_):
+                self.processing.parameters["type"] = type_
+                processing = aspecd.processing.Filtering()
+                processing.parameters.update(type=type_, window_length=5,
+                                             order=3)
+                expected_dataset = copy.deepcopy(self.dataset)
+                expected_dataset.process(processing)
+                dataset = copy.deepcopy(self.dataset)
+                dataset.process(self.processing)
+                np.testing.assert_allclose(expected_dataset.data.data,
+                                           dataset.data.data, atol=1e-12)
+
+    def test_result_for_2d_data_equals_filter_of_each_trace(self):
+        data = np.random.default_rng(1).random((601, 20))
+        self.dataset.data.data = data
+        self.processing.parameters["axis"] = 0
+        for type_ in ('savitzky-golay', 'uniform', 'gaussian'):
+            with self.subTest(type=type_):
+                self.processing.parameters["type"] = type_
+                dataset = copy.deepcopy(self.dataset)
+                dataset.process(self.processing)
+                for index in range(data.shape[1]):
+                    trace = uvvispy.dataset.ExperimentalDataset()
+                    trace.data.data = data[:, index]
+                    trace.process(copy.deepcopy(self.processing))
+                    np.testing.assert_allclose(trace.data.data,
+                                               dataset.data.data[:, index],
+                                               atol=1e-12)
+
+    def test_filters_along_given_axis(self):
+        data = np.random.default_rng(1).random((20, 601))
+        self.dataset.data.data = data
+        self.processing.parameters["type"] = 'savitzky-golay'
+        self.processing.parameters["axis"] = 1
+        self.dataset.process(self.processing)
+        np.testing.assert_allclose(scipy.signal.savgol_filter(data, 11, 3),
+                                   self.dataset.data.data, atol=1e-12)
+
+    def test_with_window_exceeding_axis_raises(self):
+        self.dataset.data.data = np.random.random((601, 20))
+        self.processing.parameters["type"] = 'uniform'
+        self.processing.parameters["window_length"] = 21
+        self.processing.parameters["axis"] = 1
+        with self.assertRaises(ValueError):
+            self.dataset.process(self.processing)
+
+    def test_returns_derivative(self):
+        self.processing.parameters["type"] = 'savitzky-golay'
+        for derivative in (1, 2):
+            with self.subTest(derivative=derivative):
+                self.processing.parameters["derivative"] = derivative
+                dataset = copy.deepcopy(self.dataset)
+                dataset.process(self.processing)
+                np.testing.assert_allclose(
+                    scipy.signal.savgol_filter(self.dataset.data.data, 11, 3,
+                                               deriv=derivative, delta=1.),
+                    dataset.data.data, atol=1e-12)
+
+    def test_caches_kernel(self):
+        self.processing.parameters["type"] = 'savitzky-golay'
+        self.dataset.process(self.processing)
+        info = uvvispy.processing._filter_kernel.cache_info()
+        dataset = copy.deepcopy(self.dataset)
+        dataset.process(copy.deepcopy(self.processing))
+        self.assertEqual(info.hits + 1,
+                         uvvispy.processing._filter_kernel.cache_info().hits)
+
+    def test_retains_data_type(self):
+        self.dataset.data.data = self.dataset.data.data.astype(np.float32)
+        for type_ in ('savitzky-golay', 'uniform', 'gaussian'):
+            with self.subTest(type=type_):
+                self.processing.parameters["type"] = type_
+                dataset = copy.deepcopy(self.dataset)
+                dataset.process(self.processing)
+                self.assertEqual(np.float32, dataset.data.data.dtype)
+
+    def test_process_datasets_filters_each_dataset(self):
+        self.dataset.data.data = np.random.default_rng(1).random((601, 20))
+        self.dataset.data.axes[1].values = np.linspace(0, 19, 20)
+        datasets = [copy.deepcopy(self.dataset) for _ in range(5)]
+        for index, dataset in enumerate(datasets):
+            dataset.data.data = dataset.data.data * index
+        for type_ in ('savitzky-golay', 'uniform', 'gaussian'):
+            for axis in (None, 0):
+                with self.subTest(type=type_, axis=axis):
+                    self.processing.parameters["type"] = type_
+                    self.processing.parameters["axis"] = axis
+                    expected_datasets = copy.deepcopy(datasets)
+                    for dataset in expected_datasets:
+                        dataset.process(copy.deepcopy(self.processing))
+                    filtered_datasets = self.processing.process_datasets(
+                        copy.deepcopy(datasets))
+                    for dataset, expected_dataset in zip(filtered_datasets,
+                                                         expected_datasets):
+                        np.testing.assert_allclose(
+                            expected_dataset.data.data, dataset.data.data,
+                            atol=1e-12)
+                        self.assertEqual(1, len(dataset.history))
+                        self.assertEqual(
+                            'uvvispy.processing.Filtering',
+                            dataset.history[0].processing.class_name)
+
+    def test_process_datasets_with_different_axes_raises(self):
+        self.processing.parameters["type"] = 'uniform'
+        other_dataset = copy.deepcopy(self.dataset)
+        other_dataset.data.axes[0].values = np.linspace(200, 800, 601)
+        with self.assertRaises(ValueError):
+            self.processing.process_datasets([self.dataset, other_dataset])
+
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset = uvvispy.dataset.ExperimentalDataset()
+        rng = np.random.default_rng(0)
+        self.dataset.data.data = rng.random((601, 20)) \
+            + np.linspace(0, 1, 601)[:, np.newaxis] ** 2
+        self.dataset.data.axes[0].values = np.linspace(300, 900, 601)
+        self.dataset.data.axes[1].values = np.linspace(0, 10, 20)
+        baseline_correction = uvvispy.processing.BaselineCorrection()
+        baseline_correction.parameters["order"] = 1
+        multiplication = uvvispy.processing.ScalarAlgebra()
+        multiplication.parameters["kind"] = "multiply"
+        multiplication.parameters["value"] = -3.
+        addition = uvvispy.processing.ScalarAlgebra()
+        addition.parameters["kind"] = "add"
+        addition.parameters["value"] = 0.5
+        axis_algebra = uvvispy.processing.ScalarAxisAlgebra()
+        axis_algebra.parameters["kind"] = "add"
+        axis_algebra.parameters["value"] = 100
+        normalisation = uvvispy.processing.Normalisation()
+        normalisation.parameters["kind"] = "area"
+        normalisation.parameters["axis"] = 0
+        normalisation.parameters["range"] = [440, 450]
+        normalisation.parameters["range_unit"] = "axis"
+        self.steps = [multiplication, addition, baseline_correction,
+                      axis_algebra, addition, normalisation]
+
+    def _process_step_by_step(self):
+        dataset = copy.deepcopy(self.dataset)
+        for step in self.steps:
+            dataset.process(step)
+        return dataset
+
+    def test_result_equals_processing_step_by_step(self):
+        expected = self._process_step_by_step()
+        pipeline = uvvispy.processing.Pipeline(steps=self.steps)
+        dataset = pipeline.process(copy.deepcopy(self.dataset))
+        np.testing.assert_allclose(expected.data.data, dataset.data.data,
+                                   atol=1e-12)
+        np.testing.assert_allclose(expected.data.axes[0].values,
+                                   dataset.data.axes[0].values)
+
+    def test_records_each_step_in_history(self):
+        expected = self._process_step_by_step()
+        pipeline = uvvispy.processing.Pipeline(steps=self.steps)
+        dataset = pipeline.process(copy.deepcopy(self.dataset))
+        self.assertEqual(len(self.steps), len(dataset.history))
+        for record, expected_record in zip(dataset.history,
+                                           expected.history):
+            self.assertEqual(expected_record.processing.class_name,
+                             record.processing.class_name)
+        np.testing.assert_allclose(
+            expected.history[2].processing.parameters["coefficients"],
+            dataset.history[2].processing.parameters["coefficients"])
+
+    def test_with_other_step_equals_processing_step_by_step(self):
+        filtering = uvvispy.processing.Filtering()
+        filtering.parameters["type"] = "savitzky-golay"
+        filtering.parameters["window_length"] = 11
+        filtering.parameters["order"] = 3
+        self.steps.insert(2, filtering)
+        expected = self._process_step_by_step()
+        pipeline = uvvispy.processing.Pipeline(steps=self.steps)
+        dataset = pipeline.process(copy.deepcopy(self.dataset))
+        np.testing.assert_allclose(expected.data.data, dataset.data.data,
+                                   atol=1e-12)
+        self.assertEqual('uvvispy.processing.Filtering',
+                         dataset.history[2].processing.class_name)
+
+    def test_with_baseline_fitted_to_each_trace(self):
+        self.steps[2].parameters["fit_area"] = [0, 0.2]
+        self.steps[2].parameters["order"] = 2
+        expected = self._process_step_by_step()
+        self.dataset.data.data.flags.writeable = False
+        pipeline = uvvispy.processing.Pipeline(steps=self.steps)
+        dataset = pipeline.process(copy.deepcopy(self.dataset))
+        np.testing.assert_allclose(expected.data.data, dataset.data.data,
+                                   atol=1e-12)
+
+    def test_changes_data_in_place(self):
+        data = self.dataset.data.data
+        pipeline = uvvispy.processing.Pipeline(steps=self.steps)
+        pipeline.process(self.dataset)
+        self.assertIs(data, self.dataset.data.data)
+
+    def test_with_integer_data(self):
+        self.dataset.data.data = np.arange(601 * 20).reshape(601, 20)
+        self.steps = self.steps[:2]
+        expected = self._process_step_by_step()
+        pipeline = uvvispy.processing.Pipeline(steps=self.steps)
+        dataset = pipeline.process(copy.deepcopy(self.dataset))
+        np.testing.assert_allclose(expected.data.data, dataset.data.data)
+
+    def test_without_dataset_raises(self):
+        pipeline = uvvispy.processing.Pipeline(steps=self.steps)
+        with self.assertRaises(aspecd.exceptions.MissingDatasetError):
+            pipeline.process()
+
+    def test_lazy_defers_processing_until_access_to_data(self):
+        pipeline = uvvispy.processing.Pipeline(steps=self.steps)
+        pipeline.lazy = True
+        dataset = pipeline.process(copy.deepcopy(self.dataset))
+        self.assertTrue(dataset.data.pending)
+        self.assertEqual(0, len(dataset.history))
+        expected = self._process_step_by_step()
+        np.testing.assert_allclose(expected.data.data, dataset.data.data,
+                                   atol=1e-12)
+        self.assertEqual(len(self.steps), len(dataset.history))
+
+    def test_lazy_appends_steps_to_pending_steps(self):
+        pipeline = uvvispy.processing.Pipeline(steps=self.steps[:3])
+        pipeline.lazy = True
+        dataset = pipeline.process(copy.deepcopy(self.dataset))
+        pipeline.steps = self.steps[3:]
+        pipeline.process(dataset)
+        expected = self._process_step_by_step()
+        np.testing.assert_allclose(expected.data.data, dataset.data.data,
+                                   atol=1e-12)
+        self.assertEqual(len(self.steps), len(dataset.history))
+
+
+class _ShapeRecordingFiltering(uvvispy.processing.Filtering):
+
+    shapes = []
+
+    def _perform_task(self):
+        self.shapes.append(self.dataset.data.data.shape)
+        super()._perform_task()
+
+
+class TestPipelineWithRangeExtraction(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset = uvvispy.dataset.ExperimentalDataset()
+        rng = np.random.default_rng(0)
+        self.dataset.data.data = rng.random((601, 5))
+        self.dataset.data.axes[0].values = np.linspace(300, 900, 601)
+        self.dataset.data.axes[1].values = np.linspace(0, 4, 5)
+        self.filtering = _ShapeRecordingFiltering()
+        self.filtering.parameters["type"] = "savitzky-golay"
+        self.filtering.parameters["window_length"] = 11
+        self.filtering.parameters["order"] = 3
+        self.filtering.parameters["axis"] = 0
+        self.range_extraction = uvvispy.processing.RangeExtraction()
+        self.range_extraction.parameters["range"] = [[400, 500], [1, 3]]
+        self.range_extraction.parameters["unit"] = "axis"
+        _ShapeRecordingFiltering.shapes = []
+
+    def _process(self, steps):
+        expected = copy.deepcopy(self.dataset)
+        for step in steps:
+            expected.process(step)
+        pipeline = uvvispy.processing.Pipeline(steps=steps)
+        dataset = pipeline.process(copy.deepcopy(self.dataset))
+        return expected, dataset
+
+    def test_result_equals_processing_step_by_step(self):
+        for type_ in ('savitzky-golay', 'uniform', 'gaussian'):
+            for range_ in ([400, 500], [300, 350], [850, 900]):
+                with self.subTest(type=type_, range=range_):
+                    self.filtering.parameters["type"] = type_
+                    self.range_extraction.parameters["range"][0] = range_
+                    expected, dataset = self._process(
+                        [self.filtering, self.range_extraction])
+                    np.testing.assert_allclose(expected.data.data,
+                                               dataset.data.data, atol=1e-12)
+                    np.testing.assert_allclose(
+                        expected.data.axes[0].values,
+                        dataset.data.axes[0].values)
+
+    def test_with_filter_along_all_axes(self):
+        self.filtering.parameters["type"] = "uniform"
+        self.filtering.parameters["window_length"] = 3
+        self.filtering.parameters["axis"] = None
+        expected, dataset = self._process(
+            [self.filtering, self.range_extraction])
+        np.testing.assert_allclose(expected.data.data, dataset.data.data,
+                                   atol=1e-12)
+
+    def test_filters_only_range_needed(self):
+        self._process([self.filtering, self.range_extraction])
+        self.assertEqual([(601, 5), (100 + 2 * 11, 2)],
+                         _ShapeRecordingFiltering.shapes)
+
+    def test_records_steps_given_in_history(self):
+        expected, dataset = self._process(
+            [self.filtering, self.range_extraction])
+        self.assertEqual([record.processing.class_name
+                          for record in expected.history],
+                         [record.processing.class_name
+                          for record in dataset.history])
+        np.testing.assert_array_equal(
+            expected.history[1].processing.parameters["range"],
+            dataset.history[1].processing.parameters["range"])
+
+    def test_interpolates_only_range_needed(self):
+        interpolation = uvvispy.processing.Interpolation()
+        interpolation.parameters["range"] = [[310, 890], [0, 4]]
+        interpolation.parameters["npoints"] = [1161, 9]
+        interpolation.parameters["unit"] = "axis"
+        scalar_algebra = uvvispy.processing.ScalarAlgebra()
+        scalar_algebra.parameters["kind"] = "multiply"
+        scalar_algebra.parameters["value"] = 2
+        expected, dataset = self._process(
+            [self.filtering, scalar_algebra, interpolation, self.filtering,
+             self.range_extraction])
+        np.testing.assert_allclose(expected.data.data, dataset.data.data,
+                                   atol=1e-12)
+        for axis, expected_axis in zip(dataset.data.axes,
+                                       expected.data.axes):
+            np.testing.assert_array_equal(expected_axis.values, axis.values)
+        self.assertEqual((200 + 2 * 11, 4),
+                         _ShapeRecordingFiltering.shapes[-1])
+        np.testing.assert_array_equal(
+            interpolation.parameters["npoints"],
+            dataset.history[2].processing.parameters["npoints"])
+
+    def test_with_range_in_indices_and_steps(self):
+        self.range_extraction.parameters["range"] = [[10, 300, 3],
+                                                     [1, 4, 1]]
+        self.range_extraction.parameters["unit"] = "index"
+        expected, dataset = self._process(
+            [self.filtering, self.range_extraction])
+        np.testing.assert_allclose(expected.data.data, dataset.data.data,
+                                   atol=1e-12)
+
+    def test_with_derivative_does_not_push_down(self):
+        self.filtering.parameters["derivative"] = 1
+        expected, dataset = self._process(
+            [self.filtering, self.range_extraction])
+        np.testing.assert_allclose(expected.data.data, dataset.data.data,
+                                   atol=1e-12)
+        self.assertEqual([(601, 5), (601, 5)],
+                         _ShapeRecordingFiltering.shapes)
@@ -0,0 +1,195 @@
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+import aspecd.exceptions
+import numpy as np
+
+import uvvispy.dataset
+import uvvispy.processing
+import uvvispy.stream
+
+
+class TestRingBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = uvvispy.stream.RingBuffer(n_points=3, capacity=4)
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_is_empty_on_instantiation(self):
+        self.assertEqual(0, self.buffer.count)
+        self.assertEqual((3, 0), self.buffer.data.shape)
+
+    def test_append_adds_spectrum_as_column(self):
+        self.buffer.append(np.arange(3.), 1.)
+        np.testing.assert_array_equal([[0.], [1.], [2.]], self.buffer.data)
+        np.testing.assert_array_equal([1.], self.buffer.times)
+
+    def test_retains_most_recent_spectra_in_order(self):
+        for number in range(10):
+            self.buffer.append(np.full(3, number), number)
+        self.assertEqual(4, self.buffer.count)
+        self.assertEqual(10, self.buffer.total)
+        np.testing.assert_array_equal([6., 7., 8., 9.], self.buffer.data[0])
+        np.testing.assert_array_equal([6., 7., 8., 9.], self.buffer.times)
+
+    def test_data_are_view_on_buffer(self):
+        for number in range(6):
+            self.buffer.append(np.full(3, number), number)
+            data = self.buffer.data
+            self.assertIs(self.buffer.data.base, data.base)
+
+
+class TestStream(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = uvvispy.stream.Stream()
+        self.spectrometer = uvvispy.stream.SimulatedSpectrometer()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.stream.close()
+        shutil.rmtree(self.directory)
+
+    def _send_through_pipe(self):
+        reading_end, writing_end = os.pipe()
+
+        def send():
+            with open(writing_end, 'wb', buffering=0) as file:
+                self.spectrometer.send(file)
+
+        thread = threading.Thread(target=send)
+        thread.start()
+        self.stream.open(file=open(reading_end, 'rb', buffering=0))
+        return thread
+
+    def test_instantiate_class(self):
+        pass
+
+    def test_open_without_source_raises(self):
+        with self.assertRaises(aspecd.exceptions.MissingSourceError):
+            self.stream.open()
+
+    def test_run_reads_all_spectra_from_pipe(self):
+        thread = self._send_through_pipe()
+        self.stream.run()
+        thread.join()
+        self.assertTrue(self.stream.finished)
+        self.assertIsInstance(self.stream.dataset,
+                              uvvispy.dataset.ExperimentalDataset)
+        self.assertEqual((501, 10), self.stream.dataset.data.data.shape)
+
+    def test_dataset_has_axes_values_and_descriptions(self):
+        self.spectrometer.interval = 0.001
+        thread = self._send_through_pipe()
+        self.stream.run()
+        thread.join()
+        axes = self.stream.dataset.data.axes
+        np.testing.assert_array_equal(self.spectrometer.wavelengths,
+                                      axes[0].values)
+        np.testing.assert_allclose(np.arange(10) * 0.001, axes[1].values)
+        self.assertEqual('wavelength', axes[0].quantity)
+        self.assertEqual('time', axes[1].quantity)
+        self.assertEqual('absorbance', axes[2].quantity)
+
+    def test_dataset_contains_spectra_sent(self):
+        thread = self._send_through_pipe()
+        self.stream.run()
+        thread.join()
+        spectrometer = uvvispy.stream.SimulatedSpectrometer()
+        expected = np.stack([spectrometer.spectrum(0.)
+                             for _ in range(10)], axis=1)
+        np.testing.assert_allclose(expected, self.stream.dataset.data.data)
+
+    def test_dataset_holds_at_most_capacity_spectra(self):
+        self.stream.capacity = 4
+        self.spectrometer.n_spectra = 25
+        self.spectrometer.interval = 0.001
+        thread = self._send_through_pipe()
+        self.stream.run()
+        thread.join()
+        self.assertEqual((501, 4), self.stream.dataset.data.data.shape)
+        np.testing.assert_allclose(np.arange(21, 25) * 0.001,
+                                   self.stream.dataset.data.axes[1].values)
+
+    def test_data_of_dataset_are_not_reallocated(self):
+        self.stream.capacity = 4
+        self.spectrometer.n_spectra = 25
+        thread = self._send_through_pipe()
+        bases = set()
+        while not self.stream.finished:
+            if self.stream.poll(timeout=0.1):
+                bases.add(id(self.stream.dataset.data.data.base))
+        thread.join()
+        self.assertEqual(1, len(bases))
+
+    def test_processing_steps_are_applied_to_each_spectrum(self):
+        self.stream.processing_steps = [
+            uvvispy.processing.BaselineCorrection()]
+        thread = self._send_through_pipe()
+        self.stream.run()
+        thread.join()
+        data = self.stream.dataset.data.data
+        self.assertLess(abs(np.mean(data[-50:])),
+                        self.spectrometer.baseline / 10)
+        self.assertEqual('BaselineCorrection',
+                         self.stream.dataset.history[0].processing.class_name
+                         .split('.')[-1])
+
+    def test_filtering_is_applied_along_wavelengths(self):
+        filtering = uvvispy.processing.Filtering()
+        filtering.parameters['type'] = 'savitzky-golay'
+        filtering.parameters['window_length'] = 11
+        filtering.parameters['order'] = 2
+        self.stream.processing_steps = [filtering]
+        thread = self._send_through_pipe()
+        self.stream.run()
+        thread.join()
+        data = self.stream.dataset.data.data
+        self.assertLess(np.std(np.diff(data[:50], axis=0)),
+                        np.std(np.diff(
+                            self.spectrometer.spectrum(0.)[:50])))
+
+    def test_processing_steps_are_not_modified(self):
+        step = uvvispy.processing.BaselineCorrection()
+        self.stream.processing_steps = [step]
+        thread = self._send_through_pipe()
+        self.stream.run()
+        thread.join()
+        self.assertIsNone(step.dataset)
+
+    def test_run_reads_from_socket(self):
+        path = os.path.join(self.directory, 'spectrometer.sock')
+        thread = self.spectrometer.serve(path)
+        self.stream.source = path
+        self.stream.run()
+        thread.join()
+        self.assertEqual((501, 10), self.stream.dataset.data.data.shape)
+
+    def test_run_reads_from_named_pipe(self):
+        path = os.path.join(self.directory, 'spectrometer')
+        os.mkfifo(path)
+
+        def send():
+            with open(path, 'wb', buffering=0) as file:
+                self.spectrometer.send(file)
+
+        thread = threading.Thread(target=send)
+        thread.start()
+        self.stream.source = path
+        self.stream.run()
+        thread.join()
+        self.assertEqual((501, 10), self.stream.dataset.data.data.shape)
+
+    def test_poll_with_other_data_raises(self):
+        first, second = socket.socketpair()
+        second.sendall(b'foobarbaz' * 10)
+        second.close()
+        self.stream.open(file=first)
+        with self.assertRaises(ValueError):
+            self.stream.poll()
@@ -13,6 +13,15 @@ Available modules
 :mod:`uvvispy.io`
     Import and export data into and from datasets
 
+:mod:`uvvispy.catalog`
+    Index of the metadata of datasets
+
+:mod:`uvvispy.ingest`
+    Continuous import of datasets written to a directory
+
+:mod:`uvvispy.stream`
+    Spectra acquired in real time
+
 :mod:`uvvispy.processing`
     Processing steps operating on datasets
 
@@ -22,4 +31,7 @@ Available modules
 :mod:`uvvispy.plotting`
     Graphical representation of data in datasets
 
+:mod:`uvvispy.benchmark`
+    Performance of importing datasets
+
 """
\ No newline at end of file
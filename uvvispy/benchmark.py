@@ -0,0 +1,521 @@
+"""
+Benchmark: performance of importing datasets.
+
+Importing datasets is at the heart of each analysis, and it is easy to
+slow it down inadvertently. Hence, this module provides a benchmark suite
+for the import, based on synthetic data written in the Shimadzu ASCII
+export format together with metadata files:
+
+  * :class:`uvvispy.benchmark.SyntheticDataGenerator`
+  * :class:`uvvispy.benchmark.Benchmark`
+
+For each case, *i.e.* combination of number of points per file and number
+of files, the time needed for importing all files, the resulting
+throughput and the peak memory are measured for the importer
+(:class:`uvvispy.io.importer.ShimadzuASCIIImporter`), the importer factory
+(:meth:`uvvispy.io.factory.DatasetImporterFactory.get_importer`), and the
+dataset factory (:meth:`uvvispy.dataset.DatasetFactory.get_dataset`,
+*i.e.* end to end).
+
+Results can be stored as JSON file and compared to a baseline stored
+before, flagging slowdowns. A typical use case would be:
+
+.. code-block:: bash
+
+    python -m uvvispy.benchmark --save baseline.json
+    # ... change code ...
+    python -m uvvispy.benchmark --baseline baseline.json
+
+The second call exits with a non-zero status if any of the cases is
+slower than in the baseline (by more than the tolerance, default: 20%).
+Use ``--help`` for all options.
+
+As the timing depends on the machine, compare only results obtained on
+the same machine.
+
+To assess importing from storage with high latency, such as network
+shares, without having one at hand, use a reader adding an artificial
+delay to reading each file:
+
+  * :class:`uvvispy.benchmark.DelayedFileReader`
+
+Handed over to :meth:`uvvispy.dataset.DatasetFactory.get_dataset_async`,
+it shows the benefit of importing datasets concurrently.
+
+
+Module documentation
+====================
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import aspecd.exceptions
+import numpy as np
+
+import uvvispy.dataset
+import uvvispy.io
+
+
+_METADATA = """---
+format:
+  type: UV/vis metadata
+  version: 0.1.4
+
+measurement:
+  start:
+    date: 2021-07-15
+    time: 08:31:00
+  end:
+    date: 2021-07-15
+    time: 08:32:00
+  operator: John Doe
+  purpose: benchmark
+  labbook: loi:42.1001/lj/tb/uvvis/2021-07-15_42
+
+sample:
+  name: synthetic-{number}
+  id: {number}
+  solvent: toluene
+  concentration: 0.3 mg/ml
+  preparation: generated
+
+cell:
+  manufacturer: Hellma
+  type: 100-QS
+  pathlength: 1 mm
+
+temperature:
+  controlled: True
+  temperature: 280 K
+  controller: Oxford MercuryITC
+  cryostat: Oxford Optistat DN2
+  cryogen: LN2
+
+experiment:
+  type: Spectrum
+  measurement mode: Absorption
+
+spectrometer:
+  manufacturer: Shimadzu
+  model: UV-1601PC
+  software: UV Probe, Version 2.43
+"""
+
+
+class SyntheticDataGenerator:
+    """
+    Generator for files in the Shimadzu ASCII export format.
+
+    Each file contains a spectrum consisting of a few Gaussian bands plus
+    some noise, and is accompanied by a metadata file. The files are
+    written using the :class:`uvvispy.io.exporter.ShimadzuASCIIExporter`, hence
+    have the same layout as files written by the UVProbe software. To
+    generate large numbers of files fast, all files share the same data,
+    but differ in their header and metadata.
+
+    The wavelength axis starts at 200 nm, with a sampling interval chosen
+    to cover about 900 nm, but not less than 0.01 nm (the resolution of
+    the file format).
+
+    Attributes
+    ----------
+    directory : :class:`str`
+        Directory the files are written to
+
+        Created if it does not exist.
+
+    n_points : :class:`int`
+        Number of points per file
+
+        Default: 1000
+
+    n_files : :class:`int`
+        Number of files
+
+        Default: 1
+
+    metadata : :class:`bool`
+        Whether to write metadata files
+
+        Default: True
+
+    Raises
+    ------
+    aspecd.exceptions.MissingTargetError
+        Raised if no directory is provided
+
+    """
+
+    def __init__(self, directory=''):
+        self.directory = directory
+        self.n_points = 1000
+        self.n_files = 1
+        self.metadata = True
+
+    def generate(self):
+        """Write the files.
+
+        Returns
+        -------
+        filenames : :class:`list`
+            Names of the data files written
+
+        """
+        if not self.directory:
+            raise aspecd.exceptions.MissingTargetError(
+                'A directory is required for generating data')
+        os.makedirs(self.directory, exist_ok=True)
+        filenames = [
+            os.path.join(self.directory, 'synthetic-%05i.txt' % number)
+            for number in range(self.n_files)
+        ]
+        uvvispy.io.ShimadzuASCIIExporter(target=filenames[0]).export_from(
+            self._create_dataset())
+        with open(filenames[0], 'rb') as file:
+            file.readline()
+            body = file.read()
+        for number, filename in enumerate(filenames):
+            title = os.path.splitext(os.path.basename(filename))[0]
+            with open(filename, 'wb') as file:
+                file.write(b'"%s - RawData"\r\n' % title.encode() + body)
+            if self.metadata:
+                with open(os.path.splitext(filename)[0] + '.yaml', 'w',
+                          encoding='utf-8') as file:
+                    file.write(_METADATA.format(number=number))
+        return filenames
+
+    def _create_dataset(self):
+        step = max(round(900. / max(self.n_points - 1, 1), 2), 0.01)
+        wavelengths = 200. + step * np.arange(self.n_points)
+        absorbance = np.zeros(self.n_points)
+        for position, width, amplitude in [(280, 15, 1.2), (450, 40, 0.6),
+                                           (610, 25, 0.3)]:
+            absorbance += amplitude * np.exp(
+                -(wavelengths - position) ** 2 / (2 * width ** 2))
+        absorbance += np.random.default_rng(0).normal(
+            scale=0.002, size=self.n_points)
+        dataset = uvvispy.dataset.ExperimentalDataset()
+        dataset.data.data = absorbance
+        dataset.data.axes[0].values = wavelengths
+        return dataset
+
+
+class DelayedFileReader(uvvispy.io.FileReader):
+    """
+    Reader for files delaying each read, as stand-in for slow storage.
+
+    Each read blocks the thread reading the file for the given time
+    before actually reading the (local) file, mimicking the latency of,
+    *e.g.*, network shares. For everything else, see the documentation
+    of the :class:`uvvispy.io.reader.FileReader` base class.
+
+    Attributes
+    ----------
+    delay : :class:`float`
+        Time (in seconds) each read is delayed
+
+        Default: 0.05
+
+    """
+
+    def __init__(self, delay=0.05):
+        super().__init__()
+        self.delay = delay
+
+    def _read(self, filename):
+        time.sleep(self.delay)
+        return super()._read(filename)
+
+
+class Benchmark:
+    """
+    Benchmark of importing datasets.
+
+    For each case, synthetic data are generated (see
+    :class:`uvvispy.benchmark.SyntheticDataGenerator`) in a temporary
+    directory, and all files are imported using each of the targets:
+
+    importer
+        :class:`uvvispy.io.importer.ShimadzuASCIIImporter`
+
+    importer_factory
+        :meth:`uvvispy.io.factory.DatasetImporterFactory.get_importer`, *i.e.*
+        only getting the importer
+
+    dataset_factory
+        :meth:`uvvispy.dataset.DatasetFactory.get_dataset`, *i.e.* the
+        complete import including choosing the importer
+
+    The time is the best of several repetitions, with the cache of
+    metadata files cleared before each repetition. The peak memory is
+    measured in a separate run, as tracing memory allocations slows down
+    the import considerably.
+
+    Attributes
+    ----------
+    cases : :class:`list`
+        Pairs of number of points per file and number of files
+
+        Default: 100 to 1e6 points and 1 to 10,000 files, with at most
+        1e7 points in total per case
+
+    targets : :class:`list`
+        Names of the targets to benchmark (see above)
+
+        Default: all targets
+
+    repeat : :class:`int`
+        Number of repetitions of each measurement
+
+        Default: 3
+
+    tolerance : :class:`float`
+        Relative increase in time considered a slowdown
+
+        Default: 0.2
+
+    results : :class:`list`
+        Results of the last call of :meth:`run`
+
+        Each result is a dict with the keys "target", "n_points",
+        "n_files", "time" (in seconds), "files_per_second",
+        "points_per_second", "megabytes_per_second", and "peak_memory"
+        (in bytes).
+
+    """
+
+    def __init__(self):
+        self.cases = [
+            (100, 1), (100, 100), (100, 10000),
+            (10000, 1), (10000, 100), (10000, 1000),
+            (1000000, 1), (1000000, 10),
+        ]
+        self.targets = ['importer', 'importer_factory', 'dataset_factory']
+        self.repeat = 3
+        self.tolerance = 0.2
+        self.results = []
+
+    def run(self):
+        """Run the benchmark for all cases and targets.
+
+        Returns
+        -------
+        results : :class:`list`
+            Results, see :attr:`results` for details
+
+        """
+        self.results = []
+        for n_points, n_files in self.cases:
+            directory = tempfile.mkdtemp()
+            try:
+                generator = SyntheticDataGenerator(directory=directory)
+                generator.n_points = n_points
+                generator.n_files = n_files
+                filenames = generator.generate()
+                size = sum(os.path.getsize(filename)
+                           for filename in filenames)
+                for target in self.targets:
+                    result = self._measure(target, filenames)
+                    result.update({
+                        'target': target,
+                        'n_points': n_points,
+                        'n_files': n_files,
+                        'files_per_second': n_files / result['time'],
+                        'points_per_second':
+                            n_points * n_files / result['time'],
+                        'megabytes_per_second':
+                            size / 1024**2 / result['time'],
+                    })
+                    self.results.append(result)
+            finally:
+                shutil.rmtree(directory)
+        return self.results
+
+    def save(self, filename=''):
+        """Save the results, together with information on the environment.
+
+        Parameters
+        ----------
+        filename : :class:`str`
+            Name of the JSON file to save the results to
+
+        """
+        contents = {
+            'environment': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'platform': platform.platform(),
+                'machine': platform.machine(),
+            },
+            'results': self.results,
+        }
+        with open(filename, 'w', encoding='utf-8') as file:
+            json.dump(contents, file, indent=2)
+
+    def compare(self, filename=''):
+        """Compare the results to a baseline and return the slowdowns.
+
+        Only cases and targets contained in both, the results and the
+        baseline, are compared.
+
+        Parameters
+        ----------
+        filename : :class:`str`
+            Name of the JSON file with the baseline results
+
+            Usually written by :meth:`save`.
+
+        Returns
+        -------
+        slowdowns : :class:`list`
+            Results slower than in the baseline by more than the tolerance
+
+            Each result has two additional keys, "baseline_time" and
+            "ratio" (time relative to the baseline).
+
+        """
+        with open(filename, encoding='utf-8') as file:
+            baseline = {self._key(result): result
+                        for result in json.load(file)['results']}
+        slowdowns = []
+        for result in self.results:
+            if self._key(result) not in baseline:
+                continue
+            baseline_time = baseline[self._key(result)]['time']
+            ratio = result['time'] / baseline_time
+            if ratio > 1 + self.tolerance:
+                slowdown = dict(result)
+                slowdown.update(baseline_time=baseline_time, ratio=ratio)
+                slowdowns.append(slowdown)
+        return slowdowns
+
+    def report(self):
+        """Return the results as table.
+
+        Returns
+        -------
+        report : :class:`str`
+            One line per result
+
+        """
+        lines = ['%-16s %8s %6s %10s %10s %12s %8s %10s' % (
+            'target', 'points', 'files', 'time/s', 'files/s', 'points/s',
+            'MB/s', 'peak/MB')]
+        for result in self.results:
+            lines.append('%-16s %8i %6i %10.4f %10.1f %12.4g %8.2f %10.2f' % (
+                result['target'], result['n_points'], result['n_files'],
+                result['time'], result['files_per_second'],
+                result['points_per_second'], result['megabytes_per_second'],
+                result['peak_memory'] / 1024**2))
+        return '\n'.join(lines)
+
+    def _measure(self, target, filenames):
+        function = getattr(self, '_run_' + target)
+        times = []
+        for _ in range(self.repeat):
+            uvvispy.io.clear_caches()
+            start = time.perf_counter()
+            function(filenames)
+            times.append(time.perf_counter() - start)
+        uvvispy.io.clear_caches()
+        tracemalloc.start()
+        try:
+            function(filenames)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {'time': min(times), 'peak_memory': peak_memory}
+
+    @staticmethod
+    def _run_importer(filenames):
+        for filename in filenames:
+            dataset = uvvispy.dataset.ExperimentalDataset()
+            dataset.import_from(
+                uvvispy.io.ShimadzuASCIIImporter(source=filename))
+
+    @staticmethod
+    def _run_importer_factory(filenames):
+        factory = uvvispy.io.DatasetImporterFactory()
+        for filename in filenames:
+            factory.get_importer(source=filename)
+
+    @staticmethod
+    def _run_dataset_factory(filenames):
+        factory = uvvispy.dataset.DatasetFactory()
+        for filename in filenames:
+            factory.get_dataset(source=filename)
+
+    @staticmethod
+    def _key(result):
+        return result['target'], result['n_points'], result['n_files']
+
+
+def main(arguments=None):
+    """Run the benchmark from the command line.
+
+    Parameters
+    ----------
+    arguments : :class:`list`
+        Command-line arguments, defaults to those of the current process
+
+    Returns
+    -------
+    status : :class:`int`
+        Zero, or one in case of slowdowns compared to the baseline
+
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m uvvispy.benchmark',
+        description='Benchmark importing datasets with UVVisPy.')
+    parser.add_argument('--case', nargs=2, type=int, action='append',
+                        metavar=('POINTS', 'FILES'),
+                        help='number of points per file and number of files '
+                             '(can be given several times)')
+    parser.add_argument('--target', action='append',
+                        choices=Benchmark().targets,
+                        help='target to benchmark (can be given several '
+                             'times)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of repetitions (default: 3)')
+    parser.add_argument('--save', metavar='FILENAME',
+                        help='save results to JSON file')
+    parser.add_argument('--baseline', metavar='FILENAME',
+                        help='compare results to baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='relative slowdown tolerated (default: 0.2)')
+    arguments = parser.parse_args(arguments)
+    benchmark = Benchmark()
+    if arguments.case:
+        benchmark.cases = [tuple(case) for case in arguments.case]
+    if arguments.target:
+        benchmark.targets = arguments.target
+    benchmark.repeat = arguments.repeat
+    benchmark.tolerance = arguments.tolerance
+    benchmark.run()
+    print(benchmark.report())
+    if arguments.save:
+        benchmark.save(arguments.save)
+    if arguments.baseline:
+        slowdowns = benchmark.compare(arguments.baseline)
+        for slowdown in slowdowns:
+            print('SLOWDOWN: %s with %i points and %i files: %.4f s '
+                  '(baseline: %.4f s, %+.0f%%)' % (
+                      slowdown['target'], slowdown['n_points'],
+                      slowdown['n_files'], slowdown['time'],
+                      slowdown['baseline_time'],
+                      (slowdown['ratio'] - 1) * 100))
+        if slowdowns:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,424 @@
+"""
+Catalog: an index of the metadata of datasets.
+
+Finding all datasets matching certain criteria, *e.g.* all spectra of
+samples in acetonitrile recorded at 280 K, would require importing all
+datasets and inspecting their metadata. This is where a catalog comes in:
+it stores the metadata of all datasets in a directory tree in a local
+(SQLite) database that can be queried fast.
+
+Creating a catalog only reads the metadata of each dataset (usually, the
+accompanying metadata file), not the numerical data. Furthermore,
+scanning a directory again only reads those datasets that have been added
+or changed since, hence keeping the catalog up to date is cheap.
+
+Metadata are stored with their full (dotted) name, such as
+``sample.solvent`` or ``temperature_control.temperature``, as used in the
+:class:`uvvispy.metadata.ExperimentalDatasetMetadata` class.
+
+
+Catalog and queries
+===================
+
+A typical use case would look like this:
+
+.. code-block::
+
+    catalog = uvvispy.catalog.Catalog(filename='catalog.sqlite')
+    catalog.scan('data')
+    sources = catalog.query({'sample.solvent': 'acetonitrile',
+                             'temperature_control.temperature': 280,
+                             'cell.type': '100-QS'})
+
+Numbers are compared with the numerical value of the metadata, strings
+with their string representation.
+
+
+Selecting datasets in recipes
+=============================
+
+Instead of listing all datasets in a recipe, datasets can be selected from
+a catalog. Each entry of the datasets list with a ``select`` key is
+replaced by the datasets found in the catalog, with all other keys (such
+as ``importer``) applied to each of the datasets:
+
+.. code-block:: yaml
+
+    datasets:
+      - catalog: catalog.sqlite
+        select:
+          sample.solvent: acetonitrile
+          temperature_control.temperature: 280
+
+As ASpecD does not know about catalogs, serve such a recipe using the
+:class:`uvvispy.catalog.ChefDeService` class of this module:
+
+.. code-block::
+
+    chef = uvvispy.catalog.ChefDeService()
+    chef.serve(recipe_filename='recipe.yaml')
+
+
+Module documentation
+====================
+"""
+
+import contextlib
+import copy
+import os
+import sqlite3
+
+import aspecd.exceptions
+import aspecd.tasks
+
+import uvvispy.dataset
+import uvvispy.io
+
+# Maximum number of parameters of an SQL statement for SQLite < 3.32
+_MAX_PARAMETERS = 999
+
+
+class Catalog:
+    """
+    Index of the metadata of datasets stored in an SQLite database.
+
+    Attributes
+    ----------
+    filename : :class:`str`
+        Name of the database file
+
+        Created if it does not exist.
+
+    importer_factory : :class:`uvvispy.io.factory.DatasetImporterFactory`
+        Factory used to get the importers for reading the metadata
+
+        Files with extensions not handled by the factory are ignored.
+
+    errors : :class:`dict`
+        Errors occurring during the last call to :meth:`scan`
+
+        The keys are the sources, the values the exceptions raised while
+        reading the respective metadata.
+
+    Raises
+    ------
+    aspecd.exceptions.MissingSourceError
+        Raised if no filename is provided
+
+    """
+
+    def __init__(self, filename=''):
+        if not filename:
+            raise aspecd.exceptions.MissingSourceError(
+                'A filename is required for a catalog')
+        self.filename = filename
+        self.importer_factory = uvvispy.io.DatasetImporterFactory()
+        self.errors = dict()
+        with self._connect() as connection:
+            connection.executescript('''
+                CREATE TABLE IF NOT EXISTS files (
+                    source TEXT PRIMARY KEY,
+                    modification_time INTEGER,
+                    size INTEGER,
+                    metadata_modification_time INTEGER
+                );
+                CREATE TABLE IF NOT EXISTS metadata (
+                    source TEXT,
+                    key TEXT,
+                    value TEXT,
+                    number REAL
+                );
+                CREATE INDEX IF NOT EXISTS metadata_source
+                    ON metadata (source);
+                CREATE INDEX IF NOT EXISTS metadata_value
+                    ON metadata (key, value);
+                CREATE INDEX IF NOT EXISTS metadata_number
+                    ON metadata (key, number);
+            ''')
+
+    def scan(self, directory=''):
+        """Add the datasets in a directory tree to the catalog.
+
+        Only datasets new or changed since the last scan, judged by the
+        modification time and size of the data file and the modification
+        time of the metadata file, are read. Datasets no longer existing
+        are removed from the catalog.
+
+        Errors occurring while reading the metadata of an individual
+        dataset do not abort the scan. Instead, they are collected in
+        :attr:`errors`, and the respective dataset is omitted.
+
+        Parameters
+        ----------
+        directory : :class:`str`
+            Directory to scan, including all subdirectories
+
+        Returns
+        -------
+        sources : :class:`list`
+            Sources of the datasets added or updated
+
+        """
+        directory = os.path.join(os.path.abspath(directory), '')
+        self.errors = dict()
+        files = self._get_files(directory)
+        with self._connect() as connection:
+            known_files = {
+                row[0]: tuple(row[1:]) for row in connection.execute(
+                    'SELECT * FROM files WHERE substr(source, 1, ?) = ?',
+                    (len(directory), directory))
+            }
+            removed = [source for source in known_files
+                       if source not in files]
+            self._remove(connection, removed)
+            return self._update(connection, files, known_files)
+
+    def add(self, sources=None):
+        """Add datasets to the catalog.
+
+        Like :meth:`scan`, but for individual datasets, *e.g.* files just
+        written. Datasets not changed since they were added are not read
+        again.
+
+        Parameters
+        ----------
+        sources : :class:`list`
+            Sources of the datasets to add
+
+        Returns
+        -------
+        sources : :class:`list`
+            Sources of the datasets added or updated
+
+        """
+        self.errors = dict()
+        files = {os.path.abspath(source): _get_status(source)
+                 for source in sources or []}
+        sources = list(files)
+        known_files = dict()
+        with self._connect() as connection:
+            for start in range(0, len(sources), _MAX_PARAMETERS):
+                chunk = sources[start:start + _MAX_PARAMETERS]
+                known_files.update(
+                    (row[0], tuple(row[1:])) for row in connection.execute(
+                        'SELECT * FROM files WHERE source IN (%s)'
+                        % ', '.join('?' * len(chunk)), chunk))
+            return self._update(connection, files, known_files)
+
+    def query(self, criteria=None):
+        """Return the sources of all datasets matching the given criteria.
+
+        Parameters
+        ----------
+        criteria : :class:`dict`
+            Metadata values the datasets need to match
+
+            Keys are the full (dotted) names of the metadata. Numbers
+            (including physical quantities) are compared by their value,
+            strings by the string representation of the metadata.
+
+            If no criteria are given, all datasets are returned.
+
+        Returns
+        -------
+        sources : :class:`list`
+            Sorted sources of the matching datasets
+
+        """
+        statements = ['SELECT source FROM files']
+        parameters = []
+        for key, value in (criteria or {}).items():
+            if isinstance(value, (int, float)) \
+                    and not isinstance(value, bool):
+                statements.append('SELECT source FROM metadata '
+                                  'WHERE key = ? AND number = ?')
+            else:
+                statements.append('SELECT source FROM metadata '
+                                  'WHERE key = ? AND value = ?')
+                value = str(value)
+            parameters.extend([key, value])
+        with self._connect() as connection:
+            rows = connection.execute(' INTERSECT '.join(statements)
+                                      + ' ORDER BY source', parameters)
+            return [row[0] for row in rows]
+
+    def metadata(self, source=''):
+        """Return the metadata of a dataset stored in the catalog.
+
+        Parameters
+        ----------
+        source : :class:`str`
+            Source of the dataset
+
+        Returns
+        -------
+        metadata : :class:`dict`
+            Metadata with their full (dotted) names as keys and their
+            string representations as values
+
+        """
+        with self._connect() as connection:
+            rows = connection.execute(
+                'SELECT key, value FROM metadata WHERE source = ?',
+                (os.path.abspath(source),))
+            return dict(rows)
+
+    def _connect(self):
+        return _Connection(self.filename)
+
+    @staticmethod
+    def _remove(connection, sources):
+        connection.executemany('DELETE FROM files WHERE source = ?',
+                               [(source,) for source in sources])
+        connection.executemany('DELETE FROM metadata WHERE source = ?',
+                               [(source,) for source in sources])
+
+    def _update(self, connection, files, known_files):
+        changed = [source for source, status in files.items()
+                   if known_files.get(source) != status]
+        self._remove(connection, changed)
+        updated = []
+        for source in changed:
+            try:
+                metadata = self._read_metadata(source)
+            except Exception as error:  # pylint: disable=broad-except
+                self.errors[source] = error
+                continue
+            connection.execute('INSERT INTO files VALUES (?, ?, ?, ?)',
+                               (source,) + files[source])
+            connection.executemany('INSERT INTO metadata VALUES (?, ?, ?, ?)',
+                                   [(source,) + row for row in metadata])
+            updated.append(source)
+        return updated
+
+    def _get_files(self, directory):
+        files = dict()
+        for path, _, filenames in os.walk(directory):
+            for filename in filenames:
+                if os.path.splitext(filename)[1].lower() \
+                        not in self.importer_factory.extensions:
+                    continue
+                source = os.path.join(path, filename)
+                files[source] = _get_status(source)
+        return files
+
+    def _read_metadata(self, source):
+        importer = self.importer_factory.get_importer(source=source)
+        if not isinstance(importer, uvvispy.io.DatasetImporter):
+            raise ValueError('No UVVisPy importer found for %s' % source)
+        dataset = uvvispy.dataset.ExperimentalDataset()
+        importer.import_metadata_into(dataset)
+        return list(_flatten(dataset.metadata.to_dict()))
+
+
+class _Connection:
+    """Database connection committing and closing on leaving the context."""
+
+    def __init__(self, filename=''):
+        self._connection = sqlite3.connect(filename)
+
+    def __enter__(self):
+        return self._connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with contextlib.closing(self._connection):
+            if exc_type:
+                self._connection.rollback()
+            else:
+                self._connection.commit()
+
+
+def _get_status(source):
+    """Return modification time and size of a file and its metadata file."""
+    status = os.stat(source)
+    try:
+        metadata_modification_time = \
+            os.stat(os.path.splitext(source)[0] + '.yaml').st_mtime_ns
+    except FileNotFoundError:
+        metadata_modification_time = 0
+    return status.st_mtime_ns, status.st_size, metadata_modification_time
+
+
+def _flatten(dict_, prefix=''):
+    """Yield key, string and numerical value of all non-empty metadata."""
+    for key, value in dict_.items():
+        name = prefix + key
+        if isinstance(value, dict) and set(value) != \
+                {'value', 'unit', 'dimension', 'name'}:
+            yield from _flatten(value, prefix=name + '.')
+        elif isinstance(value, dict):
+            if value['value'] or value['unit']:
+                yield (name, ' '.join([str(value['value']), value['unit']]),
+                       value['value'])
+        elif value not in ('', None, [], {}):
+            number = value if isinstance(value, (int, float)) else None
+            yield name, str(value), number
+
+
+class DatasetSelector:
+    """
+    Selector for datasets in a recipe, resolved using a catalog.
+
+    Entries in the list of datasets of a recipe containing a ``select``
+    key are replaced by one entry for each dataset found in the catalog.
+    The catalog is given by the ``catalog`` key, all other keys are
+    retained for each of the entries. For an example, see the module
+    documentation.
+
+    Attributes
+    ----------
+    catalog : :class:`str`
+        Default filename of the catalog
+
+        Used for entries without ``catalog`` key.
+
+    """
+
+    def __init__(self):
+        self.catalog = ''
+
+    def resolve(self, datasets=None):
+        """Replace the selectors in a list of datasets of a recipe.
+
+        Parameters
+        ----------
+        datasets : :class:`list`
+            Datasets of a recipe, as read from the recipe file
+
+        Returns
+        -------
+        datasets : :class:`list`
+            Datasets of the recipe, with selectors replaced
+
+        """
+        resolved_datasets = []
+        for dataset in datasets or []:
+            if not isinstance(dataset, dict) or 'select' not in dataset:
+                resolved_datasets.append(dataset)
+                continue
+            properties = copy.copy(dataset)
+            criteria = properties.pop('select')
+            catalog = Catalog(filename=properties.pop('catalog', self.catalog))
+            for source in catalog.query(criteria):
+                entry = copy.deepcopy(properties)
+                entry['source'] = source
+                resolved_datasets.append(entry)
+        return resolved_datasets
+
+
+class ChefDeService(aspecd.tasks.ChefDeService):
+    """
+    Wrapper for cooking recipes containing dataset selectors.
+
+    Before cooking the recipe, the dataset selectors are resolved using a
+    :class:`uvvispy.catalog.DatasetSelector`. For everything else, see the
+    documentation of the :class:`aspecd.tasks.ChefDeService` base class.
+
+    """
+
+    def _load_recipe_yaml(self):
+        super()._load_recipe_yaml()
+        if 'datasets' in self._recipe_dict:
+            selector = DatasetSelector()
+            self._recipe_dict['datasets'] = \
+                selector.resolve(self._recipe_dict['datasets'])
@@ -36,13 +36,72 @@ Patterns" (Gamma et al., 1995):
 
   * :class:`uvvispy.dataset.DatasetFactory`
 
+Besides returning a single dataset for a given source, the factory can
+import all datasets contained in a directory or matching a glob pattern at
+once, distributing the import over several processes. For details, see the
+:meth:`uvvispy.dataset.DatasetFactory.get_datasets` method.
+
+For data residing on storage with high latency, such as network shares,
+datasets can be imported asynchronously, overlapping the time spent
+waiting for the storage. For details, see the
+:meth:`uvvispy.dataset.DatasetFactory.get_dataset_async` method.
+
+
+Lazy data
+=========
+
+Recipes often list many datasets, but each task only uses some of them.
+Importers supporting a lazy import mode (such as the
+:class:`uvvispy.io.importer.ShimadzuASCIIImporter` with its ``lazy``
+parameter) read only the metadata and some cheap information from the
+header up front.
+The numerical data are stored as :class:`uvvispy.dataset.LazyData` and read
+on first access. To limit the memory used, an eviction policy drops the
+data of datasets not used recently:
+
+  * :class:`uvvispy.dataset.LazyData`
+  * :class:`uvvispy.dataset.EvictionPolicy`
+
+Similarly, processing steps applied in lazy mode (see
+:class:`uvvispy.processing.Pipeline`) are only recorded, and applied when
+the data are accessed the next time:
+
+  * :class:`uvvispy.dataset.DeferredData`
+
+
+Compact axes
+============
+
+Axis values of spectra are usually uniformly spaced, *e.g.* wavelengths
+recorded with a constant sampling interval. Such values can be stored as
+start, step and length only, calculating the actual values on access:
+
+  * :class:`uvvispy.dataset.UniformAxis`
+
+Importers create these axes if their ``compact_axes`` parameter is set.
+Processing steps setting uniformly spaced values, such as
+:class:`uvvispy.processing.RangeExtraction` and
+:class:`uvvispy.processing.Interpolation`, retain the compact storage.
+
 
 Module documentation
 ====================
 """
 
+import asyncio
+import collections
+import concurrent.futures
+import glob
+import hashlib
+import os
+import threading
+import weakref
+
 import aspecd.dataset
+import aspecd.exceptions
 import aspecd.metadata
+import aspecd.utils
+import numpy as np
 
 import uvvispy.io
 import uvvispy.metadata
@@ -89,11 +148,167 @@ class DatasetFactory(aspecd.dataset.DatasetFactory):
     importer_factory : :class:`uvvispy.io.factory.DatasetImporterFactory`
         ImporterFactory instance used for importing datasets
 
+    errors : :class:`dict`
+        Errors occurring during the last call to :meth:`get_datasets`
+
+        The keys are the sources, the values the exceptions raised while
+        importing the respective source.
+
+        .. versionadded:: 0.2
+
     """
 
     def __init__(self):
         super().__init__()
         self.importer_factory = uvvispy.io.DatasetImporterFactory()
+        self.errors = dict()
+
+    def get_datasets(self, source='', processes=None):
+        """Return datasets for all files in a directory or matching a pattern.
+
+        Importing several thousand datasets one after the other takes its
+        time. Hence, the import (including reading the metadata files) is
+        distributed over a pool of processes. Nevertheless, the datasets
+        are returned in a deterministic order, namely sorted by their
+        source.
+
+        Errors occurring while importing an individual dataset do not
+        abort the import of the other datasets. Instead, they are
+        collected in :attr:`errors`, and the respective dataset is omitted
+        from the list returned.
+
+        Parameters
+        ----------
+        source : :class:`str`
+            Directory or glob pattern (such as ``data/*-280K.txt``)
+
+            In case of a directory, all files with an extension handled by
+            the importer factory (see
+            :attr:`uvvispy.io.factory.DatasetImporterFactory.extensions`) are
+            imported.
+
+        processes : :class:`int`
+            Number of processes to use for importing
+
+            Defaults to the number of processors of the machine. If set to
+            one, the datasets are imported within the current process.
+
+        Returns
+        -------
+        datasets : :class:`list`
+            Datasets, sorted by their source
+
+        Raises
+        ------
+        aspecd.exceptions.MissingSourceError
+            Raised if no source is provided
+
+        .. versionadded:: 0.2
+
+        """
+        if not source:
+            raise aspecd.exceptions.MissingSourceError(
+                'A source is required to return datasets')
+        sources = self._get_sources(source)
+        processes = processes or os.cpu_count() or 1
+        if processes == 1 or len(sources) < 2:
+            results = [_import_dataset(self, source_) for source_ in sources]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=processes) as executor:
+                results = list(executor.map(
+                    _import_dataset, [self] * len(sources), sources,
+                    chunksize=max(1, len(sources) // (4 * processes))))
+        datasets = []
+        errors = dict()
+        for source_, (dataset_, error) in zip(sources, results):
+            if error:
+                errors[source_] = error
+            else:
+                datasets.append(dataset_)
+        self.errors = errors
+        return datasets
+
+    async def get_dataset_async(self, source='', importer='', parameters=None,
+                                reader=None, executor=None):
+        """Return dataset object for dataset specified by its source.
+
+        Asynchronous counterpart of :meth:`get_dataset`: The data and
+        metadata files are read at the same time using the reader, the
+        importer is chosen based on the contents read, and the contents
+        are parsed in the executor. Hence, importing several datasets
+        concurrently, *e.g.* using :func:`asyncio.gather`, overlaps
+        waiting for the storage, with the number of files read at the same
+        time limited by the reader (see :class:`uvvispy.io.reader.FileReader`).
+
+        Importers not derived from :class:`uvvispy.io.importer.DatasetImporter`
+        read their files themselves within the executor.
+
+        Parameters
+        ----------
+        source : :class:`str`
+            string describing the source of the dataset
+
+        importer : :class:`str`
+            Name of the importer to use for importing the dataset
+
+        parameters : :class:`dict`
+            Additional parameters for controlling the import
+
+        reader : :class:`uvvispy.io.reader.FileReader`
+            Reader used for reading the files
+
+            Default: a new :class:`uvvispy.io.reader.FileReader`
+
+        executor : :class:`concurrent.futures.Executor`
+            Executor used for parsing the contents
+
+            Default: None (the default executor of the event loop)
+
+        Returns
+        -------
+        dataset : :class:`uvvispy.dataset.ExperimentalDataset`
+            Dataset object for uvvispy package
+
+        Raises
+        ------
+        aspecd.exceptions.MissingSourceError
+            Raised if no source is provided
+
+        .. versionadded:: 0.2
+
+        """
+        if not source:
+            raise aspecd.exceptions.MissingSourceError(
+                'A source is required to return a dataset')
+        reader = reader or uvvispy.io.FileReader()
+        source = os.path.abspath(source)
+        filenames = [source, os.path.splitext(source)[0] + '.yaml']
+        reader = _PrefetchedFileReader(
+            reader=reader,
+            contents=dict(zip(filenames, await reader.read_all(filenames))))
+        importer_ = self.importer_factory.get_importer(
+            source=source, importer=importer, parameters=parameters,
+            header=reader.contents[source])
+        dataset_ = self._create_dataset(source=source)
+        if isinstance(importer_, uvvispy.io.DatasetImporter):
+            await importer_.import_into_async(dataset_, reader=reader,
+                                              executor=executor)
+        else:
+            await asyncio.get_event_loop().run_in_executor(
+                executor, dataset_.import_from, importer_)
+        return dataset_
+
+    def _get_sources(self, source):
+        if os.path.isdir(source):
+            sources = [os.path.join(source, filename)
+                       for filename in os.listdir(source)
+                       if os.path.splitext(filename)[1]
+                       in self.importer_factory.extensions]
+        else:
+            sources = glob.glob(source)
+        return sorted(filename for filename in sources
+                      if os.path.isfile(filename))
 
     @staticmethod
     def _create_dataset(source=''):
@@ -113,3 +328,527 @@ class DatasetFactory(aspecd.dataset.DatasetFactory):
 
         """
         return uvvispy.dataset.ExperimentalDataset()
+
+
+def _import_dataset(factory, source):
+    """Import dataset from source, returning the error rather than raising.
+
+    Needs to be a module-level function to be usable with a process pool.
+    """
+    try:
+        return factory.get_dataset(source=source), None
+    except Exception as exception:  # pylint: disable=broad-except
+        return None, exception
+
+
+class _PrefetchedFileReader(uvvispy.io.FileReader):
+    """Reader returning the contents of files read beforehand."""
+
+    def __init__(self, reader=None, contents=None):
+        super().__init__()
+        self.contents = contents or dict()
+        self._reader = reader
+
+    async def read(self, filename=''):
+        if filename in self.contents:
+            return self.contents[filename]
+        return await self._reader.read(filename)
+
+
+class LazyData(aspecd.dataset.Data):
+    """
+    Numerical data read from their source only on first access.
+
+    Besides the loading on first access of either :attr:`data` or
+    :attr:`axes`, the class behaves like its base class,
+    :class:`aspecd.dataset.Data`. Data are loaded by an importer
+    (given by its class name) implementing the
+    :meth:`uvvispy.io.importer.DatasetImporter.import_data_into` method.
+
+    Data loaded once can be dropped again (see :meth:`unload`), *e.g.*
+    by an :class:`uvvispy.dataset.EvictionPolicy`, and are read again on
+    next access. Setting either :attr:`data` or :attr:`axes` detaches the
+    data from their source, hence they are never dropped afterwards.
+    The same holds for data changed otherwise after loading, be it in
+    place or by changing the values or description of an axis: Such data
+    are detached from their source instead of being dropped, hence no
+    change is ever lost.
+
+    Attributes
+    ----------
+    importer : :class:`str`
+        Full class name of the importer used to load the data
+
+    source : :class:`str`
+        Source the data are loaded from
+
+    parameters : :class:`dict`
+        Parameters of the importer used to load the data
+
+    header : :class:`dict`
+        Information on the data available without loading them
+
+        Provided by the importer, *e.g.* ``range`` of the first axis and
+        ``shape`` of the data.
+
+    loaded : :class:`bool`
+        Whether the data are currently loaded
+
+        Read-only
+
+    eviction_policy : :class:`uvvispy.dataset.EvictionPolicy`
+        Policy deciding when to drop the loaded data
+
+        Can only be set when creating the object.
+
+        Read-only
+
+    """
+
+    _eviction_policies = weakref.WeakKeyDictionary()
+
+    def __init__(self, importer='', source='', parameters=None,
+                 eviction_policy=None):
+        self._loaded = True
+        super().__init__()
+        self.importer = importer
+        self.source = source
+        self.parameters = parameters or dict()
+        self.header = dict()
+        self._loaded = not source
+        self._fingerprint = None
+        if eviction_policy is not None and source:
+            self._eviction_policies[self] = eviction_policy
+        self._exclude_from_to_dict.extend(
+            ['importer', 'source', 'parameters', 'header'])
+
+    @property
+    def data(self):
+        """Get or set (numeric) data, loading them if necessary.
+
+        For details, see the documentation of the base class.
+
+        """
+        self._load()
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._load()
+        self._detach()
+        aspecd.dataset.Data.data.fset(self, data)
+
+    @property
+    def axes(self):
+        """Get or set axes, loading the data if necessary.
+
+        For details, see the documentation of the base class.
+
+        """
+        self._load()
+        return self._axes
+
+    @axes.setter
+    def axes(self, axes):
+        self._load()
+        self._detach()
+        aspecd.dataset.Data.axes.fset(self, axes)
+
+    @property
+    def loaded(self):
+        """Whether the data are currently loaded."""
+        return self._loaded
+
+    @property
+    def eviction_policy(self):
+        """Policy deciding when to drop the loaded data."""
+        return self._eviction_policies.get(self)
+
+    def unload(self):
+        """Drop the loaded data, to be read again on next access.
+
+        Data detached from their source (see above) are retained, as are
+        data changed after loading, detaching them from their source.
+
+        """
+        if not self.source or not self._loaded:
+            return
+        if self._get_fingerprint() != self._fingerprint:
+            self._detach()
+            return
+        self._data = np.zeros(0)
+        self._axes = [aspecd.dataset.Axis(), aspecd.dataset.Axis()]
+        self._loaded = False
+
+    def _load(self):
+        if self._loaded:
+            if self.eviction_policy is not None:
+                self.eviction_policy.touch(self)
+            return
+        importer = aspecd.utils.object_from_class_name(self.importer)
+        importer.source = self.source
+        importer.parameters.update(self.parameters)
+        dataset = ExperimentalDataset()
+        importer.import_data_into(dataset)
+        self._data = dataset.data.data
+        self._axes = dataset.data.axes
+        self._loaded = True
+        self._fingerprint = self._get_fingerprint()
+        if self.eviction_policy is not None:
+            self.eviction_policy.add(self)
+
+    def _detach(self):
+        if not self.source:
+            return
+        if self.eviction_policy is not None:
+            self.eviction_policy.remove(self)
+            del self._eviction_policies[self]
+        self.source = ''
+        self._fingerprint = None
+
+    def _get_fingerprint(self):
+        """Return a hash of the data and axes, to detect changes."""
+        hash_ = hashlib.sha256()
+        for array in [self._data] + [axis.values for axis in self._axes]:
+            hash_.update(repr((array.dtype.str, array.shape)).encode())
+            hash_.update(np.ascontiguousarray(array).data)
+        for axis in self._axes:
+            hash_.update(repr((axis.quantity, axis.unit,
+                               axis.label)).encode())
+        return hash_.digest()
+
+
+class DeferredData(aspecd.dataset.Data):
+    """
+    Numerical data with processing steps applied only on first access.
+
+    Created by a :class:`uvvispy.processing.Pipeline` in lazy mode,
+    replacing the data of a dataset. On first access of either
+    :attr:`data` or :attr:`axes`, the data and axes are taken from the
+    source, and the pending processing steps are applied to the dataset.
+    Afterwards, the class behaves like its base class,
+    :class:`aspecd.dataset.Data`.
+
+    As the source is accessed only then as well, data imported lazily
+    (see :class:`uvvispy.dataset.LazyData`) are not even read if the
+    processed data are never used.
+
+    .. versionadded:: 0.2
+
+    Attributes
+    ----------
+    source : :class:`aspecd.dataset.Data`
+        Data the processing steps are applied to
+
+    processing : :class:`uvvispy.processing.Pipeline`
+        Processing steps pending, applied on first access
+
+    pending : :class:`bool`
+        Whether the processing steps are still pending
+
+        Read-only
+
+    """
+
+    def __init__(self, source=None, processing=None):
+        self._pending = False
+        super().__init__()
+        self.source = source
+        self.processing = processing
+        self._pending = source is not None
+        self._exclude_from_to_dict.extend(['source', 'processing'])
+
+    @property
+    def data(self):
+        """Get or set (numeric) data, processing them if necessary.
+
+        For details, see the documentation of the base class.
+
+        """
+        self._execute()
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._execute()
+        aspecd.dataset.Data.data.fset(self, data)
+
+    @property
+    def axes(self):
+        """Get or set axes, processing the data if necessary.
+
+        For details, see the documentation of the base class.
+
+        """
+        self._execute()
+        return self._axes
+
+    @axes.setter
+    def axes(self, axes):
+        self._execute()
+        aspecd.dataset.Data.axes.fset(self, axes)
+
+    @property
+    def pending(self):
+        """Whether the processing steps are still pending."""
+        return self._pending
+
+    def _execute(self):
+        if not self._pending:
+            return
+        self._pending = False
+        self._data = self.source.data
+        self._axes = self.source.axes
+        self.source = None
+        processing, self.processing = self.processing, None
+        if processing is not None:
+            processing.process()
+
+
+class EvictionPolicy:
+    """
+    Policy dropping the data of the datasets least recently used.
+
+    Keeps track of the :class:`uvvispy.dataset.LazyData` objects currently
+    loaded and drops the data of those used least recently (see
+    :meth:`uvvispy.dataset.LazyData.unload`) as soon as either limit is
+    exceeded. The data of a dataset are read again on next access.
+
+    Usually, the policy is set for an importer factory, handing it over
+    to the importers:
+
+    .. code-block::
+
+        policy = uvvispy.dataset.EvictionPolicy(max_loaded=20)
+        dataset_factory = uvvispy.dataset.DatasetFactory()
+        dataset_factory.importer_factory.eviction_policy = policy
+
+    The policy may be used by datasets imported or accessed in different
+    threads at the same time.
+
+    Attributes
+    ----------
+    max_loaded : :class:`int`
+        Maximum number of datasets with loaded data
+
+        Default: None (no limit)
+
+    max_size : :class:`int`
+        Maximum size (in bytes) of the loaded data, including axes values
+
+        The data most recently loaded are always retained, even if
+        exceeding this size.
+
+        Default: None (no limit)
+
+    size : :class:`int`
+        Size (in bytes) of the data currently loaded
+
+        Read-only
+
+    """
+
+    def __init__(self, max_loaded=None, max_size=None):
+        self.max_loaded = max_loaded
+        self.max_size = max_size
+        self._loaded = collections.OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def size(self):
+        """Size (in bytes) of the data currently loaded."""
+        with self._lock:
+            return sum(size for _, size in self._loaded.values())
+
+    def add(self, data=None):
+        """Add data just loaded, dropping other data if necessary.
+
+        Parameters
+        ----------
+        data : :class:`uvvispy.dataset.LazyData`
+            Data just loaded
+
+        """
+        # pylint: disable=protected-access
+        size = data._data.nbytes + sum(axis.values.nbytes
+                                       for axis in data._axes)
+        with self._lock:
+            self._loaded[id(data)] = (weakref.ref(data), size)
+            self._evict()
+
+    def touch(self, data=None):
+        """Mark data as just used.
+
+        Parameters
+        ----------
+        data : :class:`uvvispy.dataset.LazyData`
+            Data just used
+
+        """
+        with self._lock:
+            if id(data) in self._loaded:
+                self._loaded.move_to_end(id(data))
+
+    def remove(self, data=None):
+        """Stop keeping track of data, without dropping them.
+
+        Parameters
+        ----------
+        data : :class:`uvvispy.dataset.LazyData`
+            Data not to be dropped by this policy
+
+        """
+        with self._lock:
+            self._loaded.pop(id(data), None)
+
+    def _evict(self):
+        for key, (reference, _) in list(self._loaded.items()):
+            if reference() is None:
+                del self._loaded[key]
+        while len(self._loaded) > 1 and self._exceeded():
+            _, (reference, _) = self._loaded.popitem(last=False)
+            data = reference()
+            if data is not None:
+                data.unload()
+
+    def _exceeded(self):
+        if self.max_loaded is not None \
+                and len(self._loaded) > self.max_loaded:
+            return True
+        return self.max_size is not None and self.size > self.max_size
+
+
+class UniformAxis(aspecd.dataset.Axis):
+    """
+    Axis storing uniformly spaced values as start, step and length.
+
+    Besides storing the values, the class behaves like its base class,
+    :class:`aspecd.dataset.Axis`. Whenever values are set, they are checked
+    for being uniformly spaced (allowing for rounding errors). If so, only
+    start, step and length are stored, otherwise the values themselves.
+
+    As the values are calculated on each access to :attr:`values`,
+    modifying them in place has no effect. Furthermore, when accessing
+    values repeatedly, *e.g.* in a loop, assign them to a variable first.
+
+    Attributes
+    ----------
+    start : :class:`float`
+        First value of the axis
+
+        None if the values are not stored compactly.
+
+        Read-only
+
+    step : :class:`float`
+        Difference between two consecutive values of the axis
+
+        None if the values are not stored compactly.
+
+        Read-only
+
+    length : :class:`int`
+        Number of values of the axis
+
+        Read-only
+
+    compact : :class:`bool`
+        Whether the values are stored as start, step and length
+
+        Read-only
+
+    Examples
+    --------
+    Usually, you will not create axes yourself, but have importers create
+    them (see their ``compact_axes`` parameter). To replace an axis of an
+    existing dataset by a uniform axis:
+
+    .. code-block::
+
+        axis = uvvispy.dataset.UniformAxis.from_axis(dataset.data.axes[0])
+        dataset.data.axes[0] = axis
+
+    """
+
+    def __init__(self):
+        self._start = None
+        self._step = None
+        self._length = 0
+        self._dtype = np.dtype(float)
+        super().__init__()
+
+    @property
+    def values(self):
+        """
+        Get or set the numerical axis values.
+
+        For details, see the documentation of the base class.
+
+        """
+        if self._start is None:
+            return self._values
+        values = self._start + self._step * np.arange(self._length)
+        return values.astype(self._dtype, copy=False)
+
+    @values.setter
+    def values(self, values):
+        self._start = None
+        aspecd.dataset.Axis.values.fset(self, values)
+        self._compact()
+
+    @property
+    def start(self):
+        """First value of the axis."""
+        return self._start
+
+    @property
+    def step(self):
+        """Difference between two consecutive values of the axis."""
+        return self._step
+
+    @property
+    def length(self):
+        """Number of values of the axis."""
+        if self._start is None:
+            return self._values.size
+        return self._length
+
+    @property
+    def compact(self):
+        """Whether the values are stored as start, step and length."""
+        return self._start is not None
+
+    @classmethod
+    def from_axis(cls, axis=None):
+        """Create uniform axis from an axis, retaining all its properties.
+
+        Parameters
+        ----------
+        axis : :class:`aspecd.dataset.Axis`
+            Axis whose values and properties are used
+
+        Returns
+        -------
+        axis : :class:`uvvispy.dataset.UniformAxis`
+            Uniform axis with same values and properties
+
+        """
+        uniform_axis = cls()
+        for key in ['quantity', 'symbol', 'unit', 'label']:
+            setattr(uniform_axis, key, getattr(axis, key))
+        uniform_axis.values = axis.values
+        return uniform_axis
+
+    def _compact(self):
+        values = self._values
+        if values.size < 2 or values.dtype.kind != 'f':
+            return
+        step = (float(values[-1]) - float(values[0])) / (values.size - 1)
+        uniform = float(values[0]) + step * np.arange(values.size)
+        if not step or np.abs(values - uniform).max() > abs(step) * 1e-9:
+            return
+        self._start = float(values[0])
+        self._step = step
+        self._length = values.size
+        self._dtype = values.dtype
+        self._values = np.zeros(0, dtype=values.dtype)
@@ -0,0 +1,470 @@
+"""
+Ingest: continuous import of datasets written to a directory.
+
+Spectrometers usually write their data to a (shared) directory all day
+long. Instead of repeatedly importing all datasets in this directory,
+the :class:`uvvispy.ingest.Ingestor` watches the directory and imports
+only new or changed files, storing them in the UVVisPy dataset format
+(see :class:`uvvispy.io.uvd.UvdExporter`) and/or adding them to a catalog
+(see :class:`uvvispy.catalog.Catalog`).
+
+On Linux, changes are reported by the kernel (inotify). Otherwise,
+the directory is scanned for changes in regular intervals.
+
+As files are usually written in several steps, files are only imported
+once they have not been changed for a while (debouncing). Furthermore,
+the number of files imported at the same time is limited, hence a burst
+of new files does not saturate the machine (backpressure).
+
+A typical use case would look like this:
+
+.. code-block::
+
+    ingestor = uvvispy.ingest.Ingestor(directory='incoming')
+    ingestor.target_directory = 'datasets'
+    ingestor.catalog = uvvispy.catalog.Catalog(filename='catalog.sqlite')
+    ingestor.run()
+
+This will run until interrupted (or :meth:`Ingestor.stop` is called from
+another thread).
+
+
+Module documentation
+====================
+"""
+
+import concurrent.futures
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+import aspecd.exceptions
+
+import uvvispy.dataset
+import uvvispy.io
+
+
+class Ingestor:
+    """
+    Import datasets written to a directory as soon as they are complete.
+
+    The directory is watched for new or changed files with an extension
+    handled by the importer factory of the dataset factory. Changes of
+    metadata files (with same basename and "yaml" as extension) are
+    treated as changes of the corresponding data files. Subdirectories
+    are not watched.
+
+    Files already present when starting to watch the directory are
+    handled like new files, except for those already stored in the target
+    directory and not changed since.
+
+    Attributes
+    ----------
+    directory : :class:`str`
+        Directory to watch
+
+    target_directory : :class:`str`
+        Directory the imported datasets are stored in
+
+        Datasets are stored in UVD format (see
+        :class:`uvvispy.io.uvd.UvdExporter`), named after their source
+        including its extension, *e.g.* ``foo.txt.uvd``, hence sources
+        differing only in their extension do not overwrite each other.
+        Must not be the watched directory.
+
+    catalog : :class:`uvvispy.catalog.Catalog`
+        Catalog the datasets are added to
+
+    dataset_factory : :class:`uvvispy.dataset.DatasetFactory`
+        Factory used for importing the datasets
+
+    debounce : :class:`float`
+        Time (in seconds) a file needs to be unchanged before it is imported
+
+        Default: 2
+
+    interval : :class:`float`
+        Time (in seconds) to wait for changes in the directory
+
+        In case of scanning the directory for changes, this is the interval
+        between two scans.
+
+        Default: 1
+
+    processes : :class:`int`
+        Number of processes used for importing
+
+        If set to one, datasets are imported within the current process.
+
+        Default: 1
+
+    max_queued : :class:`int`
+        Maximum number of files imported at the same time
+
+        Further files wait until the import of these files has finished.
+        When importing within the current process, this is the maximum
+        number of files imported per call of :meth:`poll`.
+
+        Default: twice the number of processes
+
+    use_inotify : :class:`bool`
+        Whether to use the inotify interface of the Linux kernel
+
+        If not available, the directory is scanned for changes.
+
+        Default: True
+
+    ingested : :class:`list`
+        Sources of the datasets ingested most recently
+
+        Contains at most :attr:`max_ingested` sources, the oldest ones are
+        discarded first. To keep track of all datasets ingested, use a
+        catalog.
+
+        Read-only
+
+    max_ingested : :class:`int`
+        Maximum number of sources kept in :attr:`ingested`
+
+        Default: 1000
+
+    errors : :class:`dict`
+        Errors occurring during import
+
+        The keys are the sources, the values the exceptions raised while
+        importing the respective source.
+
+        Read-only
+
+    Raises
+    ------
+    aspecd.exceptions.MissingSourceError
+        Raised if no directory is provided
+
+    """
+
+    def __init__(self, directory=''):
+        self.directory = directory
+        self.target_directory = ''
+        self.catalog = None
+        self.dataset_factory = uvvispy.dataset.DatasetFactory()
+        self.debounce = 2.
+        self.interval = 1.
+        self.processes = 1
+        self.max_queued = None
+        self.use_inotify = True
+        self.max_ingested = 1000
+        self._results = _Results()
+        self._session = None
+
+    @property
+    def ingested(self):
+        """Sources of the datasets ingested most recently."""
+        return self._results.ingested
+
+    @property
+    def errors(self):
+        """Errors occurring during import."""
+        return self._results.errors
+
+    def run(self, duration=None):
+        """Watch the directory and ingest datasets until stopped.
+
+        Parameters
+        ----------
+        duration : :class:`float`
+            Time (in seconds) to run
+
+            If None, runs until :meth:`stop` is called or the process
+            is interrupted.
+
+        """
+        if not self._session:
+            self._start()
+        session = self._session
+        session.running = True
+        start = time.monotonic()
+        try:
+            while session.running and (
+                    duration is None or time.monotonic() - start < duration):
+                self.poll(timeout=self.interval)
+        finally:
+            self.close()
+
+    def stop(self):
+        """Stop watching the directory after the current iteration."""
+        if self._session:
+            self._session.running = False
+
+    def poll(self, timeout=0.):
+        """Check for changes once and ingest the datasets that are complete.
+
+        Parameters
+        ----------
+        timeout : :class:`float`
+            Time (in seconds) to wait for changes
+
+        Returns
+        -------
+        sources : :class:`list`
+            Sources of the datasets ingested during this call
+
+        """
+        if not self._session:
+            self._start()
+        for path in self._session.watcher.changes(timeout=timeout):
+            for source in self._get_sources(path):
+                self._session.pending[source] = time.monotonic()
+        ingested = self._collect_finished()
+        ingested.extend(self._submit_ready())
+        self._record(ingested)
+        return ingested
+
+    def close(self):
+        """Stop watching the directory and wait for running imports."""
+        if self._session:
+            self._session.close()
+            self._record(self._collect_finished())
+            self._session = None
+
+    def _record(self, ingested):
+        self._results.record(ingested, self.max_ingested)
+        if self.catalog and ingested:
+            self.catalog.add(ingested)
+
+    def _start(self):
+        if not self.directory:
+            raise aspecd.exceptions.MissingSourceError(
+                'A directory is required for ingesting datasets')
+        watcher = None
+        if self.use_inotify:
+            try:
+                watcher = _InotifyWatcher(self.directory)
+            except (AttributeError, OSError):
+                watcher = None
+        if not watcher:
+            watcher = _PollingWatcher(self.directory)
+        self._session = _Session(watcher=watcher)
+        if self.processes > 1:
+            self._session.executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.processes)
+
+    def _get_sources(self, path):
+        basename, extension = os.path.splitext(path)
+        extensions = self.dataset_factory.importer_factory.extensions
+        if extension.lower() in extensions:
+            return [path]
+        if extension == '.yaml':
+            return [basename + extension_ for extension_ in extensions
+                    if os.path.exists(basename + extension_)]
+        return []
+
+    def _submit_ready(self):
+        ingested = []
+        max_queued = self.max_queued or 2 * self.processes
+        queued = len(self._session.futures)
+        now = time.monotonic()
+        for source, modification_time in list(self._session.pending.items()):
+            if queued >= max_queued:
+                break
+            if now - modification_time < self.debounce:
+                continue
+            del self._session.pending[source]
+            if not os.path.exists(source) or self._is_up_to_date(source):
+                continue
+            queued += 1
+            target = self._target(source)
+            if not target:
+                ingested.append(source)
+            elif self._session.executor:
+                future = self._session.executor.submit(
+                    _ingest_dataset, self.dataset_factory, source, target)
+                self._session.futures[future] = source
+            else:
+                error = _ingest_dataset(self.dataset_factory, source, target)
+                ingested.extend(self._results.check(source, error))
+        return ingested
+
+    def _collect_finished(self):
+        ingested = []
+        for source, error in self._session.finished():
+            ingested.extend(self._results.check(source, error))
+        return ingested
+
+    def _target(self, source):
+        if not self.target_directory:
+            return ''
+        return os.path.join(self.target_directory,
+                            os.path.basename(source) + '.uvd')
+
+    def _is_up_to_date(self, source):
+        target = self._target(source)
+        if not target or not os.path.exists(target):
+            return False
+        modification_time = os.stat(source).st_mtime_ns
+        metadata_filename = os.path.splitext(source)[0] + '.yaml'
+        if os.path.exists(metadata_filename):
+            modification_time = max(modification_time,
+                                    os.stat(metadata_filename).st_mtime_ns)
+        return os.stat(target).st_mtime_ns >= modification_time
+
+
+class _Results:
+    """Sources ingested and errors occurring, kept beyond a session."""
+
+    def __init__(self):
+        self.ingested = []
+        self.errors = dict()
+
+    def check(self, source, error):
+        """Record the error of an import, if any, and return the source.
+
+        Returns a list with the source if imported successfully, an empty
+        list otherwise.
+        """
+        if error:
+            self.errors[source] = error
+            return []
+        self.errors.pop(source, None)
+        return [source]
+
+    def record(self, ingested, max_ingested):
+        """Add sources ingested, keeping only the most recent ones."""
+        self.ingested.extend(ingested)
+        excess = len(self.ingested) - max_ingested
+        if excess > 0:
+            del self.ingested[:excess]
+
+
+class _Session:
+    """State of watching a directory, from starting until closing."""
+
+    def __init__(self, watcher=None):
+        self.watcher = watcher
+        self.executor = None
+        self.pending = dict()
+        self.futures = dict()
+        self.running = False
+
+    def finished(self):
+        """Return source and error of each import finished meanwhile."""
+        finished = [future for future in self.futures if future.done()]
+        return [(self.futures.pop(future), future.result())
+                for future in finished]
+
+    def close(self):
+        """Stop watching the directory and wait for running imports."""
+        if self.executor:
+            self.executor.shutdown()
+        self.watcher.close()
+
+
+def _ingest_dataset(dataset_factory, source, target):
+    """Import a dataset and store it, returning the error if any."""
+    try:
+        dataset = dataset_factory.get_dataset(source=source)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        dataset.export_to(uvvispy.io.UvdExporter(target=target))
+    except Exception as error:  # pylint: disable=broad-except
+        return error
+    return None
+
+
+def _list_files(directory):
+    # No context manager, as os.scandir() supports it only as of Python 3.6
+    return {entry.path: entry.stat() for entry in os.scandir(directory)
+            if entry.is_file()}
+
+
+class _PollingWatcher:
+    """Report changes in a directory by comparing its contents."""
+
+    def __init__(self, directory=''):
+        self._directory = directory
+        self._files = dict()
+        self._first_call = True
+
+    def changes(self, timeout=0.):
+        """Return the paths of files changed since the last call.
+
+        On the first call, all files in the directory are returned.
+        """
+        if self._first_call:
+            self._first_call = False
+        else:
+            time.sleep(timeout)
+        files = {path: (status.st_mtime_ns, status.st_size)
+                 for path, status in _list_files(self._directory).items()}
+        changed = {path for path, status in files.items()
+                   if self._files.get(path) != status}
+        self._files = files
+        return changed
+
+    def close(self):
+        """Forget about the files seen so far."""
+        self._files = dict()
+
+
+class _InotifyWatcher:
+    """Report changes in a directory using the inotify interface of Linux."""
+
+    # IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    mask = 0x002 | 0x008 | 0x080 | 0x100
+    overflow = 0x4000  # IN_Q_OVERFLOW
+    event = struct.Struct('iIII')
+
+    def __init__(self, directory=''):
+        self._directory = directory
+        self._first_call = True
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify not available')
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory),
+                                  self.mask) < 0:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(),
+                          'Cannot watch %s' % directory)
+
+    def changes(self, timeout=0.):
+        """Return the paths of files changed since the last call.
+
+        On the first call, all files in the directory are returned,
+        as well as after events have been lost due to an overflow of the
+        event queue of the kernel.
+        """
+        changed = set()
+        if self._first_call:
+            self._first_call = False
+            changed.update(_list_files(self._directory))
+            timeout = 0.
+        if select.select([self._fd], [], [], timeout)[0]:
+            changed.update(self._read_events())
+        return changed
+
+    def _read_events(self):
+        paths = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buffer):
+                _, mask, _, length = self.event.unpack_from(buffer, offset)
+                offset += self.event.size
+                if mask & self.overflow:
+                    paths.update(_list_files(self._directory))
+                name = buffer[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if name:
+                    paths.add(os.path.join(self._directory,
+                                           os.fsdecode(name)))
+        return paths
+
+    def close(self):
+        """Stop watching the directory."""
+        os.close(self._fd)
@@ -0,0 +1,75 @@
+"""
+General facilities for input (and output).
+
+In order to work with UVVis data, these data need to be imported into the
+UVVisPy package. Therefore, the package provides importers for specific file
+formats.
+
+Processed data can be handed back to the vendor software (and colleagues
+using it) in the Shimadzu ASCII export format, using the
+:class:`uvvispy.io.exporter.ShimadzuASCIIExporter` class.
+
+Datasets, including their metadata and history, can be stored in and
+retrieved from a native binary format using the
+:class:`uvvispy.io.uvd.UvdExporter` and :class:`uvvispy.io.uvd.UvdImporter`
+classes, respectively. This allows for storing preprocessed datasets and
+using them in recipes.
+
+Another class implemented in this package is the
+:class:`uvvispy.io.factory.DatasetImporterFactory`, a prerequisite for
+recipe-driven data analysis. This factory returns the correct dataset
+importer for a specific dataset depending on the information provided
+(usually, a filename).
+
+Importing the same files over and over again, *e.g.* when re-running a
+recipe, can be sped up considerably by using an (opt-in) on-disk cache of
+imported datasets, see :class:`uvvispy.io.cache.ImportCache` for details.
+Besides, metadata files are cached in memory for the lifetime of the
+process. To read them anew, *e.g.* for benchmarking, use
+:func:`uvvispy.io.importer.clear_caches`.
+
+For data residing on storage with high latency, such as network shares,
+datasets can be imported asynchronously, reading several files at the same
+time (see :class:`uvvispy.io.reader.FileReader` and
+:meth:`uvvispy.dataset.DatasetFactory.get_dataset_async`).
+
+All classes are available from the package itself, *e.g.*
+``uvvispy.io.ShimadzuASCIIImporter``, as this is where recipes look for
+importers and exporters given by their name.
+
+.. versionchanged:: 0.2
+    Module split into a package
+
+
+Available modules
+-----------------
+:mod:`uvvispy.io.importer`
+    Base class of all importers, importers for text files and series
+
+:mod:`uvvispy.io.spc`
+    Importer for the binary file format of the Shimadzu UVProbe software
+
+:mod:`uvvispy.io.exporter`
+    Exporters for the file formats of vendor software
+
+:mod:`uvvispy.io.uvd`
+    UVVisPy dataset format (UVD)
+
+:mod:`uvvispy.io.factory`
+    Factory for importers, choosing the importer for a dataset
+
+:mod:`uvvispy.io.cache`
+    On-disk cache of imported datasets
+
+:mod:`uvvispy.io.reader`
+    Reading files asynchronously
+
+"""
+from uvvispy.io.importer import DatasetImporter, ShimadzuASCIIImporter, \
+    SeriesImporter, clear_caches
+from uvvispy.io.spc import ShimadzuSPCImporter
+from uvvispy.io.exporter import ShimadzuASCIIExporter
+from uvvispy.io.uvd import UvdExporter, UvdImporter
+from uvvispy.io.factory import ImporterRegistry, DatasetImporterFactory
+from uvvispy.io.cache import ImportCache
+from uvvispy.io.reader import FileReader
@@ -0,0 +1,270 @@
+"""
+On-disk cache of imported datasets.
+
+Importing the same files over and over again, *e.g.* when re-running a
+recipe, can be sped up considerably by using an (opt-in) on-disk cache of
+imported datasets, see :class:`uvvispy.io.cache.ImportCache` for details.
+
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+
+import aspecd.utils
+
+
+class ImportCache:
+    """
+    On-disk cache of imported datasets.
+
+    Parsing the raw data and metadata files takes time, and usually,
+    the same files are imported over and over again, *e.g.* each time a
+    recipe is (re-)run. Therefore, fully imported datasets can be stored
+    in a cache and retrieved in a fraction of the time of the actual
+    import, as long as nothing has changed.
+
+    Cache entries are content-addressed: The key is a hash of the raw data,
+    the accompanying metadata file, and the class, version and parameters
+    of the importer. Hence, changing any of these results in a new import,
+    regardless of modification times, and identical files are imported
+    only once, regardless of their names.
+
+    Each entry is a single (pickled) binary file in the cache directory,
+    containing the dataset apart from its (duplicated) original data. As
+    the entries are not meant to be exchanged, the cache directory is
+    created accessible by its owner only, and entries owned by other users
+    are ignored. Nevertheless, only use a cache directory no one else can
+    write to.
+
+    To restrict the disk space used, the least recently used entries are
+    removed whenever storing a new entry exceeds one of the limits. To not
+    scan the cache directory each time an entry is stored, the size and
+    number of entries are tracked, and entries are removed in batches,
+    down to three quarters of the limits. Entries stored by other
+    processes are only taken into account upon the next removal of
+    entries, hence the limits may be exceeded temporarily.
+
+    Attributes
+    ----------
+    directory : :class:`str`
+        Directory the cache entries are stored in
+
+        Created if it does not exist.
+
+        Default: ``uvvispy`` in the user's cache directory
+
+    max_size : :class:`int`
+        Maximum total size of all cache entries in bytes
+
+        If None, the size is not limited.
+
+        Default: 256 MiB
+
+    max_entries : :class:`int`
+        Maximum number of cache entries
+
+        If None, the number of entries is not limited.
+
+        Default: None
+
+
+    Examples
+    --------
+    To use a cache for all datasets imported by the dataset factory (and
+    hence in recipes as well), set the cache of its importer factory:
+
+    .. code-block::
+
+        factory = uvvispy.dataset.DatasetFactory()
+        factory.importer_factory.cache = uvvispy.io.ImportCache()
+
+    Similarly, set the :attr:`uvvispy.io.importer.DatasetImporter.cache`
+    attribute of an importer to use a cache for this importer.
+
+
+    .. versionadded:: 0.2
+
+    """
+
+    def __init__(self, directory='', max_size=256 * 1024**2,
+                 max_entries=None):
+        if not directory:
+            cache_home = os.environ.get(
+                'XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'),
+                                               '.cache'))
+            directory = os.path.join(cache_home, 'uvvispy')
+        self.directory = directory
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self._extension = '.pickle'
+        self._totals = None
+
+    def key(self, importer=None):
+        """Return the key of the dataset imported by an importer.
+
+        Parameters
+        ----------
+        importer : :class:`uvvispy.io.importer.DatasetImporter`
+            Importer whose source and parameters are used to create the key
+
+        Returns
+        -------
+        key : :class:`str`
+            Hash of the contents of source and metadata file and the
+            class, version and parameters of the importer
+
+        """
+        hash_ = hashlib.sha256()
+        hash_.update(repr((aspecd.utils.full_class_name(importer),
+                           importer.version,
+                           sorted(importer.parameters.items()))).encode())
+        # pylint: disable=protected-access
+        for filename in (importer.source, importer.metadata_filename()):
+            hash_.update(b'\0')
+            if importer._exists(filename):
+                with importer._open(filename) as file:
+                    hash_.update(file.read())
+        return hash_.hexdigest()
+
+    def retrieve(self, key='', dataset=None):
+        """Retrieve a dataset from the cache.
+
+        Parameters
+        ----------
+        key : :class:`str`
+            Key of the cache entry
+
+        dataset : :class:`aspecd.dataset.Dataset`
+            Dataset the cached data and metadata are set in
+
+        Returns
+        -------
+        found : :class:`bool`
+            Whether the dataset has been found in the cache
+
+        """
+        filename = self._filename(key)
+        try:
+            with open(filename, 'rb') as file:
+                if not _is_owned(os.fstat(file.fileno())):
+                    return False
+                attributes = pickle.load(file)
+            os.utime(filename)
+        except OSError:
+            return False
+        except (EOFError, pickle.UnpicklingError, AttributeError,
+                ImportError):
+            # Corrupt entries or entries of other versions of the classes
+            self._remove(filename)
+            return False
+        for name, value in attributes.items():
+            setattr(dataset, name, value)
+        return True
+
+    def store(self, key='', dataset=None):
+        """Store a dataset in the cache.
+
+        The entry is written to a temporary file first and renamed
+        afterwards, hence several processes can safely use the same
+        cache. Least recently used entries are removed afterwards if one
+        of the limits is exceeded.
+
+        Parameters
+        ----------
+        key : :class:`str`
+            Key of the cache entry
+
+        dataset : :class:`aspecd.dataset.Dataset`
+            Dataset to store
+
+        """
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        if self._totals is None:
+            self._evict()
+        attributes = {name: getattr(dataset, name)
+                      for name in dataset.__odict__ if name != '_origdata'}
+        with tempfile.NamedTemporaryFile(dir=self.directory, delete=False,
+                                         suffix='.tmp') as file:
+            try:
+                pickle.dump(attributes, file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            except BaseException:
+                file.close()
+                self._remove(file.name)
+                raise
+        filename = self._filename(key)
+        size, entries = self._totals
+        try:
+            size -= os.stat(filename).st_size
+            entries -= 1
+        except OSError:
+            pass
+        os.replace(file.name, filename)
+        self._totals = (size + os.stat(filename).st_size, entries + 1)
+        if self._exceeds_limits(*self._totals):
+            self._evict()
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        for entry in self._entries():
+            os.remove(entry.path)
+        self._totals = (0, 0)
+
+    def _filename(self, key):
+        return os.path.join(self.directory, key + self._extension)
+
+    @staticmethod
+    def _remove(filename):
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        # No context manager, as os.scandir() supports it only as of Python 3.6
+        return [entry for entry in os.scandir(self.directory)
+                if entry.name.endswith(self._extension)]
+
+    def _exceeds_limits(self, size, entries, low_water=False):
+        return _exceeds(entries, self.max_entries, low_water) \
+            or _exceeds(size, self.max_size, low_water)
+
+    def _evict(self):
+        entries = []
+        for entry in self._entries():
+            try:
+                status = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((status.st_mtime_ns, status.st_size, entry.path))
+        # Remove least recently used entries down to a low-water mark, to
+        # not need to scan the directory again upon storing the next entry
+        entries.sort()
+        total_size = sum(size for _, size, _ in entries)
+        while entries and self._exceeds_limits(total_size, len(entries),
+                                               low_water=True):
+            _, size, path = entries.pop(0)
+            total_size -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._totals = (total_size, len(entries))
+
+
+def _exceeds(value, limit, low_water=False):
+    if limit is None:
+        return False
+    if low_water:
+        limit -= limit // 4
+    return value > limit
+
+
+def _is_owned(status):
+    # Not available on all platforms (e.g., Windows)
+    if not hasattr(os, 'getuid'):
+        return True
+    return status.st_uid == os.getuid()
@@ -0,0 +1,175 @@
+"""
+Exporters for the file formats of vendor software.
+
+Processed data can be handed back to the vendor software (and colleagues
+using it) in the Shimadzu ASCII export format, using the
+:class:`uvvispy.io.exporter.ShimadzuASCIIExporter` class.
+
+"""
+import os
+
+import aspecd.exceptions
+import aspecd.io
+import numpy as np
+
+
+class ShimadzuASCIIExporter(aspecd.io.DatasetExporter):
+    """
+    Dataset exporter for the Shimadzu UVProbe ASCII export file format.
+
+    Writes the data in the format read by the
+    :class:`uvvispy.io.importer.ShimadzuASCIIImporter`: two header lines
+    followed by the data as tab-separated fixed-point numbers with decimal
+    comma and Windows line endings:
+
+    .. code-block::
+
+        "<filename_without_extension> - RawData"
+        "Wavelength nm."	"Abs."
+        300,00	0,322
+        301,00	0,310
+        302,00	0,289
+
+    2D datasets are written with one column per spectrum, with the values
+    of the second axis as column labels.
+
+    Rather than formatting one line after the other, all numbers are
+    formatted at once: their digits are calculated as integer arrays and
+    assembled into one block of characters, written to the file at once.
+    Numbers not fitting this scheme (*e.g.* NaN) are formatted one by one.
+
+    Attributes
+    ----------
+    axis_decimals : :class:`int`
+        Number of decimals of the axis values (wavelengths)
+
+        Default: 2
+
+    data_decimals : :class:`int`
+        Number of decimals of the data values
+
+        Default: 3
+
+    Raises
+    ------
+    aspecd.exceptions.MissingTargetError
+        Raised if no target is provided
+
+    .. versionadded:: 0.2
+
+    """
+
+    column_labels = {
+        'absorbance': 'Abs.',
+        'transmittance': '%T',
+        'reflectance': '%R',
+    }
+
+    def __init__(self, target=None):
+        super().__init__(target=target)
+        self.extension = '.txt'
+        self.axis_decimals = 2
+        self.data_decimals = 3
+
+    def _export(self):
+        if not self.target:
+            raise aspecd.exceptions.MissingTargetError
+        target = self._sanitise_file_extension(self.target)
+        contents = self._format_header(target) + self._format_data()
+        with open(target, 'wb') as file:
+            file.write(contents)
+
+    def _sanitise_file_extension(self, target=None):
+        return "".join([os.path.splitext(target)[0], self.extension])
+
+    def _format_header(self, target):
+        data = self.dataset.data
+        if data.data.ndim > 1:
+            labels = [np.format_float_positional(value, trim='-')
+                      .replace('.', ',') for value in data.axes[1].values]
+        else:
+            labels = [self.column_labels.get(data.axes[-1].quantity, 'Abs.')]
+        title = os.path.splitext(os.path.basename(target))[0]
+        lines = ['"%s - RawData"' % title,
+                 '\t'.join('"%s"' % label
+                           for label in ['Wavelength nm.'] + labels)]
+        return ''.join(line + '\r\n' for line in lines).encode(
+            'cp1252', errors='replace')
+
+    def _format_data(self):
+        data = np.asarray(self.dataset.data.data, dtype=float)
+        if data.ndim == 1:
+            data = data[:, np.newaxis]
+        axis_values = np.asarray(self.dataset.data.axes[0].values,
+                                 dtype=float)
+        blocks = [
+            self._format_numbers(axis_values[:, np.newaxis],
+                                 self.axis_decimals),
+            self._format_numbers(data, self.data_decimals),
+        ]
+        blocks = [block.reshape(len(data), np.prod(block.shape[1:]))
+                  for block in blocks]
+        blocks.append(np.full((len(data), 1), ord('\n'), np.uint8))
+        chars = np.hstack(blocks)
+        chars[:, -2] = ord('\r')
+        return chars[chars != 0].tobytes()
+
+    @staticmethod
+    def _format_numbers(values, decimals):
+        """Format values as fixed-point numbers with decimal comma.
+
+        Returns a 3D array of characters with one row per row of values
+        and one field per column, each field followed by a tab and padded
+        with zero bytes that are removed afterwards. The digits are
+        calculated from the values rounded to integer mantissae by
+        repeated integer division (using 32-bit integers if possible), with
+        leading zeros (except for the one before the decimal comma)
+        replaced by padding. Like UVProbe, negative values rounded to zero
+        are written with sign.
+        """
+        if not np.all(np.isfinite(values)) \
+                or np.abs(values).max(initial=0) * 10. ** decimals >= 2**53:
+            fields = ShimadzuASCIIExporter._format_numbers_one_by_one(
+                values, decimals)
+        else:
+            scaled = np.abs(values) * 10. ** decimals
+            mantissae = np.rint(scaled)
+            # Ties are rounded like Python (and UVProbe), not to even
+            for index in np.flatnonzero(
+                    np.abs(scaled - np.floor(scaled) - .5) < 1e-6):
+                string = '%.*f' % (decimals, values.flat[index])
+                mantissae.flat[index] = abs(int(string.replace('.', '')))
+            n_digits = max(len(str(int(mantissae.max(initial=0)))),
+                           decimals + 1)
+            mantissae = mantissae.astype(
+                np.uint32 if n_digits < 10 else np.int64)
+            digits = np.empty(values.shape + (n_digits,), dtype=np.uint8)
+            quotients = mantissae
+            for position in range(n_digits - 1, -1, -1):
+                next_quotients = quotients // 10
+                digits[..., position] = \
+                    quotients - next_quotients * 10 + ord('0')
+                quotients = next_quotients
+            n_leading = n_digits - decimals - 1
+            if n_leading:
+                powers = 10 ** np.arange(n_digits - 1, decimals, -1,
+                                         dtype=mantissae.dtype)
+                digits[..., :n_leading][
+                    mantissae[..., np.newaxis] < powers] = 0
+            signs = np.where(np.signbit(values), ord('-'), 0)
+            fields = [signs.astype(np.uint8)[..., np.newaxis],
+                      digits[..., :n_digits - decimals]]
+            if decimals:
+                fields.append(np.full(values.shape + (1,), ord(','),
+                                      np.uint8))
+                fields.append(digits[..., n_digits - decimals:])
+            fields = np.concatenate(fields, axis=-1)
+        tabs = np.full(values.shape + (1,), ord('\t'), np.uint8)
+        return np.concatenate([fields, tabs], axis=-1)
+
+    @staticmethod
+    def _format_numbers_one_by_one(values, decimals):
+        strings = [('%.*f' % (decimals, value)).replace('.', ',')
+                   for value in values.ravel()]
+        strings = np.asarray(strings, dtype=np.bytes_)
+        return strings.view(np.uint8).reshape(values.shape + (-1,))
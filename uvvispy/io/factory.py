@@ -0,0 +1,256 @@
+"""
+Factory for importers, choosing the importer for a dataset.
+
+The :class:`uvvispy.io.factory.DatasetImporterFactory` is a prerequisite
+for recipe-driven data analysis. This factory returns the correct dataset
+importer for a specific dataset depending on the information provided
+(usually, a filename), using the importers registered with its
+:class:`uvvispy.io.factory.ImporterRegistry`.
+
+"""
+import copy
+import os
+
+import aspecd.io
+
+from uvvispy.io.importer import DatasetImporter, ShimadzuASCIIImporter
+from uvvispy.io.spc import ShimadzuSPCImporter
+from uvvispy.io.uvd import UvdImporter
+
+
+class ImporterRegistry:
+    """
+    Registry of importers with the file extensions they handle.
+
+    Deciding about the importer for a file is done in two steps: First,
+    the importers registered for the extension of the file are looked up.
+    Second, the first bytes of the file are read once and handed over to the
+    :meth:`uvvispy.io.importer.DatasetImporter.probe` method of each of these
+    importers, in the order of registration, and the first importer
+    recognising the file is used. Hence, files with the same extension,
+    but from different vendors can be told apart without trying to import
+    them.
+
+    Attributes
+    ----------
+    header_size : :class:`int`
+        Number of bytes read from the beginning of a file for probing
+
+        Default: 512
+
+    extensions : :class:`list`
+        File extensions importers are registered for
+
+        Read-only
+
+
+    Examples
+    --------
+    To make an importer known to the
+    :class:`uvvispy.io.factory.DatasetImporterFactory` (and therefore to
+    recipes as well), register it with the registry of the factory:
+
+    .. code-block::
+
+        factory = uvvispy.io.DatasetImporterFactory()
+        factory.registry.register(importer=MyImporter, extensions=['.txt'])
+
+
+    .. versionadded:: 0.2
+
+    """
+
+    def __init__(self):
+        self.header_size = 512
+        self._importers = dict()
+
+    @property
+    def extensions(self):
+        """File extensions importers are registered for."""
+        return list(self._importers)
+
+    def register(self, importer=None, extensions=None):
+        """Register an importer for the given file extensions.
+
+        Parameters
+        ----------
+        importer : :class:`type`
+            Importer class inheriting from
+            :class:`uvvispy.io.importer.DatasetImporter`
+
+        extensions : :class:`list`
+            File extensions (including the leading dot) the importer handles
+
+        """
+        for extension in extensions:
+            self._importers.setdefault(extension.lower(), []).append(importer)
+
+    def get_importer(self, source='', header=None):
+        """Return importer object for the given source.
+
+        If the source cannot be read, the first importer registered for
+        its extension is returned, leaving it to the importer to report
+        the actual problem.
+
+        Parameters
+        ----------
+        source : :class:`str`
+            Name of the file to import
+
+        header : :class:`bytes`
+            First bytes of the file, if already read
+
+            Default: None (read from the file)
+
+        Returns
+        -------
+        importer : :class:`uvvispy.io.importer.DatasetImporter`
+            Importer for the source
+
+            None if no registered importer recognises the source
+
+        """
+        importers = self._importers.get(
+            os.path.splitext(source)[1].lower(), [])
+        if not importers:
+            return None
+        if header is None:
+            try:
+                with open(source, 'rb') as file:
+                    header = file.read(self.header_size)
+            except OSError:
+                return importers[0](source=source)
+        header = header[:self.header_size]
+        for importer in importers:
+            if importer.probe(header):
+                return importer(source=source)
+        return None
+
+
+class DatasetImporterFactory(aspecd.io.DatasetImporterFactory):
+    """Factory for creating importer objects based on the source provided.
+
+    Often, data are available in different formats, and deciding which
+    importer is appropriate for a given format can be quite involved. To
+    free other classes from having to contain the relevant code, a factory
+    can be used.
+
+    Currently, the sole information provided to decide about the appropriate
+    importer is the source (a string). A concrete importer object is
+    returned by the method ``get_importer()``. If no source is provided,
+    an exception will be raised.
+
+    The importers are looked up in a registry by the extension of the
+    source, and the first bytes of the file are used to tell apart files
+    with the same extension (see :class:`uvvispy.io.factory.ImporterRegistry`).
+    If the extension is registered, but none of the importers recognises
+    the file, the standard importers from the ASpecD framework are checked.
+    See the documentation of the :class:`aspecd.io.DatasetImporterFactory`
+    base class for details.
+
+    Attributes
+    ----------
+    registry : :class:`uvvispy.io.factory.ImporterRegistry`
+        Registry of the importers available
+
+        Register additional importers here.
+
+        .. versionadded:: 0.2
+
+    extensions : :class:`list`
+        File extensions handled by the registered importers
+
+        Used, *e.g.*, to decide which files of a directory to import.
+
+        Read-only
+
+        .. versionadded:: 0.2
+
+    cache : :class:`uvvispy.io.cache.ImportCache`
+        Cache of imported datasets handed over to the importers
+
+        Default: None
+
+        .. versionadded:: 0.2
+
+    eviction_policy : :class:`uvvispy.dataset.EvictionPolicy`
+        Policy for data imported lazily handed over to the importers
+
+        Default: None
+
+        .. versionadded:: 0.2
+
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.registry = ImporterRegistry()
+        self.registry.register(importer=ShimadzuASCIIImporter,
+                               extensions=['.txt'])
+        self.registry.register(importer=ShimadzuSPCImporter,
+                               extensions=['.spc'])
+        self.registry.register(importer=UvdImporter, extensions=['.uvd'])
+        self.cache = None
+        self.eviction_policy = None
+        self._header = None
+
+    @property
+    def extensions(self):
+        """File extensions handled by the registered importers."""
+        return self.registry.extensions
+
+    def get_importer(self, source='', importer='', parameters=None,
+                     header=None):
+        """Return importer object for dataset specified by its source.
+
+        Parameters are added to the default parameters of the importer,
+        rather than replacing them. If a cache or an eviction policy is
+        set, it is handed over to the importer. For details, see the
+        documentation of the base class.
+
+        In contrast to the base class, no state is stored in the factory
+        during the call, hence the method can be called concurrently from
+        several threads.
+
+        Parameters
+        ----------
+        source : :class:`str`
+            string describing the source of the dataset
+
+        importer : :class:`str`
+            Name of the importer to use for importing the dataset
+
+        parameters : :class:`dict`
+            Additional parameters for controlling the import
+
+        header : :class:`bytes`
+            First bytes of the source, if already read
+
+            Default: None (read from the source if necessary)
+
+            .. versionadded:: 0.2
+
+        Returns
+        -------
+        importer : :class:`aspecd.io.DatasetImporter`
+            importer object of appropriate class
+
+        """
+        # The base class stores the source during the call, hence use a
+        # copy of the factory to allow for concurrent calls.
+        factory = copy.copy(self)
+        factory._header = header  # pylint: disable=protected-access
+        importer = super(DatasetImporterFactory, factory).get_importer(
+            source=source, importer=importer)
+        if parameters:
+            importer.parameters.update(parameters)
+        if isinstance(importer, DatasetImporter):
+            importer.cache = self.cache
+            importer.eviction_policy = self.eviction_policy
+        return importer
+
+    def _get_importer(self):
+        if os.path.splitext(self.source)[1].lower() in self.extensions:
+            return self.registry.get_importer(source=self.source,
+                                              header=self._header)
+        return DatasetImporter()
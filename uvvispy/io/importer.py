@@ -0,0 +1,1029 @@
+"""
+Importers for datasets: base class, text files, and series of files.
+
+The :class:`uvvispy.io.importer.DatasetImporter` class is the base class of
+all importers of the UVVisPy package. It takes care of reading the metadata
+from the metadata file accompanying the raw data, and of caching datasets
+(see :mod:`uvvispy.io.cache`).
+
+As reading YAML files is comparably slow, metadata files are cached in
+memory for the lifetime of the process. To read them anew, *e.g.* for
+benchmarking, use :func:`uvvispy.io.importer.clear_caches`.
+
+"""
+import asyncio
+import copy
+import datetime
+import errno
+import functools
+import io
+import os
+import re
+
+import aspecd.annotation
+import aspecd.exceptions
+import aspecd.io
+import aspecd.metadata
+import aspecd.utils
+import numpy as np
+
+from uvvispy.io.reader import FileReader
+
+
+@functools.lru_cache(maxsize=1024)
+def _read_metadata_file(filename, modification_time, size):
+    """Return the contents of a metadata file, cached.
+
+    Modification time and size are only used as part of the key of the
+    cache, hence changed files are read anew. Always provide an absolute
+    filename, as relative ones depend on the current working directory.
+    Never modify the returned dict, but work on a copy.
+    """
+    # pylint: disable=unused-argument
+    yaml = aspecd.utils.Yaml()
+    yaml.read_from(filename)
+    return _dates_to_strings(yaml.dict)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_metadata_file(contents):
+    """Return the contents of a metadata file already read, cached.
+
+    Never modify the returned dict, but work on a copy.
+    """
+    yaml = aspecd.utils.Yaml()
+    yaml.read_stream(contents)
+    return _dates_to_strings(yaml.dict)
+
+
+def _dates_to_strings(dict_):
+    """Convert dates parsed by the YAML parser back into strings.
+
+    Unquoted dates in YAML files are converted into date objects, whereas
+    the metadata classes expect strings.
+    """
+    for key, value in dict_.items():
+        if isinstance(value, dict):
+            _dates_to_strings(value)
+        elif isinstance(value, (datetime.date, datetime.time)):
+            dict_[key] = str(value)
+    return dict_
+
+
+@functools.lru_cache(maxsize=None)
+def _get_metadata_mappings(version):
+    """Return the mappings for a version of the metadata file format, cached.
+
+    The mapping recipe is read only once per version and process. The
+    mappings are returned as (nested) tuples, as they are shared by all
+    importers.
+    """
+    mapper = aspecd.metadata.MetadataMapper()
+    mapper.version = version
+    root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    mapper.recipe_filename = os.path.join(root_path, 'metadata_mapper.yaml')
+    mapper.create_mappings()
+    return _freeze(mapper.mappings)
+
+
+def _has_key(metadata, dict_, key):
+    """Check whether a key is present in a (sub-)dictionary of metadata."""
+    if dict_:
+        metadata = metadata.get(dict_)
+    return isinstance(metadata, dict) and key in metadata
+
+
+def clear_caches():
+    """Clear the in-memory caches of metadata files.
+
+    Metadata files read are cached for the lifetime of the process,
+    with changed files being read anew. Clearing the caches is useful for
+    measuring the time needed to import datasets read for the first time.
+
+    .. versionadded:: 0.2
+
+    """
+    _read_metadata_file.cache_clear()
+    _parse_metadata_file.cache_clear()
+
+
+def _freeze(object_):
+    """Convert (nested) lists into tuples, hence objects safe to share."""
+    if isinstance(object_, list):
+        return tuple(_freeze(item) for item in object_)
+    return object_
+
+
+class DatasetImporter(aspecd.io.DatasetImporter):
+    """
+    Base class for dataset importers of the UVVisPy package.
+
+    This base class takes care of reading the metadata from the
+    corresponding YAML file. There are two options for classes inheriting
+    from this class: either a call to :meth:`super()._import` or a call to
+    :meth:`_read_metadata`. As soon as either of these calls exists in the
+    actual importers and a YAML file with the same base name as the source
+    exists, the metadata will be read from this file and mapped to the dataset.
+
+    As reading YAML files is comparably slow, both, the contents of the
+    metadata files and the mappings for each version of the metadata file
+    format (see ``metadata_mapper.yaml``), are cached for the lifetime of
+    the process. Metadata files are identified by their name, modification
+    time and size, hence changed files are always read anew. The number of
+    cached metadata files is limited, with the least recently used
+    files dropped first.
+
+    Importing is re-entrant: each import works on its own (shallow) copy
+    of the importer, with private state and parameters of its own, and
+    the caches described above are never modified once filled. Hence,
+    the same importer can be used to import into several datasets from
+    different threads at the same time, *e.g.* using a
+    :class:`concurrent.futures.ThreadPoolExecutor`.
+
+    Note that it is a good idea to first read the metadata from this file
+    and afterwards import the raw data, as this way you can easily overwrite
+    values in the metadata that may have gone wrong in the (manually
+    written) metadata file. Usually, parameters provided in the raw data are
+    more reliable, as they are automatically written by the spectrometer
+    software.
+
+    Attributes
+    ----------
+    version : :class:`str`
+        Version of the importer
+
+        Needs to be increased whenever changes to an importer change the
+        resulting dataset, as cached datasets are only used for identical
+        versions of the importer.
+
+        .. versionadded:: 0.2
+
+    cache : :class:`uvvispy.io.cache.ImportCache`
+        Cache of imported datasets
+
+        If set, datasets are retrieved from the cache if neither the raw
+        data nor the metadata file have changed since the last import,
+        and stored in the cache otherwise. See the documentation of the
+        :class:`uvvispy.io.cache.ImportCache` class for details.
+
+        Default: None
+
+        .. versionadded:: 0.2
+
+    eviction_policy : :class:`uvvispy.dataset.EvictionPolicy`
+        Policy deciding when to drop data imported lazily
+
+        Only relevant for importers supporting a lazy import mode. See the
+        documentation of the :class:`uvvispy.dataset.LazyData` class for
+        details.
+
+        Default: None
+
+        .. versionadded:: 0.2
+
+    """
+
+    def __init__(self, source=None):
+        super().__init__(source=source)
+        self.version = '1'
+        self.cache = None
+        self.eviction_policy = None
+        self._metadata = dict()
+        self._contents = dict()
+
+    @staticmethod
+    def probe(header=b''):
+        """Check whether the importer can import a file, given its header.
+
+        Used by the :class:`uvvispy.io.factory.ImporterRegistry` to decide
+        about the importer for a file without trying to import it.
+        Importers should override this method and check for magic strings
+        or the structure of the first lines of a file.
+
+        Parameters
+        ----------
+        header : :class:`bytes`
+            First bytes of the file (usually, 512 bytes)
+
+        Returns
+        -------
+        result : :class:`bool`
+            Whether the file can be imported by the importer
+
+        .. versionadded:: 0.2
+
+        """
+        # pylint: disable=unused-argument
+        return True
+
+    def import_into(self, dataset=None):
+        """Perform the actual import into the given dataset.
+
+        If a cache is set, the dataset is retrieved from the cache if
+        possible, and stored in the cache otherwise. For details of the
+        import, see the documentation of the base class.
+
+        Parameters
+        ----------
+        dataset : :class:`aspecd.dataset.Dataset`
+            Dataset to import data and metadata into
+
+        Raises
+        ------
+        aspecd.exceptions.MissingDatasetError
+            Raised if no dataset is provided
+
+        """
+        if not dataset:
+            if not self.dataset:
+                raise aspecd.exceptions.MissingDatasetError(
+                    "No dataset provided")
+            dataset = self.dataset
+        # pylint: disable=protected-access
+        self._copy_for_import()._import_into(dataset)
+        self.dataset = dataset
+
+    def import_metadata_into(self, dataset=None):
+        """Import only the metadata into the given dataset.
+
+        Reading the metadata is usually much faster than importing the
+        numerical data as well, hence useful for, *e.g.*, cataloguing
+        datasets.
+
+        Parameters
+        ----------
+        dataset : :class:`aspecd.dataset.Dataset`
+            Dataset to import metadata into
+
+        .. versionadded:: 0.2
+
+        """
+        importer = self._copy_for_import()
+        importer.dataset = dataset
+        # pylint: disable=protected-access
+        importer._read_metadata()
+        self.dataset = dataset
+
+    def import_data_into(self, dataset=None):
+        """Import only the numerical data into the given dataset.
+
+        Used to load the data of datasets imported lazily (see
+        :class:`uvvispy.dataset.LazyData`). Importers should override
+        :meth:`_import_data` if reading the numerical data alone is
+        cheaper than the full import.
+
+        Parameters
+        ----------
+        dataset : :class:`aspecd.dataset.Dataset`
+            Dataset to import data into
+
+        .. versionadded:: 0.2
+
+        """
+        importer = self._copy_for_import()
+        importer.dataset = dataset
+        # pylint: disable=protected-access
+        importer._import_data()
+        self.dataset = dataset
+
+    async def import_into_async(self, dataset=None, reader=None,
+                                executor=None):
+        """Perform the actual import into the given dataset asynchronously.
+
+        The source and the metadata file are read at the same time using
+        the reader, and the contents parsed in the executor afterwards.
+        Hence, importing several datasets concurrently (*e.g.*, using
+        :func:`asyncio.gather`) overlaps waiting for the storage. For
+        everything else, see :meth:`import_into`.
+
+        Parameters
+        ----------
+        dataset : :class:`aspecd.dataset.Dataset`
+            Dataset to import data and metadata into
+
+        reader : :class:`uvvispy.io.reader.FileReader`
+            Reader used for reading the files
+
+            Default: a new :class:`uvvispy.io.reader.FileReader`
+
+        executor : :class:`concurrent.futures.Executor`
+            Executor used for parsing the contents
+
+            Default: None (the default executor of the event loop)
+
+        Raises
+        ------
+        aspecd.exceptions.MissingDatasetError
+            Raised if no dataset is provided
+
+        .. versionadded:: 0.2
+
+        """
+        if not dataset:
+            if not self.dataset:
+                raise aspecd.exceptions.MissingDatasetError(
+                    "No dataset provided")
+            dataset = self.dataset
+        reader = reader or FileReader()
+        importer = self._copy_for_import()
+        # pylint: disable=protected-access
+        filenames = importer._files_to_read()
+        importer._contents = dict(zip(filenames,
+                                      await reader.read_all(filenames)))
+        await asyncio.get_event_loop().run_in_executor(
+            executor, importer._import_into, dataset)
+        self.dataset = dataset
+
+    def metadata_filename(self):
+        """Return the name of the metadata file accompanying the source.
+
+        Returns
+        -------
+        filename : :class:`str`
+            Name of the metadata file, regardless of whether it exists
+
+        .. versionadded:: 0.2
+
+        """
+        return os.path.splitext(self.source)[0] + '.yaml'
+
+    def _copy_for_import(self):
+        """Return a copy of the importer with its own state for one import.
+
+        Public attributes are shared with the importer, except for the
+        parameters, private attributes are reset to their initial values.
+        """
+        importer = copy.copy(self)
+        for name, value in vars(self.__class__()).items():
+            if name.startswith('_'):
+                setattr(importer, name, value)
+        importer.parameters = copy.deepcopy(self.parameters)
+        return importer
+
+    def _files_to_read(self):
+        """Return the names of the files read when importing."""
+        return [self.source, self.metadata_filename()]
+
+    def _open(self, filename):
+        """Return file object for reading, using contents read beforehand."""
+        if filename not in self._contents:
+            # pylint: disable=consider-using-with
+            return open(filename, 'rb')
+        if self._contents[filename] is None:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT),
+                                    filename)
+        return io.BytesIO(self._contents[filename])
+
+    def _exists(self, filename):
+        if filename in self._contents:
+            return self._contents[filename] is not None
+        return os.path.exists(filename)
+
+    def _map(self, filename):
+        """Return the contents of a file as (writeable) array of bytes."""
+        if filename not in self._contents:
+            return np.memmap(filename, dtype=np.uint8, mode='c')
+        with self._open(filename) as file:
+            return np.frombuffer(bytearray(file.read()), dtype=np.uint8)
+
+    def _import_into(self, dataset):
+        if not self.cache:
+            super().import_into(dataset=dataset)
+            return
+        key = self.cache.key(self)
+        if self.cache.retrieve(key, dataset):
+            self.dataset = dataset
+            # pylint: disable=protected-access
+            dataset._origdata = copy.deepcopy(dataset.data)
+            dataset.id = self.source
+            dataset.label = self.source
+        else:
+            super().import_into(dataset=dataset)
+            self.cache.store(key, dataset)
+
+    def _import(self):
+        self._read_metadata()
+
+    def _import_data(self):
+        self._import()
+
+    def _apply_storage_parameters(self):
+        """Convert data and axes according to the parameters of the import.
+
+        Takes care of the ``dtype`` parameter (data type of the data) and
+        the ``compact_axes`` parameter (store uniformly spaced axis values
+        as :class:`uvvispy.dataset.UniformAxis`), if present.
+        """
+        # Imported here, as uvvispy.dataset depends on this module
+        # pylint: disable=import-outside-toplevel
+        import uvvispy.dataset
+        dtype = self.parameters.get("dtype")
+        if dtype and self.dataset.data.data.dtype != dtype:
+            self.dataset.data.data = \
+                self.dataset.data.data.astype(dtype)
+        if self.parameters.get("compact_axes"):
+            axes = self.dataset.data.axes
+            for index in range(self.dataset.data.data.ndim):
+                axes[index] = uvvispy.dataset.UniformAxis.from_axis(
+                    axes[index])
+
+    def _read_metadata(self):
+        metadata_filename = self.metadata_filename()
+        if self._exists(metadata_filename):
+            self._import_metadata(metadata_filename)
+            self._map_metadata()
+            self._add_comment_as_annotation()
+        self.dataset.metadata.from_dict(self._metadata)
+
+    def _import_metadata(self, filename):
+        if filename in self._contents:
+            self._metadata = copy.deepcopy(
+                _parse_metadata_file(self._contents[filename]))
+            return
+        status = os.stat(filename)
+        self._metadata = copy.deepcopy(_read_metadata_file(
+            os.path.abspath(filename), status.st_mtime_ns, status.st_size))
+
+    def _map_metadata(self):
+        mapper = aspecd.metadata.MetadataMapper()
+        mapper.version = self._metadata["format"]["version"]
+        mapper.metadata = self._metadata
+        # Mappings are applied one by one, as renaming keys of optional
+        # blocks absent from the metadata file needs to be skipped.
+        for mapping in _get_metadata_mappings(mapper.version):
+            if mapping[1] == 'rename_key' and not _has_key(
+                    mapper.metadata, mapping[0], mapping[2][0]):
+                continue
+            mapper.mappings = [mapping]
+            mapper.map()
+        self._metadata = mapper.metadata
+
+    def _add_comment_as_annotation(self):
+        if "comment" in self._metadata:
+            annotation = aspecd.annotation.Comment()
+            annotation.comment = self._metadata["comment"]
+            self.dataset.annotate(annotation)
+
+
+class ShimadzuASCIIImporter(DatasetImporter):
+    # noinspection PyUnresolvedReferences
+    """
+    Importer for the Shimadzu UVProbe ASCII export file format.
+
+    Note that the Shimadzu UV Probe software originally writes a proprietary
+    binary file format that contains a lot of parameters. Unfortunately,
+    there seems no specification of this format available, and asking the
+    vendor for this was so far not successful. Nevertheless, these files
+    can be read using the :class:`uvvispy.io.spc.ShimadzuSPCImporter`. The
+    ASCII export format, however, is rather sparse in terms of additional
+    information, besides the numerical data. A typical file will start as
+    follows:
+
+    .. code-block::
+
+        "<filename_without_extension> - RawData"
+        "Wavelength nm."	"Abs."
+        300,00	0,322
+        301,00	0,310
+        302,00	0,289
+
+
+    The first two lines are obviously header lines, with the first line
+    starting with the filename excluding its extension, here represented by
+    ``<filename_without_extension>``. The second line contains sort of
+    information for the two columns with data. In this particular case,
+    the decimal separator is the *comma*, not the dot. Otherwise, it would
+    be fairly easy to just use the :class:`aspecd.io.TxtImporter`.
+
+    Files with more than one data column, *e.g.* from kinetic runs, result
+    in a 2D dataset, with one column per spectrum. The values of the second
+    axis are taken from the column labels in the last header line if these
+    are numbers, otherwise the columns are numbered consecutively.
+
+    Large files are read in chunks (see the ``chunk_size`` parameter)
+    into a preallocated array, hence the memory required is not much more
+    than that for the resulting dataset.
+
+    In lazy mode (see the ``lazy`` parameter), only the metadata and the
+    first and last lines of the data are read on import. The range of the
+    wavelength axis and the shape of the data are available from the
+    ``header`` attribute of the :class:`uvvispy.dataset.LazyData` object
+    set as data of the dataset, the data are read on first access.
+
+    .. note::
+        If an accompanying metadata file (with same basename and "yaml" as
+        extension) is present, its contents will be read automatically and
+        mapped to the dataset.
+
+    Attributes
+    ----------
+    parameters : :class:`dict`
+        Parameters controlling the import
+
+        skiprows : :class:`int`
+            Number of rows to skip in text file (*e.g.*, header lines)
+
+        chunk_size : :class:`int`
+            Size of the chunks (in bytes) larger files are read in
+
+            Default: 8 MiB
+
+            .. versionadded:: 0.2
+
+        lazy : :class:`bool`
+            Whether to read the data only on first access
+
+            Default: False
+
+            .. versionadded:: 0.2
+
+        dtype : :class:`str`
+            Data type of the data
+
+            As the absorbance values are written with three decimals,
+            "float32" is sufficient and halves the memory required.
+
+            Default: "float64"
+
+            .. versionadded:: 0.2
+
+        compact_axes : :class:`bool`
+            Whether to store uniformly spaced axis values compactly
+
+            See :class:`uvvispy.dataset.UniformAxis` for details.
+
+            Default: False
+
+            .. versionadded:: 0.2
+
+    """
+
+    def __init__(self, source=None):
+        super().__init__(source=source)
+        self.extension = '.txt'
+        self.parameters["skiprows"] = 2
+        self.parameters["chunk_size"] = 8 * 1024**2
+        self.parameters["lazy"] = False
+        self.parameters["dtype"] = "float64"
+        self.parameters["compact_axes"] = False
+        self._column_labels = []
+
+    @staticmethod
+    def probe(header=b''):
+        """Check whether the header is the header of a UVProbe ASCII file.
+
+        Checks for a quoted title line followed by a line of quoted
+        column labels.
+
+        Parameters
+        ----------
+        header : :class:`bytes`
+            First bytes of the file
+
+        Returns
+        -------
+        result : :class:`bool`
+            Whether the file can be imported by the importer
+
+        .. versionadded:: 0.2
+
+        """
+        return bool(re.match(rb'"[^"\r\n]*"\r?\n"[^"\r\n]*"\t"', header))
+
+    def _import(self):
+        self._read_metadata()
+        if self.parameters.get("lazy"):
+            self._set_lazy_data()
+        else:
+            self._import_data()
+
+    def _import_data(self):
+        self._read_data()
+        self._set_axes_description()
+        self._apply_storage_parameters()
+
+    def _set_lazy_data(self):
+        # Imported here, as uvvispy.dataset depends on this module
+        # pylint: disable=import-outside-toplevel
+        import uvvispy.dataset
+        parameters = copy.deepcopy(self.parameters)
+        parameters["lazy"] = False
+        data = uvvispy.dataset.LazyData(
+            importer=aspecd.utils.full_class_name(self),
+            source=self.source, parameters=parameters,
+            eviction_policy=self.eviction_policy)
+        data.header = self._read_header()
+        self.dataset.data = data
+
+    def _read_header(self):
+        """Read range of the first axis and shape of the data.
+
+        Only the first two and the last line of the data are read. As
+        UVProbe records with a constant sampling interval, the number of
+        points follows from the first two and the last wavelength.
+        """
+        with self._open(self.source) as file:
+            for _ in range(self.parameters["skiprows"]):
+                file.readline()
+            start = file.tell()
+            first = self._parse_line(file.readline())
+            second = self._parse_line(file.readline())
+            last = self._parse_line(self._read_last_line(file, start))
+        if not first:
+            return {'range': [], 'shape': (0,)}
+        points = 1
+        if second and second[0] != first[0]:
+            points = int(round((last[0] - first[0])
+                               / (second[0] - first[0]))) + 1
+        shape = (points,) if len(first) < 3 else (points, len(first) - 1)
+        return {'range': [first[0], last[0]], 'shape': shape}
+
+    @staticmethod
+    def _read_last_line(file, start):
+        size = file.seek(0, os.SEEK_END)
+        block_size = 4096
+        while True:
+            position = max(start, size - block_size)
+            file.seek(position)
+            lines = file.read().strip().splitlines()
+            if len(lines) > 1 or position == start:
+                return lines[-1] if lines else b''
+            block_size *= 2
+
+    @staticmethod
+    def _parse_line(line):
+        return [float(value.replace(b',', b'.')) for value in line.split()]
+
+    def _read_data(self):
+        header_line = b''
+        with self._open(self.source) as file:
+            for _ in range(self.parameters["skiprows"]):
+                header_line = file.readline()
+            start = file.tell()
+            size = file.seek(0, os.SEEK_END) - start
+            file.seek(start)
+            if size > self.parameters.get("chunk_size", size):
+                raw_data = self._read_data_in_chunks(file)
+            else:
+                raw_data = self._parse_data(file.read())
+        self._column_labels = self._get_column_labels(header_line)
+        if raw_data.shape[1] > 2:
+            self.dataset.data.data = raw_data[:, 1:]
+            self.dataset.data.axes[0].values = raw_data[:, 0]
+            self.dataset.data.axes[1].values = \
+                self._get_second_axis_values(raw_data.shape[1] - 1)
+        else:
+            self.dataset.data.axes[0].values = raw_data[:, 0]
+            self.dataset.data.data = raw_data[:, 1]
+
+    def _read_data_in_chunks(self, file):
+        """Read the data block of a file chunk-wise into a 2D array.
+
+        The number of lines is counted first, and the array for the data
+        preallocated. Afterwards, each chunk (cut at the last complete line)
+        is parsed and copied into the array, hence the memory required
+        is that for the array and the temporary arrays of one chunk.
+        """
+        chunk_size = self.parameters["chunk_size"]
+        start = file.tell()
+        n_rows = 0
+        chunk = b''
+        for chunk in iter(functools.partial(file.read, chunk_size), b''):
+            n_rows += chunk.count(b'\n')
+        if not chunk.endswith(b'\n'):
+            n_rows += 1
+        file.seek(start)
+        n_columns = len(file.readline().split())
+        file.seek(start)
+        data = np.empty((n_rows, n_columns))
+        row = 0
+        remainder = b''
+        for chunk in iter(functools.partial(file.read, chunk_size), b''):
+            chunk = remainder + chunk
+            end = chunk.rfind(b'\n') + 1
+            remainder = chunk[end:]
+            row += self._parse_chunk(chunk[:end], data[row:])
+        row += self._parse_chunk(remainder, data[row:])
+        return data[:row]
+
+    def _parse_chunk(self, chunk, data):
+        if not chunk.strip():
+            return 0
+        values = self._parse_data(chunk)
+        data[:values.shape[0]] = values
+        return values.shape[0]
+
+    @staticmethod
+    def _get_column_labels(header_line):
+        labels = header_line.decode(errors='replace').strip().split('\t')
+        return [label.strip('"') for label in labels]
+
+    def _get_second_axis_values(self, n_columns):
+        try:
+            values = [float(label.replace(',', '.'))
+                      for label in self._column_labels[1:]]
+        except ValueError:
+            values = []
+        if len(values) != n_columns:
+            values = np.arange(n_columns)
+        return np.asarray(values, dtype=float)
+
+    def _parse_data(self, contents):
+        """Parse the data block of a file into a 2D array.
+
+        UVProbe writes fixed-point numbers with a constant number of
+        decimals per column. Hence, the decimal commas are dropped and the
+        remaining digits parsed as integer mantissae in one go, which is
+        much faster than parsing floats. As both, mantissa and power of
+        ten, are exactly representable, their (correctly rounded) quotient
+        is bit-identical to the result of parsing the original number as
+        float.
+
+        The layout is verified using the positions of the decimal commas
+        only. Anything not fitting (different number of decimals, missing
+        commas, exponents, ragged lines) is handed over to the generic,
+        but slower :meth:`_parse_data_with_loadtxt`.
+
+        Parameters
+        ----------
+        contents : :class:`bytes`
+            Data block of the file, *i.e.* without header lines
+
+        Returns
+        -------
+        data : :class:`numpy.ndarray`
+            2D array with one column per column in the file
+
+        """
+        decimals = self._get_decimals(contents)
+        if not decimals:
+            return self._parse_data_with_loadtxt(contents)
+        if not contents.endswith(b'\n'):
+            contents += b'\n'
+        chars = np.frombuffer(contents, dtype=np.uint8)
+        separators = np.flatnonzero(chars == ord(','))
+        digits = contents.translate(None, b',')
+        if not self._is_integer_list(digits):
+            return self._parse_data_with_loadtxt(contents)
+        mantissae = np.fromstring(digits, dtype=np.int64, sep=' ')
+        if mantissae.size != separators.size \
+                or separators.size % len(decimals) \
+                or np.abs(mantissae).max() >= 2**53:
+            return self._parse_data_with_loadtxt(contents)
+        separators = separators.reshape(-1, len(decimals))
+        if not self._has_fixed_point_layout(chars, separators, decimals):
+            return self._parse_data_with_loadtxt(contents)
+        data = mantissae.reshape(separators.shape) \
+            / 10. ** np.asarray(decimals)
+        if b'-' in contents:
+            signed = np.searchsorted(separators.ravel(),
+                                     np.flatnonzero(chars == ord('-')))
+            data.flat[signed] = np.copysign(data.flat[signed], -1.)
+        return data
+
+    @staticmethod
+    def _get_decimals(contents):
+        decimals = []
+        contents = contents.lstrip()
+        end_of_line = contents.find(b'\n')
+        if end_of_line >= 0:
+            contents = contents[:end_of_line]
+        for token in contents.split():
+            if token.count(b',') != 1 or token.endswith(b','):
+                return []
+            decimals.append(len(token) - token.index(b',') - 1)
+        return decimals
+
+    @staticmethod
+    def _is_integer_list(contents):
+        """Check whether contents are whitespace-separated integers only.
+
+        Only digits, whitespace, and minus signs directly preceding digits
+        at the start of a number are allowed. Hence, :func:`numpy.fromstring`
+        parses the contents to their end.
+        """
+        if contents.translate(None, b'0123456789- \t\r\n'):
+            return False
+        # Appended line break precedes a sign at the start (index -1)
+        chars = np.frombuffer(contents + b'\n', dtype=np.uint8)
+        signs = np.flatnonzero(chars == ord('-'))
+        following = chars[signs + 1]
+        return bool(np.all((following >= ord('0')) & (following <= ord('9')))
+                    and np.all(np.isin(chars[signs - 1], list(b' \t\r\n'))))
+
+    @staticmethod
+    def _has_fixed_point_layout(chars, separators, decimals):
+        """Check the layout of the data block using the separators only.
+
+        Each separator needs to be followed by exactly as many digits as
+        decimals expected for its column and afterwards by whitespace,
+        *i.e.* a line break for the last column and a blank or tab for all
+        other columns. To this end, the characters following each
+        separator are classified and compared to the expected classes.
+        """
+        char_classes = np.zeros(256, dtype=np.uint8)
+        char_classes[ord('0'):ord('9') + 1] = 1
+        char_classes[[ord('\t'), ord(' ')]] = 2
+        char_classes[[ord('\n'), ord('\r')]] = 3
+        decimals = np.asarray(decimals)[:, np.newaxis]
+        offsets = np.minimum(np.arange(1, decimals.max() + 2), decimals + 1)
+        expected = np.where(offsets <= decimals, 1, 2)
+        expected[-1, offsets[-1] > decimals[-1]] = 3
+        positions = separators.T[:, np.newaxis, :] + offsets[..., np.newaxis]
+        classes = char_classes.take(chars.take(positions, mode='clip'))
+        return bool(np.all(classes == expected[..., np.newaxis]))
+
+    @staticmethod
+    def _parse_data_with_loadtxt(contents):
+        contents = contents.decode().replace(',', '.')
+        # noinspection PyTypeChecker
+        return np.loadtxt(io.StringIO(contents), ndmin=2)
+
+    def _set_axes_description(self):
+        self.dataset.data.axes[0].quantity = "wavelength"
+        self.dataset.data.axes[0].unit = "nm"
+        self.dataset.data.axes[-1].quantity = "absorbance"
+        self.dataset.data.axes[-1].unit = ""
+
+
+class SeriesImporter(DatasetImporter):
+    """
+    Importer for a series of 1D datasets, stacked into a single 2D dataset.
+
+    Series of measurements, *e.g.* at different temperatures, are usually
+    stored in one file per measurement, such as ``sa281-02-280K.txt``,
+    ``sa281-02-285K.txt``, and so on. Processing these datasets one by one
+    is much slower than processing a single 2D dataset, hence the
+    importer takes a glob pattern as source, imports all matching files
+    (in parallel, see :meth:`uvvispy.dataset.DatasetFactory.get_datasets`)
+    and stacks their data column-wise into one contiguous array. The
+    first axis is that of the individual datasets, the second axis that of
+    the series, sorted by the values of the second axis.
+
+    The values of the second axis are taken either from the filenames,
+    using a regular expression, or from the metadata of each dataset,
+    usually read from the accompanying metadata file. If neither is given,
+    the datasets are numbered consecutively, in the order of their
+    filenames.
+
+    The metadata of the resulting dataset are those of the first dataset
+    of the series.
+
+    As the importer is not chosen automatically, provide its name
+    explicitly when importing datasets in a recipe:
+
+    .. code-block:: yaml
+
+        datasets:
+          - source: data/sa281-02-*K.txt
+            importer: SeriesImporter
+            importer_parameters:
+              axis_value_pattern: '-(\\d+)K'
+              axis_quantity: temperature
+              axis_unit: K
+
+    If a cache is set, the individual datasets are cached, not the
+    resulting dataset.
+
+    Attributes
+    ----------
+    parameters : :class:`dict`
+        Parameters controlling the import
+
+        axis_value_pattern : :class:`str`
+            Regular expression applied to the filename (without directory)
+
+            The first group needs to match the value of the second axis.
+
+        axis_value_metadata : :class:`str`
+            Metadata key containing the value of the second axis
+
+            Levels of the metadata hierarchy are separated by dots, *e.g.*
+            ``temperature_control.temperature``. Quantity and unit of the
+            axis default to the name of the key and the unit of the value,
+            respectively.
+
+        axis_quantity : :class:`str`
+            Quantity of the second axis
+
+        axis_unit : :class:`str`
+            Unit of the second axis
+
+        processes : :class:`int`
+            Number of processes used for importing the datasets
+
+            Defaults to the number of processors of the machine.
+
+    Raises
+    ------
+    FileNotFoundError
+        Raised if no files match the source
+
+    ValueError
+        Raised if the datasets do not share the same axis or are not 1D
+
+    .. versionadded:: 0.2
+
+    """
+
+    def __init__(self, source=None):
+        super().__init__(source=source)
+        self.parameters["axis_value_pattern"] = ''
+        self.parameters["axis_value_metadata"] = ''
+        self.parameters["axis_quantity"] = ''
+        self.parameters["axis_unit"] = ''
+        self.parameters["processes"] = None
+        self._datasets = []
+
+    def _files_to_read(self):
+        # The source is a directory or pattern, the datasets are read
+        # by their own importers.
+        return []
+
+    def _import_into(self, dataset):
+        # Hand over the cache to the importers of the individual datasets
+        # rather than caching the series as a whole.
+        aspecd.io.DatasetImporter.import_into(self, dataset=dataset)
+
+    def _import(self):
+        self._import_datasets()
+        self._check_datasets()
+        axis_values = self._get_axis_values()
+        order = np.argsort(axis_values, kind='stable')
+        data = np.empty((self._datasets[0].data.data.size,
+                         len(self._datasets)))
+        for column, index in enumerate(order):
+            data[:, column] = self._datasets[index].data.data
+        first_dataset = self._datasets[order[0]]
+        self.dataset.data.data = data
+        self.dataset.data.axes[0] = copy.deepcopy(first_dataset.data.axes[0])
+        self.dataset.data.axes[1].values = axis_values[order]
+        self.dataset.data.axes[2] = copy.deepcopy(first_dataset.data.axes[1])
+        self.dataset.metadata = first_dataset.metadata
+        self._set_axis_description()
+        self._datasets = []
+
+    def _import_datasets(self):
+        # Imported here, as uvvispy.dataset depends on this module
+        # pylint: disable=import-outside-toplevel
+        import uvvispy.dataset
+        factory = uvvispy.dataset.DatasetFactory()
+        factory.importer_factory.cache = self.cache
+        self._datasets = factory.get_datasets(
+            source=self.source, processes=self.parameters.get("processes"))
+        if factory.errors:
+            raise next(iter(factory.errors.values()))
+        if not self._datasets:
+            raise FileNotFoundError('No files matching %s' % self.source)
+
+    def _get_axis_values(self):
+        if self.parameters.get("axis_value_pattern"):
+            values = [self._get_axis_value_from_filename(dataset_.id)
+                      for dataset_ in self._datasets]
+        elif self.parameters.get("axis_value_metadata"):
+            values = [self._get_axis_value_from_metadata(dataset_)
+                      for dataset_ in self._datasets]
+        else:
+            values = range(len(self._datasets))
+        return np.asarray(values, dtype=float)
+
+    def _get_axis_value_from_filename(self, filename):
+        match = re.search(self.parameters["axis_value_pattern"],
+                          os.path.basename(filename))
+        if not match:
+            raise ValueError('No axis value found in filename %s' % filename)
+        return float(match.group(1).replace(',', '.'))
+
+    def _get_axis_value_from_metadata(self, dataset):
+        value = self._get_metadata_value(dataset.metadata)
+        if isinstance(value, aspecd.metadata.PhysicalQuantity):
+            value = value.value
+        return float(value)
+
+    def _get_metadata_value(self, metadata):
+        value = metadata
+        for key in self.parameters["axis_value_metadata"].split('.'):
+            value = getattr(value, key)
+        return value
+
+    def _check_datasets(self):
+        axis_values = self._datasets[0].data.axes[0].values
+        for dataset_ in self._datasets:
+            if dataset_.data.data.ndim != 1:
+                raise ValueError('Dataset %s is not 1D' % dataset_.id)
+            if not np.array_equal(dataset_.data.axes[0].values,
+                                  axis_values):
+                raise ValueError('Axis of dataset %s differs' % dataset_.id)
+
+    def _set_axis_description(self):
+        axis = self.dataset.data.axes[1]
+        key = self.parameters.get("axis_value_metadata")
+        if key and not self.parameters.get("axis_value_pattern"):
+            axis.quantity = key.split('.')[-1].replace('_', ' ')
+            value = self._get_metadata_value(self.dataset.metadata)
+            if isinstance(value, aspecd.metadata.PhysicalQuantity):
+                axis.unit = value.unit
+        if self.parameters.get("axis_quantity"):
+            axis.quantity = self.parameters["axis_quantity"]
+        if self.parameters.get("axis_unit"):
+            axis.unit = self.parameters["axis_unit"]
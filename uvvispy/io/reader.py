@@ -0,0 +1,117 @@
+"""
+Reading files asynchronously.
+
+For data residing on storage with high latency, such as network shares,
+datasets can be imported asynchronously, reading several files at the same
+time (see :class:`uvvispy.io.reader.FileReader` and
+:meth:`uvvispy.dataset.DatasetFactory.get_dataset_async`).
+
+"""
+import asyncio
+import weakref
+
+
+class FileReader:
+    """
+    Reader for the contents of files, used for importing asynchronously.
+
+    Files are read in an executor, hence several files can be read at the
+    same time, while the event loop is free to do other work. This pays
+    off for storage with high latency, such as network shares. To not
+    overload the storage, the number of files read at the same time is
+    limited.
+
+    To read from other kinds of storage, override :meth:`_read`, which is
+    called in the executor and may block.
+
+    Attributes
+    ----------
+    max_concurrency : :class:`int`
+        Maximum number of files read at the same time
+
+        Default: 8
+
+    executor : :class:`concurrent.futures.Executor`
+        Executor used for reading the files
+
+        Should be a thread pool with at least :attr:`max_concurrency`
+        threads.
+
+        Default: None (the default executor of the event loop)
+
+    Examples
+    --------
+    Usually, the reader is handed over to the dataset factory, importing
+    several datasets at the same time:
+
+    .. code-block::
+
+        async def import_datasets(sources):
+            factory = uvvispy.dataset.DatasetFactory()
+            reader = uvvispy.io.FileReader()
+            return await asyncio.gather(*[
+                factory.get_dataset_async(source=source, reader=reader)
+                for source in sources])
+
+        loop = asyncio.new_event_loop()
+        datasets = loop.run_until_complete(import_datasets(sources))
+        loop.close()
+
+
+    .. versionadded:: 0.2
+
+    """
+
+    def __init__(self):
+        self.max_concurrency = 8
+        self.executor = None
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    async def read(self, filename=''):
+        """Return the contents of a file.
+
+        Parameters
+        ----------
+        filename : :class:`str`
+            Name of the file to read
+
+        Returns
+        -------
+        contents : :class:`bytes`
+            Contents of the file
+
+            None if the file does not exist (or is a directory)
+
+        """
+        loop = asyncio.get_event_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphores[loop]:
+            return await loop.run_in_executor(self.executor, self._read,
+                                              filename)
+
+    async def read_all(self, filenames=None):
+        """Return the contents of several files, read at the same time.
+
+        Parameters
+        ----------
+        filenames : :class:`list`
+            Names of the files to read
+
+        Returns
+        -------
+        contents : :class:`list`
+            Contents of the files, in the order of the filenames
+
+            None for each file that does not exist
+
+        """
+        return list(await asyncio.gather(
+            *[self.read(filename) for filename in filenames or []]))
+
+    def _read(self, filename):  # pylint: disable=no-self-use
+        try:
+            with open(filename, 'rb') as file:
+                return file.read()
+        except (FileNotFoundError, IsADirectoryError):
+            return None
@@ -0,0 +1,355 @@
+"""
+Importer for the binary file format of the Shimadzu UVProbe software (SPC).
+
+SPC files are OLE2 compound documents, *i.e.* a small file system within a
+file. Only as much of this format is implemented as necessary for reading
+the data and measurement parameters stored by the UVProbe software.
+
+"""
+import struct
+
+import numpy as np
+
+from uvvispy.io.importer import DatasetImporter
+
+
+class ShimadzuSPCImporter(DatasetImporter):
+    """
+    Importer for the Shimadzu UVProbe binary file format (SPC).
+
+    The UVProbe software stores its data in OLE2 compound documents,
+    *i.e.* a small file system within a file, with storages (directories)
+    and streams (files). While there is no specification of the actual
+    contents available, the relevant parts are easy to spot:
+
+    .. code-block::
+
+        DataStorage1/DataSetGroup/DataSet1/
+            DataSpectrumStorage/Data/X Data.1
+            DataSpectrumStorage/Data/Y Data.1
+            MethodStorage/PageTexts0
+            ...
+
+    The two data streams contain the axis values and the data as
+    little-endian double-precision floats, ordered with *decreasing*
+    wavelength. The file is memory-mapped, and the arrays of the dataset
+    are (reversed) views on the mapped data streams as long as these are
+    stored contiguously, hence no copying is involved. The file is mapped
+    copy-on-write, *i.e.* modifying the data will never alter the file.
+
+    The ``PageTexts`` streams contain the measurement parameters as shown
+    by the UVProbe software in its "Method" dialogue. Those parameters
+    not contained in the ASCII export format are mapped to the metadata:
+
+    ==============================  ===========================================
+    Parameter                       Metadata
+    ==============================  ===========================================
+    Scan Speed                      experiment.scan_speed
+    Sampling Interval               experiment.sampling_interval
+    Scan Mode                       experiment.scan_mode
+    Slit Width                      spectrometer.slit_width
+    Light Source Change Wavelength  spectrometer.light_source_change_wavelength
+    ==============================  ===========================================
+
+    Furthermore, the measuring mode ("Absorbance", "Transmittance",
+    "Reflectance") is used to set the quantity of the second axis.
+
+    As parameters contained in the raw data are usually more reliable than
+    those in the (manually written) metadata file, they take precedence.
+
+    .. note::
+        If an accompanying metadata file (with same basename and "yaml" as
+        extension) is present, its contents will be read automatically and
+        mapped to the dataset.
+
+    Attributes
+    ----------
+    parameters : :class:`dict`
+        Parameters controlling the import
+
+        dtype : :class:`str`
+            Data type of the data
+
+            Setting a data type other than "float64" results in a copy of
+            the data.
+
+            Default: "float64"
+
+        compact_axes : :class:`bool`
+            Whether to store uniformly spaced axis values compactly
+
+            See :class:`uvvispy.dataset.UniformAxis` for details.
+
+            Default: False
+
+    .. versionadded:: 0.2
+
+    """
+
+    def __init__(self, source=None):
+        super().__init__(source=source)
+        self.extension = '.spc'
+        self.parameters["dtype"] = "float64"
+        self.parameters["compact_axes"] = False
+        self._document = None
+        self._measurement_parameters = dict()
+        self._dataset_path = 'DataStorage1/DataSetGroup/DataSet1'
+
+    @staticmethod
+    def probe(header=b''):
+        """Check whether the header is the header of a compound document.
+
+        Parameters
+        ----------
+        header : :class:`bytes`
+            First bytes of the file
+
+        Returns
+        -------
+        result : :class:`bool`
+            Whether the file can be imported by the importer
+
+        """
+        return header.startswith(_CompoundDocument.signature)
+
+    def _import(self):
+        self._read_metadata()
+        self._document = _CompoundDocument(filename=self.source,
+                                           buffer=self._map(self.source))
+        self._read_data()
+        self._read_measurement_parameters()
+        self._map_measurement_parameters()
+        self._set_axes_description()
+        self._apply_storage_parameters()
+
+    def _read_data(self):
+        data_path = '/'.join([self._dataset_path, 'DataSpectrumStorage/Data'])
+        x_data = self._document.read('/'.join([data_path, 'X Data.1']))
+        y_data = self._document.read('/'.join([data_path, 'Y Data.1']))
+        self.dataset.data.data = y_data.view('<f8')[::-1]
+        self.dataset.data.axes[0].values = x_data.view('<f8')[::-1]
+
+    def _read_measurement_parameters(self):
+        method_path = '/'.join([self._dataset_path, 'MethodStorage'])
+        for path in self._document.streams:
+            if path.startswith(method_path + '/PageTexts'):
+                self._measurement_parameters.update(
+                    self._parse_page_texts(self._document.read(path)))
+
+    @staticmethod
+    def _parse_page_texts(contents):
+        """Parse the key-value pairs of a page of the "Method" dialogue.
+
+        A page consists of two (unknown) 32-bit integers, the title of the
+        page, the number of entries as 32-bit integer, and the entries as
+        pairs of key and value. All strings are preceded by a byte
+        containing their length.
+        """
+        contents = contents.tobytes()
+
+        def read_string(position_):
+            length = contents[position_]
+            string = contents[position_ + 1:position_ + 1 + length]
+            return string.decode('cp1252'), position_ + 1 + length
+
+        _, position = read_string(8)
+        n_entries = struct.unpack_from('<I', contents, position)[0]
+        position += 4
+        parameters = dict()
+        for _ in range(n_entries):
+            key, position = read_string(position)
+            value, position = read_string(position)
+            parameters[key.rstrip(':')] = value
+        return parameters
+
+    def _map_measurement_parameters(self):
+        parameters = self._measurement_parameters
+        experiment = dict()
+        if "Scan Speed" in parameters:
+            experiment["scan speed"] = parameters["Scan Speed"]
+        if "Sampling Interval" in parameters:
+            experiment["sampling interval"] = \
+                parameters["Sampling Interval"].replace(',', '.') + ' nm'
+        if "Scan Mode" in parameters:
+            experiment["scan mode"] = parameters["Scan Mode"]
+        spectrometer = dict()
+        for key in ["Slit Width", "Light Source Change Wavelength"]:
+            if parameters.get(key):
+                spectrometer[key.lower()] = parameters[key].replace(',', '.')
+        if spectrometer or experiment:
+            spectrometer["manufacturer"] = "Shimadzu"
+        self.dataset.metadata.experiment.from_dict(experiment)
+        self.dataset.metadata.spectrometer.from_dict(spectrometer)
+
+    def _set_axes_description(self):
+        self.dataset.data.axes[0].quantity = "wavelength"
+        self.dataset.data.axes[0].unit = "nm"
+        measuring_mode = self._measurement_parameters.get("Measuring Mode",
+                                                          "Absorbance")
+        if measuring_mode in ("Transmittance", "Reflectance"):
+            self.dataset.data.axes[1].quantity = measuring_mode.lower()
+            self.dataset.data.axes[1].unit = "%"
+        else:
+            self.dataset.data.axes[1].quantity = "absorbance"
+            self.dataset.data.axes[1].unit = ""
+
+
+class _CompoundDocument:
+    """
+    Read-only access to the streams of an OLE2 compound document.
+
+    Only as much of the format is implemented as necessary to locate and
+    read streams. The file is memory-mapped (copy-on-write), and streams
+    stored in consecutive sectors are returned as views on the map,
+    *i.e.* without copying. Only streams below the size limit for the
+    "mini stream" (usually 4096 bytes) or spread over the file are copied.
+
+    Parameters
+    ----------
+    filename : :class:`str`
+        Name of the file to read
+
+    buffer : :class:`numpy.ndarray`
+        Contents of the file (as bytes), if already read
+
+        If given, the file is not mapped.
+
+    Attributes
+    ----------
+    streams : :class:`dict`
+        Start sector and size of each stream, with the full path of the
+        stream (separated by slashes) as key
+
+    Raises
+    ------
+    ValueError
+        Raised if the file is not a compound document or is corrupt
+
+    """
+
+    signature = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+    max_regular_sector = 0xFFFFFFFA
+
+    def __init__(self, filename='', buffer=None):
+        self.streams = dict()
+        if buffer is None:
+            buffer = np.memmap(filename, dtype=np.uint8, mode='c')
+        self._map = buffer
+        header = self._map[:512].tobytes()
+        if not header.startswith(self.signature):
+            raise ValueError('Not a compound document: %s' % filename)
+        self._sector_size = 1 << struct.unpack_from('<H', header, 0x1E)[0]
+        self._mini_sector_size = \
+            1 << struct.unpack_from('<H', header, 0x20)[0]
+        (n_fat_sectors, first_directory_sector) = \
+            struct.unpack_from('<2I', header, 0x2C)
+        (self._mini_stream_cutoff, first_mini_fat_sector, n_mini_fat_sectors,
+         first_difat_sector) = struct.unpack_from('<4I', header, 0x38)
+        if struct.unpack_from('<H', header, 0x1A)[0] == 3:
+            self._size_mask = 0xFFFFFFFF
+        else:
+            self._size_mask = 0xFFFFFFFFFFFFFFFF
+        self._fat = self._read_fat(header, n_fat_sectors, first_difat_sector)
+        directory = self._read_chain(first_directory_sector)
+        self._read_directory(directory)
+        self._mini_fat = np.zeros(0, dtype='<u4')
+        if n_mini_fat_sectors:
+            self._mini_fat = self._read_chain(first_mini_fat_sector).view(
+                '<u4')
+        self._mini_stream = None
+
+    def read(self, path=''):
+        """
+        Return the contents of a stream.
+
+        Parameters
+        ----------
+        path : :class:`str`
+            Full path of the stream, with storages separated by slashes
+
+        Returns
+        -------
+        contents : :class:`numpy.ndarray`
+            Contents of the stream as array of bytes (uint8)
+
+        """
+        start, size = self.streams[path]
+        if size < self._mini_stream_cutoff:
+            if self._mini_stream is None:
+                self._mini_stream = self._read_chain(self._root_start)
+            return self._read_chain(start, size=size, fat=self._mini_fat,
+                                    storage=self._mini_stream,
+                                    sector_size=self._mini_sector_size,
+                                    offset=0)
+        return self._read_chain(start, size=size)
+
+    def _sector(self, sector):
+        start = (sector + 1) * self._sector_size
+        return self._map[start:start + self._sector_size]
+
+    def _read_fat(self, header, n_fat_sectors, difat_sector):
+        fat_sectors = list(struct.unpack_from('<109I', header, 0x4C))
+        n_sectors = len(self._map) // self._sector_size
+        while difat_sector < self.max_regular_sector:
+            if len(fat_sectors) > 109 + n_sectors * self._sector_size // 4:
+                raise ValueError('Corrupt compound document: cyclic DIFAT')
+            difat = self._sector(difat_sector).view('<u4')
+            fat_sectors.extend(difat[:-1])
+            difat_sector = difat[-1]
+        return np.concatenate([self._sector(sector) for sector in
+                               fat_sectors[:n_fat_sectors]]).view('<u4')
+
+    def _read_chain(self, start, size=None, fat=None, storage=None,
+                    sector_size=None, offset=1):
+        if fat is None:
+            fat = self._fat
+        if storage is None:
+            storage = self._map
+        if sector_size is None:
+            sector_size = self._sector_size
+        chain = []
+        sector = start
+        while sector < self.max_regular_sector:
+            if sector >= len(fat) or len(chain) >= len(fat):
+                raise ValueError('Corrupt compound document: invalid or '
+                                 'cyclic chain of sectors')
+            chain.append(sector)
+            sector = int(fat[sector])
+        if size is None:
+            size = len(chain) * sector_size
+        if not chain:
+            return np.zeros(0, dtype=np.uint8)
+        if np.all(np.diff(chain) == 1):
+            begin = (chain[0] + offset) * sector_size
+            return np.asarray(storage[begin:begin + size])
+        contents = np.concatenate([
+            storage[(sector + offset) * sector_size:
+                    (sector + offset + 1) * sector_size]
+            for sector in chain])
+        return contents[:size]
+
+    def _read_directory(self, directory):
+        entries = []
+        for index in range(len(directory) // 128):
+            entry = directory[index * 128:(index + 1) * 128].tobytes()
+            name_length = struct.unpack_from('<H', entry, 64)[0]
+            name = entry[:max(name_length - 2, 0)].decode('utf-16-le')
+            left, right, child = struct.unpack_from('<3I', entry, 68)
+            start, size = struct.unpack_from('<IQ', entry, 116)
+            entries.append((name, entry[66], left, right, child, start,
+                            size & self._size_mask))
+        self._root_start = entries[0][5]
+        stack = [(entries[0][4], '')]
+        visited = set()
+        while stack:
+            index, path = stack.pop()
+            if index >= self.max_regular_sector or index >= len(entries) \
+                    or index in visited:
+                continue
+            visited.add(index)
+            name, kind, left, right, child, start, size = entries[index]
+            stack.extend([(left, path), (right, path)])
+            if kind == 1:
+                stack.append((child, path + name + '/'))
+            elif kind == 2:
+                self.streams[path + name] = (start, size)
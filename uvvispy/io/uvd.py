@@ -0,0 +1,210 @@
+"""
+UVVisPy dataset format (UVD).
+
+Datasets, including their metadata and history, can be stored in and
+retrieved from a native binary format using the
+:class:`uvvispy.io.uvd.UvdExporter` and :class:`uvvispy.io.uvd.UvdImporter`
+classes, respectively. This allows for storing preprocessed datasets and
+using them in recipes.
+
+"""
+import json
+import os
+import struct
+
+import aspecd.exceptions
+import aspecd.io
+import numpy as np
+
+from uvvispy.io.importer import DatasetImporter
+
+_UVD_MAGIC = b'\x93UVVISPY'
+
+
+class UvdExporter(aspecd.io.DatasetExporter):
+    """
+    Dataset exporter for exporting to the UVVisPy dataset format (UVD).
+
+    The UVVisPy dataset format stores a dataset with all its data,
+    metadata, annotations and history in a single binary file that can be
+    read fast. Its layout is as follows:
+
+    ======  ========  =====================================================
+    Offset  Type      Contents
+    ======  ========  =====================================================
+    0       8 bytes   Magic string ``\\x93UVVISPY``
+    8       uint32    Version of the file format
+    12      uint64    Length of the header in bytes
+    20      UTF-8     Header: dataset as JSON
+    ...     bytes     Arrays, each aligned to 64 bytes
+    ======  ========  =====================================================
+
+    All integers are little-endian. The header is the dictionary
+    representation of the dataset (see
+    :meth:`aspecd.dataset.Dataset.to_dict`), with each NumPy array
+    replaced by a dict ``{"__array__": <index>}``, and an additional list
+    describing the arrays with dtype, shape and offset. Offsets are
+    relative to the start of the array section, *i.e.* the end of the
+    header padded to a multiple of 64 bytes. Arrays are stored
+    uncompressed in C order, hence they can be memory-mapped on import
+    (see :class:`UvdImporter`).
+
+    The original data of the dataset are not stored, as they are set from
+    the data upon import anyway.
+
+    .. versionadded:: 0.2
+
+    """
+
+    def __init__(self, target=None):
+        super().__init__(target=target)
+        self.extension = '.uvd'
+        self._magic = _UVD_MAGIC
+        self._version = 1
+        self._alignment = 64
+        self._arrays = []
+
+    def _export(self):
+        if not self.target:
+            raise aspecd.exceptions.MissingTargetError
+        self._arrays = []
+        dataset_dict = self.dataset.to_dict()
+        dataset_dict.pop('_origdata', None)
+        header = {
+            'dataset': self._replace_arrays(dataset_dict),
+            'arrays': self._describe_arrays(),
+        }
+        header = json.dumps(header).encode()
+        with open(self._sanitise_file_extension(self.target), 'wb') as file:
+            file.write(self._magic)
+            file.write(struct.pack('<IQ', self._version, len(header)))
+            file.write(header)
+            file.write(self._padding(file.tell()))
+            for array in self._arrays:
+                file.write(self._padding(file.tell()))
+                file.write(array.data)
+
+    def _sanitise_file_extension(self, target=None):
+        return "".join([os.path.splitext(target)[0], self.extension])
+
+    def _replace_arrays(self, object_):
+        if isinstance(object_, np.ndarray):
+            self._arrays.append(np.ascontiguousarray(object_))
+            return {'__array__': len(self._arrays) - 1}
+        if isinstance(object_, dict):
+            return {key: self._replace_arrays(value)
+                    for key, value in object_.items()}
+        if isinstance(object_, (list, tuple)):
+            return [self._replace_arrays(element) for element in object_]
+        return object_
+
+    def _describe_arrays(self):
+        descriptions = []
+        offset = 0
+        for array in self._arrays:
+            offset += -offset % self._alignment
+            descriptions.append({'dtype': array.dtype.str,
+                                 'shape': array.shape,
+                                 'offset': offset})
+            offset += array.nbytes
+        return descriptions
+
+    def _padding(self, position):
+        return bytes(-position % self._alignment)
+
+
+class UvdImporter(DatasetImporter):
+    """
+    Dataset importer for importing from the UVVisPy dataset format (UVD).
+
+    For a description of the file format, see the :class:`UvdExporter`
+    class.
+
+    The file is memory-mapped, and the arrays of the dataset are views on
+    the mapped file, hence only those parts of the file actually accessed
+    are read. The file is mapped copy-on-write, *i.e.* modifying the data
+    will never alter the file.
+
+    As the file contains all metadata of the dataset, an accompanying
+    metadata file is *not* read.
+
+    Raises
+    ------
+    ValueError
+        Raised if the file is not in UVD format or its version is not
+        supported
+
+    .. versionadded:: 0.2
+
+    """
+
+    def __init__(self, source=None):
+        super().__init__(source=source)
+        self.extension = '.uvd'
+        self._magic = _UVD_MAGIC
+        self._version = 1
+        self._alignment = 64
+        self._file = None
+        self._arrays_start = 0
+
+    @staticmethod
+    def probe(header=b''):
+        """Check whether the header is the header of a UVD file.
+
+        Parameters
+        ----------
+        header : :class:`bytes`
+            First bytes of the file
+
+        Returns
+        -------
+        result : :class:`bool`
+            Whether the file can be imported by the importer
+
+        """
+        return header.startswith(_UVD_MAGIC)
+
+    def _import(self):
+        self.source = "".join([os.path.splitext(self.source)[0],
+                               self.extension])
+        self._file = self._map(self.source)
+        header = self._read_header()
+        arrays = [self._read_array(description)
+                  for description in header['arrays']]
+        self.dataset.from_dict(self._insert_arrays(header['dataset'], arrays))
+
+    def _read_metadata(self):
+        self._file = self._map(self.source)
+        header = self._read_header()
+        self.dataset.metadata.from_dict(header['dataset']['metadata'])
+
+    def _read_header(self):
+        if bytes(self._file[:len(self._magic)]) != self._magic:
+            raise ValueError('%s is no UVD file' % self.source)
+        version, header_length = struct.unpack_from(
+            '<IQ', self._file, len(self._magic))
+        if version > self._version:
+            raise ValueError('Version %s of UVD format not supported'
+                             % version)
+        start = len(self._magic) + struct.calcsize('<IQ')
+        end = start + header_length
+        self._arrays_start = end + -end % self._alignment
+        return json.loads(bytes(self._file[start:end]))
+
+    def _read_array(self, description):
+        dtype = np.dtype(description['dtype'])
+        shape = tuple(description['shape'])
+        start = self._arrays_start + description['offset']
+        end = start + dtype.itemsize * int(np.prod(shape))
+        return self._file[start:end].view(dtype).reshape(shape)
+
+    def _insert_arrays(self, object_, arrays):
+        if isinstance(object_, dict):
+            if set(object_) == {'__array__'}:
+                return arrays[object_['__array__']]
+            return {key: self._insert_arrays(value, arrays)
+                    for key, value in object_.items()}
+        if isinstance(object_, list):
+            return [self._insert_arrays(element, arrays)
+                    for element in object_]
+        return object_
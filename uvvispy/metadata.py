@@ -147,12 +147,26 @@ class Experiment(aspecd.metadata.Metadata):
 
         Typical values are "absorption", "transmission"
 
+    scan_speed : :class:`str`
+        Speed of the wavelength scan as set in the acquisition software.
+
+        Typical values are "fast", "medium", "slow"
+
+    sampling_interval : :class:`aspecd.metadata.PhysicalQuantity`
+        Spacing between two adjacent points of the wavelength axis.
+
+    scan_mode : :class:`str`
+        Scan mode of the spectrometer, such as "single" or "repeat"
+
     """
 
     def __init__(self):
         super().__init__()
         self.type = ''
         self.measurement_mode = ''
+        self.scan_speed = ''
+        self.sampling_interval = aspecd.metadata.PhysicalQuantity()
+        self.scan_mode = ''
 
 
 class Spectrometer(aspecd.metadata.Metadata):
@@ -169,6 +183,12 @@ class Spectrometer(aspecd.metadata.Metadata):
     software : :class:`str`
         Name and version of the software used to record the data
 
+    slit_width : :class:`aspecd.metadata.PhysicalQuantity`
+        Spectral width of the slit of the monochromator
+
+    light_source_change_wavelength : :class:`aspecd.metadata.PhysicalQuantity`
+        Wavelength the spectrometer switches between the light sources at
+
     """
 
     def __init__(self):
@@ -176,3 +196,6 @@ class Spectrometer(aspecd.metadata.Metadata):
         self.manufacturer = ''
         self.model = ''
         self.software = ''
+        self.slit_width = aspecd.metadata.PhysicalQuantity()
+        self.light_source_change_wavelength = \
+            aspecd.metadata.PhysicalQuantity()
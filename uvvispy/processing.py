@@ -90,6 +90,22 @@ analysis, simply prefix the kind with ``aspecd``:
       type: <ClassNameOfProcessingStep>
 
 
+Pipelines of processing steps
+-----------------------------
+
+Chains of processing steps often applied together to a dataset, such as
+baseline correction, scalar algebra, and normalisation, can be applied
+in one go, changing the data only once:
+
+* :class:`Pipeline`
+
+  Apply a list of processing steps, fusing steps scaling and shifting
+  the data, and extracting ranges before filtering and interpolating.
+
+  In lazy mode, the processing steps are applied only when the data are
+  accessed the next time, *e.g.* for plotting or analysing the data.
+
+
 Module documentation
 ====================
 
@@ -97,7 +113,20 @@ What  follows is the API documentation of each class implemented in this module.
 
 """
 
+import copy
+import functools
+import math
+import operator
+
+import aspecd.exceptions
+import aspecd.history
 import aspecd.processing
+import numpy as np
+import scipy.ndimage
+import scipy.signal
+import scipy.sparse
+
+import uvvispy.dataset
 
 
 class BaselineCorrection(aspecd.processing.BaselineCorrection):
@@ -113,6 +142,17 @@ class BaselineCorrection(aspecd.processing.BaselineCorrection):
         as optical spectra tend to have features towards the high-energy
         short-wavelength end.
 
+    Instead of fitting a polynomial to each trace of 2D data one after the
+    other, all traces are fitted at once: The least-squares projection
+    (the pseudo-inverse of the Vandermonde matrix for the fit area) is
+    calculated once and applied to all traces as one matrix product. The
+    result is identical to fitting each trace separately, within numerical
+    precision, as the polynomials are fitted in the same scaled domain as
+    with :meth:`numpy.polynomial.polynomial.Polynomial.fit`. Projections
+    are cached, hence correcting many datasets sharing the same axis
+    values calculates the projection only once. The coefficients stored
+    in the parameters are those of the last trace, as before.
+
 
     Examples
     --------
@@ -154,6 +194,111 @@ class BaselineCorrection(aspecd.processing.BaselineCorrection):
         super().__init__()
         self.parameters["fit_area"] = [0, 10]
 
+    def _perform_task(self):
+        baseline = self._get_baseline(self.dataset.data.data)
+        if baseline is None:
+            self._fit_each_trace()
+            return
+        self.dataset.data.data = _subtract(self.dataset.data.data, baseline)
+
+    def _fit_each_trace(self):
+        """Subtract a baseline fitted to each trace separately.
+
+        Used if the polynomials cannot be fitted at once. As the ASpecD
+        class subtracts the baseline in place, read-only data or data
+        not of floating-point type are copied first.
+        """
+        data = self.dataset.data.data
+        if data.dtype.kind != 'f' or not data.flags.writeable:
+            self.dataset.data.data = np.array(
+                data, dtype=data.dtype if data.dtype.kind == 'f' else float)
+        super()._perform_task()
+
+    def _get_baseline(self, data, scale=1, offset=0):
+        """Return the baseline of all traces of the (scaled, shifted) data.
+
+        Returns None if the polynomials cannot be fitted at once, *e.g.*
+        for too few points in the fit area for the given order.
+        """
+        self._get_fit_range()
+        self._get_axis_values()
+        axis_values = self.dataset.data.axes[self.parameters["axis"]].values
+        order = self.parameters["order"]
+        if self._axis_values.size <= order \
+                or not np.all(np.isfinite(self._axis_values)) \
+                or np.ptp(self._axis_values) == 0:
+            return None
+        projection, evaluation = _polynomial_projection(
+            np.asarray(self._axis_values, dtype=float).tobytes(),
+            np.asarray(axis_values, dtype=float).tobytes(), order)
+        # pylint: disable=invalid-unary-operand-type
+        fit_values = np.concatenate([
+            self._get_traces(_transformed(data, slices, scale, offset))
+            for slices in (self._get_slices(None, self._data_points_left),
+                           self._get_slices(-self._data_points_right))])
+        coefficients = projection @ fit_values
+        self.parameters['coefficients'] = coefficients[:, -1]
+        baseline = evaluation @ coefficients
+        if data.ndim == 1:
+            return baseline[:, 0]
+        if self.parameters["axis"] == 0:
+            return baseline
+        return baseline.T
+
+    def _get_slices(self, start=None, stop=None):
+        """Return the index of a range of the data along the fit axis."""
+        slices = [slice(None)] * self.dataset.data.data.ndim
+        slices[self.parameters["axis"]] = slice(start, stop)
+        return tuple(slices)
+
+    def _get_traces(self, data):
+        """Return the data with the traces along their second axis."""
+        if data.ndim == 1:
+            return data[:, np.newaxis]
+        if self.parameters["axis"] == 0:
+            return data
+        return data.T
+
+
+def _subtract(data, values):
+    """Subtract values from data, in place if possible."""
+    if data.dtype.kind == 'f' and data.flags.writeable:
+        return np.subtract(data, values, out=data)
+    return data - values
+
+
+@functools.lru_cache(maxsize=32)
+def _polynomial_projection(fit_axis_values, axis_values, order):
+    """Return matrices for fitting polynomials to many traces at once.
+
+    Mimics :meth:`numpy.polynomial.polynomial.Polynomial.fit`: The axis
+    values are mapped onto the window [-1, 1], and the columns of the
+    Vandermonde matrix scaled before calculating its pseudo-inverse with
+    the same cutoff for small singular values. Axis values are given as
+    bytes (of float64 arrays), to be usable as keys of the cache.
+
+    Returns the projection from the values in the fit area to the
+    coefficients and the matrix evaluating the polynomials for all axis
+    values, both read-only.
+    """
+    fit_axis_values = np.frombuffer(fit_axis_values)
+    axis_values = np.frombuffer(axis_values)
+    domain = np.polynomial.polyutils.getdomain(fit_axis_values)
+    offset, scale = np.polynomial.polyutils.mapparms(domain, [-1, 1])
+    vandermonde = np.polynomial.polynomial.polyvander(
+        offset + scale * fit_axis_values, order)
+    norms = np.sqrt(np.square(vandermonde).sum(axis=0))
+    norms[norms == 0] = 1
+    projection = np.linalg.pinv(
+        vandermonde / norms,
+        rcond=fit_axis_values.size * np.finfo(float).eps) \
+        / norms[:, np.newaxis]
+    evaluation = np.polynomial.polynomial.polyvander(
+        offset + scale * axis_values, order)
+    projection.flags.writeable = False
+    evaluation.flags.writeable = False
+    return projection, evaluation
+
 
 class Normalisation(aspecd.processing.Normalisation):
     """Normalise data.
@@ -217,7 +362,214 @@ class Normalisation(aspecd.processing.Normalisation):
              range: [340, 350]
              range_unit: axis
 
+    By default, the data are normalised as a whole, as in ASpecD. To
+    normalise each trace of 2D data separately, provide the axis along
+    which to normalise, usually the first (spectral) axis. In this case,
+    ranges refer to this axis only:
+
+    .. code-block:: yaml
+
+       - kind: processing
+         type: Normalisation
+         properties:
+           parameters:
+             kind: area
+             axis: 0
+             range: [340, 350]
+             range_unit: axis
+
+    All traces are normalised at once, with a single reduction along the
+    given axis. Likewise, several datasets with identical axes can be
+    normalised at once using :meth:`process_datasets`, resolving the
+    ranges only once for all datasets. In any case, the data are divided
+    in place, without copying them, unless they are read-only.
+
+    .. versionchanged:: 0.2
+        Parameter ``axis``, normalising without copying the data
+
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.parameters["axis"] = None
+
+    def process_datasets(self, datasets=None):
+        """Normalise several datasets with identical axes at once.
+
+        The ranges are resolved only once, and the norms of all datasets
+        are determined with a single reduction. A history record is added
+        to each dataset, as if it had been processed separately.
+
+        .. versionadded:: 0.2
+
+        Parameters
+        ----------
+        datasets : :class:`list`
+            Datasets to normalise
+
+            All datasets need to have the same shape and axis values.
+
+        Returns
+        -------
+        datasets : :class:`list`
+            Normalised datasets
+
+        Raises
+        ------
+        ValueError
+            Raised if shape or axis values of the datasets differ
+
+        """
+        datasets = list(datasets or [])
+        if not datasets:
+            return datasets
+        for dataset in datasets[1:]:
+            if not _have_same_axes(datasets[0], dataset):
+                raise ValueError('Datasets differ in shape or axis values')
+        self.dataset = datasets[0]
+        self._check_applicability()
+        self._set_defaults()
+        self._sanitise_parameters()
+        norms = self._get_norms([dataset.data.data for dataset in datasets])
+        for dataset, norm in zip(datasets, norms):
+            dataset.data.data = _divide(dataset.data.data, norm)
+        _append_history_records(datasets, self)
+        return datasets
+
+    def _sanitise_parameters(self):
+        kind = self.parameters["kind"].lower()
+        if not any(kind_ in kind for kind_ in ("max", "min", "amp", "area")):
+            raise ValueError('Kind "%s" not recognised.'
+                             % self.parameters["kind"])
+        axis = self.parameters["axis"]
+        if axis is not None and axis >= self.dataset.data.data.ndim:
+            raise ValueError("Normalisation axis outside data dimensions")
+
+    def _perform_task(self):
+        norm = self._get_norms([self.dataset.data.data])[0]
+        self.dataset.data.data = _divide(self.dataset.data.data, norm)
+
+    def _get_norms(self, data, scale=1, offset=0):
+        """Return the norms of a list of arrays, with one reduction.
+
+        The norms are broadcastable to the shape of the arrays, with the
+        first axis running over the arrays. If given, the norms are those
+        of the arrays scaled and shifted by ``scale`` and ``offset``.
+        """
+        axis = self.parameters["axis"]
+        if axis is None:
+            axis = tuple(range(1, data[0].ndim + 1))
+        else:
+            axis += 1
+        kind = self.parameters["kind"].lower()
+        noise_amplitude = 0
+        if self.parameters["noise_range"]:
+            values = _stack(data, self._get_slices(
+                self.parameters["noise_range"],
+                self.parameters["noise_range_unit"]), scale, offset)
+            noise_amplitude = np.ptp(values, axis=axis, keepdims=True)
+        values = _stack(data, self._get_slices(self.parameters["range"],
+                                               self.parameters["range_unit"]),
+                        scale, offset)
+        if "max" in kind:
+            return values.max(axis=axis, keepdims=True) - noise_amplitude / 2
+        if "min" in kind:
+            return abs(values.min(axis=axis, keepdims=True)) \
+                - noise_amplitude / 2
+        if "amp" in kind:
+            return np.ptp(values, axis=axis, keepdims=True) - noise_amplitude
+        return np.sum(np.abs(values), axis=axis, keepdims=True)
+
+    def _get_slices(self, range_=None, unit='index'):
+        """Return the index of the range of the data to normalise to."""
+        ndim = self.dataset.data.data.ndim
+        if range_ is None or not np.size(range_):
+            return (slice(None),) * ndim
+        axes = range(ndim)
+        if self.parameters["axis"] is not None:
+            axes = [self.parameters["axis"]]
+        range_ = np.atleast_2d(range_)
+        if len(range_) < len(axes):
+            raise IndexError('Got only %i range for %iD data' %
+                             (len(range_), len(axes)))
+        slices = [slice(None)] * ndim
+        for axis, axis_range in zip(axes, range_):
+            slices[axis] = _get_slice(self.dataset.data.axes[axis].values,
+                                      axis_range, unit.lower())
+        return tuple(slices)
+
+
+def _get_slice(axis_values, range_, unit='index'):
+    """Return the slice of an axis for a range in the given unit.
+
+    The slice is the same :class:`RangeExtraction` would extract.
+    """
+    if unit == "index":
+        return slice(*range_[:3])
+    if unit == "axis":
+        return slice(_get_index(axis_values, range_[0]),
+                     _get_index(axis_values, range_[1]))
+    return slice(math.ceil(axis_values.size * range_[0] / 100.0),
+                 math.ceil(axis_values.size * range_[1] / 100.0) + 1)
+
+
+def _get_index(axis_values, value):
+    """Return the index of the axis value nearest to a value."""
+    return int(np.abs(axis_values - value).argmin())
+
+
+def _stack(data, slices, scale=1, offset=0):
+    """Stack ranges of arrays, as a view in case of a single array."""
+    if len(data) == 1:
+        return _transformed(data[0], slices, scale, offset)[np.newaxis]
+    return np.stack([_transformed(array, slices, scale, offset)
+                     for array in data])
+
+
+def _transformed(data, slices, scale=1, offset=0):
+    """Return a range of the data scaled and shifted, a view if unchanged.
+
+    Scale and offset need to be broadcastable to the shape of the data.
+    """
+    values = data[slices]
+    if not _is_scalar(scale, 1):
+        values = np.broadcast_to(scale, data.shape)[slices] * values
+    if not _is_scalar(offset, 0):
+        values = values + np.broadcast_to(offset, data.shape)[slices]
+    return values
+
+
+def _is_scalar(value, scalar):
+    """Check whether a value is the given scalar (and not an array)."""
+    return np.ndim(value) == 0 and value == scalar
+
+
+def _divide(data, norm):
+    """Divide data by norm, in place if possible."""
+    if data.dtype.kind == 'f' and data.flags.writeable:
+        return np.divide(data, norm, out=data)
+    return data / norm
+
+
+def _append_history_records(datasets, processing_step):
+    """Add the history record of a step applied to several datasets.
+
+    The record, including the system information expensive to obtain, is
+    created only once and copied for each dataset.
     """
+    history_record = aspecd.history.ProcessingHistoryRecord(
+        package=datasets[0].package_name, processing_step=processing_step)
+    for dataset in datasets:
+        dataset.append_history_record(copy.deepcopy(history_record))
+
+
+def _have_same_axes(dataset, other_dataset):
+    """Check whether two datasets have the same shape and axis values."""
+    if dataset.data.data.shape != other_dataset.data.data.shape:
+        return False
+    return all(np.array_equal(axis.values, other_axis.values)
+               for axis, other_axis in zip(dataset.data.axes[:-1],
+                                           other_dataset.data.axes[:-1]))
 
 
 class ScalarAlgebra(aspecd.processing.ScalarAlgebra):
@@ -347,6 +699,9 @@ class RangeExtraction(aspecd.processing.RangeExtraction):
     ASpecD documentation for the :class:`aspecd.processing.RangeExtraction`
     class for details.
 
+    Uniformly spaced axes (see :class:`uvvispy.dataset.UniformAxis`) stay
+    compact, as the extracted axis values are uniformly spaced as well.
+
     Examples
     --------
     For convenience, a series of examples in recipe style (for details of
@@ -439,6 +794,22 @@ class CommonRangeExtraction(aspecd.processing.CommonRangeExtraction):
     ASpecD documentation for the
     :class:`aspecd.processing.CommonRangeExtraction` class for details.
 
+    .. note::
+        Datasets with identical axes are interpolated at once, using
+        :meth:`uvvispy.processing.Interpolation.process_datasets`. Hence,
+        for many datasets recorded with the same wavelength grid, the
+        interpolation weights are calculated only once.
+
+    The axes of all datasets are scanned only once, to check them and to
+    get the common range. The interpolated data of all datasets are
+    written to one preallocated array, and the data of each dataset are a
+    view of this array. Hence, even for thousands of datasets, there is no
+    need for copies of the datasets. The data type of the array is the
+    floating-point type able to hold the data of all datasets.
+
+    .. versionchanged:: 0.2
+        Interpolate datasets with identical axes at once, into one array
+
     Examples
     --------
     For convenience, a series of examples in recipe style (for details of
@@ -502,6 +873,69 @@ class CommonRangeExtraction(aspecd.processing.CommonRangeExtraction):
 
     """
 
+    def _perform_task(self):
+        groups = self._scan_axes()
+        self._interpolate(groups)
+
+    def _scan_axes(self):
+        """Check the axes and get the common range in one pass.
+
+        Returns the datasets grouped by their axes.
+        """
+        ndim = self.datasets[0].data.data.ndim
+        units = [axis.unit for axis in self.datasets[0].data.axes]
+        minima = np.empty((len(self.datasets), ndim))
+        maxima = np.empty((len(self.datasets), ndim))
+        groups = dict()
+        for index, dataset in enumerate(self.datasets):
+            if dataset.data.data.ndim != ndim:
+                raise ValueError("Datasets have different dimensions")
+            if not self.parameters["ignore_units"] \
+                    and [axis.unit for axis in dataset.data.axes] != units:
+                raise ValueError("Datasets have axes with different units")
+            axes_values = [dataset.data.axes[dim].values
+                           for dim in range(ndim)]
+            minima[index] = [values[0] for values in axes_values]
+            maxima[index] = [values[-1] for values in axes_values]
+            key = (dataset.data.data.shape,) + tuple(
+                np.asarray(values, dtype=float).tobytes()
+                for values in axes_values)
+            groups.setdefault(key, []).append(dataset)
+        common_range = np.stack([minima.max(axis=0), maxima.min(axis=0)],
+                                axis=1)
+        if np.any(common_range[:, 0] > common_range[:, 1]):
+            raise ValueError("Datasets have disjoint axes values")
+        self.parameters["common_range"] = common_range.tolist()
+        self.parameters["npoints"] = [
+            min(_count_points(group[0].data.axes[dim].values, range_)
+                for group in groups.values())
+            for dim, range_ in enumerate(common_range)]
+        return list(groups.values())
+
+    def _interpolate(self, groups=None):
+        interpolation = Interpolation()
+        interpolation.parameters["range"] = self.parameters["common_range"]
+        interpolation.parameters["npoints"] = self.parameters["npoints"]
+        interpolation.parameters["unit"] = "axis"
+        dtype = np.result_type(*[dataset.data.data.dtype
+                                 for dataset in self.datasets])
+        if dtype.kind != 'f':
+            dtype = np.dtype(float)
+        buffer = np.empty((len(self.datasets),)
+                          + tuple(self.parameters["npoints"]), dtype=dtype)
+        start = 0
+        for group in groups:
+            copy.deepcopy(interpolation).process_datasets(
+                group, out=buffer[start:start + len(group)])
+            start += len(group)
+
+
+def _count_points(axis_values, range_):
+    """Return the number of axis values within the range."""
+    # noinspection PyUnresolvedReferences
+    return (axis_values <= range_[1]).nonzero()[0][-1] \
+        - (axis_values >= range_[0]).nonzero()[0][0] + 1
+
 
 class Interpolation(aspecd.processing.Interpolation):
     """Interpolate data.
@@ -510,6 +944,34 @@ class Interpolation(aspecd.processing.Interpolation):
     ASpecD documentation for the :class:`aspecd.processing.Interpolation`
     class for details.
 
+    .. note::
+        There is only one difference to the ASpecD class: The data type of
+        floating-point data is retained, *e.g.* for data imported with
+        single precision (see the ``dtype`` parameter of the importers).
+        Uniformly spaced axes (see :class:`uvvispy.dataset.UniformAxis`)
+        stay compact, as the interpolated axis values are uniformly spaced.
+
+    The data are interpolated linearly along each axis (bilinearly in case
+    of 2D data), multiplying them with a sparse matrix of interpolation
+    weights. These weights are cached for each pair of original and
+    interpolated axis values, hence interpolating many datasets with the
+    same axes calculates them only once. To interpolate several datasets
+    with identical axes in one go, use :meth:`process_datasets`.
+
+    .. versionchanged:: 0.2
+        Interpolation using cached weights, interpolating several datasets
+
+    Attributes
+    ----------
+    chunk_size : :class:`int`
+        Maximum number of datasets interpolated in one go
+
+        Used by :meth:`process_datasets` to limit the memory required.
+
+        Default: 1024
+
+        .. versionadded:: 0.2
+
     Examples
     --------
     For convenience, a series of examples in recipe style (for details of
@@ -549,6 +1011,142 @@ class Interpolation(aspecd.processing.Interpolation):
 
     """
 
+    def __init__(self):
+        super().__init__()
+        self.chunk_size = 1024
+
+    def process_datasets(self, datasets=None, out=None):
+        """Interpolate several datasets with identical axes at once.
+
+        The interpolation weights are applied to the data of all datasets
+        with a single sparse-matrix product per axis (for very many
+        datasets, per chunk of datasets, to limit the memory required).
+        The interpolated data are written to one array, with the datasets
+        along its first axis, and the data of each dataset are a view of
+        this array. A history record is added to each dataset, as if it
+        had been processed separately.
+
+        .. versionadded:: 0.2
+
+        Parameters
+        ----------
+        datasets : :class:`list`
+            Datasets to interpolate
+
+            All datasets need to have the same shape and axis values.
+
+        out : :class:`numpy.ndarray`
+            Array to write the interpolated data to
+
+            Its first axis runs over the datasets, the further axes need
+            to have the size of the interpolated data. If not given, an
+            array is created, with a floating-point data type able to
+            hold the data of all datasets.
+
+        Returns
+        -------
+        datasets : :class:`list`
+            Interpolated datasets
+
+        Raises
+        ------
+        ValueError
+            Raised if shape or axis values of the datasets differ
+
+        """
+        datasets = list(datasets or [])
+        if not datasets:
+            return datasets
+        for dataset in datasets[1:]:
+            if not _have_same_axes(datasets[0], dataset):
+                raise ValueError('Datasets differ in shape or axis values')
+        self.dataset = datasets[0]
+        self._check_applicability()
+        self._set_defaults()
+        self._sanitise_parameters()
+        self._axis_values = []
+        self._get_axis_values()
+        if out is None:
+            dtype = np.result_type(*[dataset.data.data.dtype
+                                     for dataset in datasets])
+            if dtype.kind != 'f':
+                dtype = np.dtype(float)
+            out = np.empty((len(datasets),) + tuple(
+                axis_values.size for axis_values in self._axis_values),
+                           dtype=dtype)
+        for start in range(0, len(datasets), self.chunk_size):
+            chunk = datasets[start:start + self.chunk_size]
+            data = self._interpolate(np.stack(
+                [dataset.data.data for dataset in chunk], axis=-1))
+            out[start:start + len(chunk)] = np.moveaxis(data, -1, 0)
+        for dataset, data in zip(datasets, out):
+            dataset.data.data = data
+            self._set_axes(dataset)
+        _append_history_records(datasets, self)
+        return datasets
+
+    def _perform_task(self):
+        self._axis_values = []
+        self._get_axis_values()
+        data = self._interpolate(self.dataset.data.data[..., np.newaxis])
+        dtype = self.dataset.data.data.dtype
+        if dtype.kind == 'f' and data.dtype != dtype:
+            data = data.astype(dtype)
+        self.dataset.data.data = np.ascontiguousarray(data[..., 0])
+        self._set_axes(self.dataset)
+
+    def _interpolate(self, data):
+        for dim, axis_values in enumerate(self._axis_values):
+            weights = _interpolation_weights(
+                np.asarray(self.dataset.data.axes[dim].values,
+                           dtype=float).tobytes(),
+                np.asarray(axis_values, dtype=float).tobytes())
+            data = _apply_weights(weights, data, dim)
+        return data
+
+    def _set_axes(self, dataset):
+        for dim, axis_values in enumerate(self._axis_values):
+            dataset.data.axes[dim].values = axis_values
+
+
+@functools.lru_cache(maxsize=32)
+def _interpolation_weights(axis_values, interpolated_axis_values):
+    """Return the sparse matrix interpolating linearly along an axis.
+
+    Axis values are given as bytes (of float64 arrays), to be usable as
+    keys of the cache. Like :func:`scipy.interpolate.interp1d`, the axis
+    values need not be sorted.
+    """
+    axis_values = np.frombuffer(axis_values)
+    interpolated_axis_values = np.frombuffer(interpolated_axis_values)
+    order = np.argsort(axis_values, kind='stable')
+    sorted_values = axis_values[order]
+    indices = np.clip(np.searchsorted(sorted_values, interpolated_axis_values,
+                                      side='right') - 1,
+                      0, max(sorted_values.size - 2, 0))
+    if sorted_values.size > 1:
+        fractions = (interpolated_axis_values - sorted_values[indices]) \
+            / (sorted_values[indices + 1] - sorted_values[indices])
+    else:
+        fractions = np.zeros(interpolated_axis_values.size)
+    rows = np.arange(interpolated_axis_values.size)
+    weights = scipy.sparse.csr_matrix(
+        (np.concatenate((1 - fractions, fractions)),
+         (np.concatenate((rows, rows)),
+          np.concatenate((order[indices],
+                          order[np.minimum(indices + 1,
+                                           sorted_values.size - 1)])))),
+        shape=(interpolated_axis_values.size, axis_values.size))
+    weights.data.flags.writeable = False
+    return weights
+
+
+def _apply_weights(weights, data, axis):
+    """Apply a (sparse) matrix to the data along the given axis."""
+    data = np.moveaxis(data, axis, 0)
+    result = weights @ data.reshape(data.shape[0], -1)
+    return np.moveaxis(result.reshape((-1,) + data.shape[1:]), 0, axis)
+
 
 class Filtering(aspecd.processing.Filtering):
     """Filter data.
@@ -595,4 +1193,633 @@ class Filtering(aspecd.processing.Filtering):
     well. To get best results, you will need to experiment with the
     parameters a bit.
 
+    The Savitzky-Golay filter can return a derivative of the data as well,
+    with respect to the axis values (assumed to be equidistant):
+
+    .. code-block:: yaml
+
+       - kind: processing
+         type: Filtering
+         properties:
+           parameters:
+             type: savitzky-golay
+             window_length: 11
+             order: 3
+             derivative: 1
+
+    By default, 2D data are filtered as in ASpecD, *i.e.* uniform and
+    Gaussian filters are applied along both axes, the Savitzky-Golay filter
+    along the second axis. To filter each trace of 2D data separately,
+    provide the axis along which to filter, usually the first (spectral)
+    axis. In this case, the filter is applied to all traces at once:
+
+    .. code-block:: yaml
+
+       - kind: processing
+         type: Filtering
+         properties:
+           parameters:
+             type: savitzky-golay
+             window_length: 11
+             order: 3
+             axis: 0
+
+    Likewise, several datasets with identical axes can be filtered at once
+    using :meth:`process_datasets`, with a single convolution for all
+    datasets.
+
+    The filter kernels (and for the Savitzky-Golay filter, the projections
+    used for the edges of the data) are cached, with the type, window
+    length, order, derivative, and data type as key. Hence, filtering many
+    datasets with the same parameters calculates the kernel only once.
+
+    .. versionchanged:: 0.2
+        Parameters ``axis`` and ``derivative``, filtering several datasets
+
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.parameters["axis"] = None
+        self.parameters["derivative"] = 0
+
+    def process_datasets(self, datasets=None):
+        """Filter several datasets with identical axes at once.
+
+        The data of all datasets are stacked and filtered with a single
+        convolution per axis. A history record is added to each dataset,
+        as if it had been processed separately.
+
+        .. versionadded:: 0.2
+
+        Parameters
+        ----------
+        datasets : :class:`list`
+            Datasets to filter
+
+            All datasets need to have the same shape and axis values.
+
+        Returns
+        -------
+        datasets : :class:`list`
+            Filtered datasets
+
+        Raises
+        ------
+        ValueError
+            Raised if shape or axis values of the datasets differ
+
+        """
+        datasets = list(datasets or [])
+        if not datasets:
+            return datasets
+        for dataset in datasets[1:]:
+            if not _have_same_axes(datasets[0], dataset):
+                raise ValueError('Datasets differ in shape or axis values')
+        self.dataset = datasets[0]
+        self._check_applicability()
+        self._set_defaults()
+        self._sanitise_parameters()
+        dtype = np.result_type(*[dataset.data.data.dtype
+                                 for dataset in datasets])
+        if dtype.kind != 'f':
+            dtype = np.dtype(float)
+        filtered = self._filter(np.stack([dataset.data.data
+                                          for dataset in datasets]), dtype)
+        for dataset, data in zip(datasets, filtered):
+            dataset.data.data = data
+        _append_history_records(datasets, self)
+        return datasets
+
+    def _sanitise_parameters(self):
+        if not self.parameters["type"]:
+            raise ValueError("Missing filter type")
+        self._convert_filter_type()
+        if self.parameters["type"] not in self._types:
+            raise ValueError("Wrong filter type %s" % self.parameters["type"])
+        if not self.parameters["window_length"]:
+            raise ValueError("Missing filter window length")
+        axis = self.parameters["axis"]
+        if axis is not None and axis >= self.dataset.data.data.ndim:
+            raise ValueError("Filter axis outside data dimensions")
+        if self.parameters["window_length"] > \
+                min(self.dataset.data.data.shape[axis_]
+                    for axis_ in self._get_axes()):
+            raise ValueError("Filter window outside data range")
+        if self.parameters["type"] == "savitzky-golay" \
+                and not self.parameters["order"]:
+            raise ValueError("Missing order for this filter")
+
+    def _perform_task(self):
+        data = self.dataset.data.data
+        dtype = data.dtype if data.dtype.kind == 'f' else np.dtype(float)
+        self.dataset.data.data = self._filter(data[np.newaxis], dtype)[0]
+
+    def _get_axes(self):
+        """Return the axes to filter along, as in ASpecD if not given."""
+        if self.parameters["axis"] is not None:
+            return [self.parameters["axis"]]
+        if self.parameters["type"] == "savitzky-golay":
+            return [self.dataset.data.data.ndim - 1]
+        return list(range(self.dataset.data.data.ndim))
+
+    def _get_kernel(self, dtype):
+        if self.parameters["type"] == "savitzky-golay":
+            return _filter_kernel(
+                "savitzky-golay", self.parameters["window_length"],
+                self.parameters["order"], self.parameters["derivative"],
+                dtype.str)
+        return _filter_kernel(self.parameters["type"],
+                              self.parameters["window_length"], 0, 0,
+                              dtype.str)
+
+    def _filter(self, data, dtype):
+        """Filter data with the datasets along the first axis."""
+        data = np.asarray(data, dtype=dtype)
+        weights, left, right = self._get_kernel(dtype)
+        for axis in self._get_axes():
+            if self.parameters["type"] == "savitzky-golay":
+                filtered = scipy.ndimage.convolve1d(data, weights,
+                                                    axis=axis + 1,
+                                                    mode='constant')
+                _fit_edges(data, filtered, left, right, axis + 1)
+                if self.parameters["derivative"]:
+                    axis_values = self.dataset.data.axes[axis].values
+                    step = (axis_values[-1] - axis_values[0]) \
+                        / (axis_values.size - 1)
+                    filtered /= step ** self.parameters["derivative"]
+            else:
+                filtered = scipy.ndimage.correlate1d(data, weights,
+                                                     axis=axis + 1,
+                                                     mode='reflect')
+            data = filtered
+        return data
+
+
+def _fit_edges(data, filtered, left, right, axis):
+    """Set the edges of data filtered by fitting polynomials to the data."""
+    if not left.size:
+        return
+    data = np.moveaxis(data, axis, 0)
+    filtered = np.moveaxis(filtered, axis, 0)
+    window_length, halflength = left.shape[1], left.shape[0]
+    filtered[:halflength] = np.tensordot(left, data[:window_length], axes=1)
+    filtered[-halflength:] = np.tensordot(right, data[-window_length:],
+                                          axes=1)
+
+
+@functools.lru_cache(maxsize=64)
+def _filter_kernel(type_, window_length, order, derivative, dtype):
+    """Return the (read-only) kernel of a filter, cached.
+
+    The kernel consists of the weights and, for the Savitzky-Golay filter,
+    the matrices evaluating the polynomials fitted to the first and last
+    window of the data for the first and last half window (empty
+    otherwise), as done by :func:`scipy.signal.savgol_filter`.
+    """
+    left = right = np.zeros((0, 0))
+    if type_ == "savitzky-golay":
+        weights = scipy.signal.savgol_coeffs(window_length, order,
+                                             deriv=derivative)
+        left, right = _savitzky_golay_edges(window_length, order, derivative)
+    elif type_ == "gaussian":
+        # Same kernel as used by scipy.ndimage.gaussian_filter1d
+        radius = int(4. * window_length + 0.5)
+        positions = np.arange(-radius, radius + 1)
+        weights = np.exp(-0.5 / window_length ** 2 * positions ** 2)
+        weights = weights / weights.sum()
+    else:
+        weights = np.full(window_length, 1. / window_length)
+    kernel = tuple(np.asarray(array, dtype=dtype)
+                   for array in (weights, left, right))
+    for array in kernel:
+        array.flags.writeable = False
+    return kernel
+
+
+def _savitzky_golay_edges(window_length, order, derivative):
+    """Return the matrices fitting the edges of the Savitzky-Golay filter.
+
+    The positions within the window are mapped onto [-1, 1] for a well
+    conditioned fit.
+    """
+    halflength = window_length // 2
+    centre = max((window_length - 1) / 2, 0.5)
+    positions = (np.arange(window_length) - centre) / centre
+    projection = np.linalg.pinv(
+        np.polynomial.polynomial.polyvander(positions, order))
+    if derivative > order:
+        return (np.zeros((halflength, window_length)),) * 2
+    projection = np.polynomial.polynomial.polyder(
+        projection, m=derivative, scl=1. / centre, axis=0)
+    evaluation = np.polynomial.polynomial.polyvander(
+        positions, order - derivative)
+    return (evaluation[:halflength] @ projection,
+            evaluation[window_length - halflength:] @ projection)
+
+
+class Pipeline:
+    """Chain of processing steps applied to a dataset in one go.
+
+    Typical recipes apply a series of processing steps, such as baseline
+    correction, scalar algebra, and normalisation, to each dataset. Each
+    of these steps alone requires a full pass over the data. Here,
+    consecutive steps that scale and shift the data (or change only axis
+    values) are fused: Their scale and offset are accumulated, and the
+    data are changed only once, in place if possible.
+
+    Fused are the steps :class:`ScalarAlgebra`, :class:`ScalarAxisAlgebra`,
+    :class:`Normalisation`, and :class:`BaselineCorrection` (the latter
+    subtracting a baseline fitted to the scaled and shifted data). All
+    other steps are applied as usual, after changing the data for the
+    steps preceding them.
+
+    Furthermore, a :class:`RangeExtraction` is pushed down before the
+    steps preceding it, as long as these are :class:`ScalarAlgebra`,
+    :class:`ScalarAxisAlgebra`, :class:`Filtering` (without derivative),
+    or :class:`Interpolation` (with the range given in axis units, of
+    data with monotonic axes). The data are restricted first to the
+    range actually needed, including margins of the size of the filter
+    kernels, and interpolated only for the range extracted afterwards.
+    Hence, expensive steps are performed only for the range of interest.
+    The result is the same as applying all steps to the whole data.
+
+    Each step is still recorded in the history of the dataset, in the
+    order given, with the same parameters as if it had been applied on
+    its own. Hence, the processing remains fully reproducible.
+
+    In lazy mode (see :attr:`lazy`), the processing steps are only
+    recorded, and applied only when the data of the dataset are accessed
+    the next time, *e.g.* when plotting or analysing the dataset. For
+    this, the data of the dataset are replaced by
+    :class:`uvvispy.dataset.DeferredData`. Further processing steps
+    applied in lazy mode before accessing the data are appended to the
+    steps pending, and the history records are added to the dataset only
+    once the steps have been applied.
+
+    .. versionadded:: 0.2
+
+    .. versionchanged:: 0.2
+        Lazy mode, pushing down range extraction
+
+    Attributes
+    ----------
+    steps : :class:`list`
+        Processing steps applied to the dataset, in this order
+
+    dataset : :class:`aspecd.dataset.Dataset`
+        Dataset the processing steps are applied to
+
+    lazy : :class:`bool`
+        Whether to defer applying the processing steps
+
+        Default: False
+
+    Raises
+    ------
+    aspecd.exceptions.MissingDatasetError
+        Raised when no dataset exists to act on
+
+    Examples
+    --------
+    To correct the baseline of a dataset and normalise it to its maximum
+    afterwards:
+
+    .. code-block::
+
+        baseline_correction = uvvispy.processing.BaselineCorrection()
+        normalisation = uvvispy.processing.Normalisation()
+        pipeline = uvvispy.processing.Pipeline(
+            steps=[baseline_correction, normalisation])
+        pipeline.process(dataset)
+
+    To filter a dataset, but only once its data are used, and only for
+    the range extracted afterwards:
+
+    .. code-block::
+
+        filtering = uvvispy.processing.Filtering()
+        filtering.parameters["type"] = "savitzky-golay"
+        filtering.parameters["window_length"] = 11
+        filtering.parameters["order"] = 3
+        range_extraction = uvvispy.processing.RangeExtraction()
+        range_extraction.parameters["range"] = [400, 500]
+        range_extraction.parameters["unit"] = "axis"
+        pipeline = uvvispy.processing.Pipeline(
+            steps=[filtering, range_extraction])
+        pipeline.lazy = True
+        pipeline.process(dataset)
+
+    """
+
+    def __init__(self, steps=None):
+        self.steps = list(steps or [])
+        self.dataset = None
+        self.lazy = False
+        self._scale = 1
+        self._offset = 0
+        self._history_records = []
+
+    def process(self, dataset=None):
+        """Apply all processing steps to the dataset.
+
+        In lazy mode, the processing steps are applied only when the data
+        of the dataset are accessed the next time.
+
+        Parameters
+        ----------
+        dataset : :class:`aspecd.dataset.Dataset`
+            Dataset to apply the processing steps to
+
+        Returns
+        -------
+        dataset : :class:`aspecd.dataset.Dataset`
+            Dataset the processing steps have been applied to
+
+        """
+        if dataset is not None:
+            self.dataset = dataset
+        if self.dataset is None:
+            raise aspecd.exceptions.MissingDatasetError
+        if self.lazy:
+            self._defer()
+        else:
+            self._execute()
+        return self.dataset
+
+    def _defer(self):
+        # Copies, as the steps may be changed before being applied
+        steps = copy.deepcopy(self.steps)
+        data = self.dataset.data
+        if isinstance(data, uvvispy.dataset.DeferredData) and data.pending:
+            data.processing.steps.extend(steps)
+            return
+        pipeline = Pipeline(steps=steps)
+        pipeline.dataset = self.dataset
+        self.dataset.data = uvvispy.dataset.DeferredData(source=data,
+                                                         processing=pipeline)
+
+    def _execute(self):
+        position = 0
+        while position < len(self.steps):
+            stop = position
+            while stop < len(self.steps) - 1 \
+                    and isinstance(self.steps[stop], (ScalarAlgebra,
+                                                      ScalarAxisAlgebra,
+                                                      Filtering,
+                                                      Interpolation)):
+                stop += 1
+            steps = self.steps[position:stop + 1]
+            plan = None
+            if len(steps) > 1 and isinstance(steps[-1], RangeExtraction):
+                self._apply()
+                plan = self._push_down(steps)
+            if plan is None:
+                plan = [(step, step) for step in steps]
+            for processing_step, recorded_step in plan:
+                self._perform(processing_step, recorded_step)
+            position = stop + 1
+        self._apply()
+
+    # pylint: disable=protected-access
+    def _push_down(self, steps):
+        """Return the steps with the range extraction ending them pushed down.
+
+        The steps returned restrict the data first to the range needed,
+        followed by the steps given (interpolations only for the range
+        needed), and the extraction of the range from the data restricted.
+        Each step comes with the step to record in the history (or None).
+        Returns None if the range extraction cannot be pushed down.
+        """
+        prepared, axes = self._simulate(steps)
+        if not prepared:
+            return None
+        selections = [
+            np.arange(values.size)[_get_slice(
+                values, range_, prepared[-1].parameters["unit"])]
+            for values, range_ in zip(axes[-1],
+                                      prepared[-1].parameters["range"])]
+        if any(selection.size == 0 or np.any(np.diff(selection) <= 0)
+               for selection in selections):
+            return None
+        regions = _needed_regions(prepared[:-1], axes, [
+            (int(selection[0]), int(selection[-1]) + 1)
+            for selection in selections])
+        plan = []
+        if regions[0] != [(0, values.size) for values in axes[0]]:
+            plan.append((_range_extraction(
+                [(start, stop, 1) for start, stop in regions[0]]), None))
+        region = regions[0]
+        for processing_step, prepared_step, output_axes, output_region in zip(
+                steps[:-1], prepared[:-1], axes[1:], regions[1:]):
+            if isinstance(processing_step, Interpolation):
+                plan.append((_GridInterpolation(axis_values=[
+                    values[start:stop] for values, (start, stop)
+                    in zip(output_axes, output_region)]), prepared_step))
+                region = output_region
+            else:
+                plan.append((processing_step, processing_step))
+        plan.append((_range_extraction(
+            [(selection[0] - start, selection[-1] - start + 1,
+              selection[1] - selection[0] if selection.size > 1 else 1)
+             for selection, (start, _) in zip(selections, region)]),
+                     prepared[-1]))
+        return plan
+
+    def _simulate(self, steps):
+        """Apply steps to a dataset without data, to obtain the axes.
+
+        Returns the steps prepared and the axes values before each step
+        (empty lists if a step prevents pushing down range extraction).
+        """
+        # pylint: disable=protected-access
+        shadow = _shadow(self.dataset)
+        axes = [[axis.values for axis in shadow.data.axes[:-1]]]
+        prepared = []
+        for processing_step in steps:
+            processing_step = copy.deepcopy(processing_step)
+            _prepare(processing_step, shadow)
+            if isinstance(processing_step, Filtering) \
+                    and processing_step.parameters["derivative"]:
+                return [], []
+            if isinstance(processing_step, Interpolation):
+                if processing_step.parameters["unit"] != "axis" \
+                        or not all(_is_monotonic(values)
+                                   for values in axes[-1]):
+                    return [], []
+                processing_step._axis_values = []
+                processing_step._get_axis_values()
+                shadow.data.data = np.broadcast_to(0., tuple(
+                    values.size for values in processing_step._axis_values))
+                processing_step._set_axes(shadow)
+            elif isinstance(processing_step, ScalarAxisAlgebra):
+                processing_step._perform_task()
+            prepared.append(processing_step)
+            axes.append([axis.values for axis in shadow.data.axes[:-1]])
+        return prepared, axes[:-1]
+
+    def _perform(self, processing_step, recorded_step):
+        """Apply a processing step and record the step to record."""
+        if isinstance(processing_step, (ScalarAlgebra, ScalarAxisAlgebra,
+                                        Normalisation, BaselineCorrection)):
+            # Copy, as the steps store the dataset they are applied to
+            performed_step = self._fuse(copy.deepcopy(processing_step))
+        elif recorded_step is processing_step:
+            self._apply()
+            self.dataset.process(processing_step)
+            return
+        else:
+            self._apply()
+            performed_step = copy.deepcopy(processing_step)
+            _prepare(performed_step, self.dataset)
+            performed_step._perform_task()
+        if recorded_step is processing_step:
+            recorded_step = performed_step
+        if recorded_step is not None:
+            self._history_records.append(
+                aspecd.history.ProcessingHistoryRecord(
+                    package=self.dataset.package_name,
+                    processing_step=recorded_step))
+
+    def _fuse(self, processing_step):
+        """Accumulate scale and offset of a processing step."""
+        _prepare(processing_step, self.dataset)
+        data = self.dataset.data.data
+        if isinstance(processing_step, ScalarAxisAlgebra):
+            processing_step._perform_task()
+        elif isinstance(processing_step, ScalarAlgebra):
+            operator_ = processing_step._kinds[
+                processing_step.parameters["kind"].lower()]
+            value = processing_step.parameters["value"]
+            if operator_ in (operator.mul, operator.truediv):
+                self._scale = operator_(self._scale, value)
+            self._offset = operator_(self._offset, value)
+        elif isinstance(processing_step, Normalisation):
+            norm = processing_step._get_norms([data], self._scale,
+                                              self._offset)[0]
+            self._scale = self._scale / norm
+            self._offset = self._offset / norm
+        else:
+            baseline = processing_step._get_baseline(data, self._scale,
+                                                     self._offset)
+            if baseline is None:
+                self._apply()
+                processing_step._fit_each_trace()
+            else:
+                self._offset = self._offset - baseline
+        return processing_step
+
+    def _apply(self):
+        """Scale and shift the data and add the pending history records."""
+        if not (_is_scalar(self._scale, 1) and _is_scalar(self._offset, 0)):
+            self.dataset.data.data = _scale_and_shift(
+                self.dataset.data.data, self._scale, self._offset)
+        for history_record in self._history_records:
+            self.dataset.append_history_record(history_record)
+        self._scale = 1
+        self._offset = 0
+        self._history_records = []
+
+
+def _prepare(processing_step, dataset):
+    """Assign the dataset to a processing step and check its parameters."""
+    # pylint: disable=protected-access
+    processing_step.dataset = dataset
+    processing_step._check_applicability()
+    processing_step._set_defaults()
+    processing_step._sanitise_parameters()
+
+
+def _needed_regions(steps, axes, region):
+    """Return the regions of the data needed before each step.
+
+    Regions are given as start and stop index for each axis, starting
+    with the region needed after the last step, *i.e.* for the range
+    extracted. Filters need margins of the size of their kernel, and
+    interpolations the neighbouring axis values of the values needed.
+    """
+    # pylint: disable=protected-access
+    regions = [region]
+    for processing_step, input_axes, output_axes in zip(
+            reversed(steps), reversed(axes[:-1]), reversed(axes[1:])):
+        region = list(regions[0])
+        if isinstance(processing_step, Filtering):
+            margin = processing_step._get_kernel(np.dtype(float))[0].size
+            for axis in processing_step._get_axes():
+                region[axis] = (max(region[axis][0] - margin, 0),
+                                min(region[axis][1] + margin,
+                                    input_axes[axis].size))
+        elif isinstance(processing_step, Interpolation):
+            region = [_bracket(values, output_values[start:stop])
+                      for values, output_values, (start, stop)
+                      in zip(input_axes, output_axes, region)]
+        regions.insert(0, region)
+    return regions
+
+
+class _GridInterpolation(Interpolation):
+    """Interpolation onto given axis values.
+
+    Used by pipelines to interpolate data restricted to the range needed
+    onto part of the axis values an interpolation step would use, giving
+    exactly the same result for this part.
+    """
+
+    def __init__(self, axis_values=None):
+        super().__init__()
+        self.axis_values = axis_values or []
+
+    def _sanitise_parameters(self):
+        pass
+
+    def _get_axis_values(self):
+        self._axis_values = list(self.axis_values)
+
+
+def _shadow(dataset):
+    """Return a dataset with the axes of a dataset, without actual data."""
+    shadow = uvvispy.dataset.CalculatedDataset()
+    shadow.data.data = np.broadcast_to(0., dataset.data.data.shape)
+    shadow.data.axes = copy.deepcopy(dataset.data.axes)
+    return shadow
+
+
+def _range_extraction(range_):
+    """Return a range extraction for ranges given as indices."""
+    range_extraction = RangeExtraction()
+    range_extraction.parameters["range"] = [
+        [int(index) for index in axis_range] for axis_range in range_]
+    return range_extraction
+
+
+def _is_monotonic(values):
+    """Check whether values are strictly increasing or decreasing."""
+    differences = np.diff(values)
+    return bool(np.all(differences > 0) or np.all(differences < 0))
+
+
+def _bracket(axis_values, values):
+    """Return the range of (monotonic) axis values to interpolate values.
+
+    The range includes the neighbouring axis values on both sides,
+    hence interpolating within the range gives the same result as
+    interpolating over all axis values.
     """
+    order = np.argsort(axis_values, kind='stable')
+    sorted_values = axis_values[order]
+    start = np.searchsorted(sorted_values, values.min(), side='right') - 2
+    stop = np.searchsorted(sorted_values, values.max(), side='left') + 2
+    indices = order[max(start, 0):min(stop, axis_values.size)]
+    return int(indices.min()), int(indices.max()) + 1
+
+
+def _scale_and_shift(data, scale=1, offset=0):
+    """Return data scaled and shifted, in place if possible."""
+    if data.dtype.kind != 'f' or not data.flags.writeable \
+            or np.broadcast(data, scale, offset).shape != data.shape:
+        return data * scale + offset
+    if not _is_scalar(scale, 1):
+        np.multiply(data, scale, out=data)
+    if not _is_scalar(offset, 0):
+        np.add(data, offset, out=data)
+    return data
@@ -0,0 +1,514 @@
+"""
+Stream: spectra acquired in real time.
+
+For kinetics, spectra are recorded one after the other, and waiting for
+the vendor software to export them delays any analysis until the
+experiment has finished. Instead, spectra can be consumed while the
+spectrometer produces them, using a :class:`uvvispy.stream.Stream`
+reading from a (local) socket or pipe.
+
+The most recent spectra are kept in a ring buffer of fixed size, backing
+the data of a two-dimensional dataset, with the wavelength as first and
+the time as second axis. Hence, the dataset grows with each spectrum
+received until the capacity of the buffer is reached, and afterwards
+always contains the most recent spectra, without ever reallocating the
+data. Processing steps, such as a baseline correction or filtering, can be
+applied to each spectrum as it arrives.
+
+A typical use case would look like this:
+
+.. code-block::
+
+    stream = uvvispy.stream.Stream(source='/run/spectrometer.sock')
+    stream.capacity = 500
+    stream.processing_steps = [uvvispy.processing.BaselineCorrection()]
+    stream.open()
+    while not stream.finished:
+        if stream.poll(timeout=1.):
+            plot(stream.dataset)
+    stream.close()
+
+For testing (and demonstration), a simulated spectrometer sending
+synthetic spectra is available as well:
+
+  * :class:`uvvispy.stream.SimulatedSpectrometer`
+
+
+Format of the stream
+====================
+
+The stream is a sequence of little-endian binary values. It starts with
+a header describing the wavelength axis, followed by the spectra:
+
+  * Header: the magic string ``UVSTREAM`` (8 bytes), the number of points
+    per spectrum (unsigned 32-bit integer), and the wavelengths (in nm, one
+    64-bit float per point)
+
+  * Each spectrum: the time (in s, 64-bit float) followed by the
+    absorbance values (one 64-bit float per point)
+
+The stream ends when the sender closes the socket or pipe.
+
+
+Module documentation
+====================
+"""
+
+import copy
+import os
+import select
+import socket
+import stat
+import struct
+import threading
+import time
+
+import aspecd.exceptions
+import aspecd.history
+import numpy as np
+
+import uvvispy.dataset
+
+_MAGIC = b'UVSTREAM'
+_HEADER = struct.Struct('<8sI')
+
+
+class RingBuffer:
+    """
+    Buffer of fixed size holding the most recent spectra.
+
+    Each spectrum is stored twice, at its position in the buffer and at
+    this position plus the capacity. Hence, the most recent spectra are
+    always available as one contiguous block in chronological order, and
+    :attr:`data` and :attr:`times` return views on the buffer rather than
+    copies, regardless of whether the buffer has wrapped around.
+
+    Parameters
+    ----------
+    n_points : :class:`int`
+        Number of points per spectrum
+
+    capacity : :class:`int`
+        Maximum number of spectra held
+
+    Attributes
+    ----------
+    n_points : :class:`int`
+        Number of points per spectrum
+
+    capacity : :class:`int`
+        Maximum number of spectra held
+
+    data : :class:`numpy.ndarray`
+        Spectra held, as columns, with the oldest spectrum first
+
+        Read-only view on the buffer, changing with each spectrum appended.
+
+    times : :class:`numpy.ndarray`
+        Times of the spectra held
+
+        Read-only view on the buffer, changing with each spectrum appended.
+
+    count : :class:`int`
+        Number of spectra held
+
+        Read-only
+
+    total : :class:`int`
+        Number of spectra appended in total
+
+        Read-only
+
+    """
+
+    def __init__(self, n_points=0, capacity=1000):
+        self.n_points = n_points
+        self.capacity = capacity
+        self._spectra = np.zeros((2 * capacity, n_points))
+        self._times = np.zeros(2 * capacity)
+        self._total = 0
+
+    @property
+    def count(self):
+        """Number of spectra held."""
+        return min(self._total, self.capacity)
+
+    @property
+    def total(self):
+        """Number of spectra appended in total."""
+        return self._total
+
+    @property
+    def data(self):
+        """Spectra held, as columns, with the oldest spectrum first."""
+        start = self._start()
+        return self._spectra[start:start + self.count].T
+
+    @property
+    def times(self):
+        """Times of the spectra held."""
+        start = self._start()
+        return self._times[start:start + self.count]
+
+    def append(self, values=None, time_=0.):
+        """Append a spectrum, dropping the oldest one if necessary.
+
+        Parameters
+        ----------
+        values : :class:`numpy.ndarray`
+            Values of the spectrum
+
+        time_ : :class:`float`
+            Time of the spectrum
+
+        """
+        position = self._total % self.capacity
+        for index in (position, position + self.capacity):
+            self._spectra[index] = values
+            self._times[index] = time_
+        self._total += 1
+
+    def _start(self):
+        if self._total <= self.capacity:
+            return 0
+        return self._total % self.capacity
+
+
+class Stream:
+    """
+    Spectra read from a socket or pipe while being acquired.
+
+    The spectra are read in the format described in the module
+    documentation and appended to a :class:`uvvispy.stream.RingBuffer`,
+    after applying the processing steps to each spectrum. The data of
+    :attr:`dataset` are a view on this buffer, updated with each call of
+    :meth:`poll`. To retain the data of a certain moment, copy the dataset.
+
+    Attributes
+    ----------
+    source : :class:`str`
+        Path of the (Unix domain) socket or named pipe to read from
+
+    capacity : :class:`int`
+        Maximum number of (most recent) spectra held in the dataset
+
+        Default: 1000
+
+    processing_steps : :class:`list`
+        Processing steps applied to each spectrum as it arrives
+
+        The steps need to retain the number of points of the spectra. A
+        history record for each step is added to the dataset when it is
+        created, *i.e.* on receiving the header of the stream.
+
+    interval : :class:`float`
+        Time (in seconds) to wait for new spectra in :meth:`run`
+
+        Default: 0.1
+
+    dataset : :class:`uvvispy.dataset.ExperimentalDataset`
+        Dataset holding the most recent spectra
+
+        None until the header of the stream has been received.
+
+    finished : :class:`bool`
+        Whether the sender has closed the stream
+
+    Raises
+    ------
+    aspecd.exceptions.MissingSourceError
+        Raised if neither a source nor a file is provided
+
+    ValueError
+        Raised if the data received are not a stream of spectra
+
+    """
+
+    def __init__(self, source=''):
+        self.source = source
+        self.capacity = 1000
+        self.processing_steps = []
+        self.interval = 0.1
+        self.dataset = None
+        self.finished = False
+        self._file = None
+        self._received = bytearray()
+        self._buffer = None
+        self._spectrum = None
+        self._steps = []
+
+    def open(self, file=None):
+        """Connect to the source, or use an already open file.
+
+        Parameters
+        ----------
+        file : :class:`io.RawIOBase`
+            Unbuffered binary file (or socket) to read from instead of
+            the source, such as the reading end of a pipe
+
+            Closed by :meth:`close`.
+
+        """
+        if file is None:
+            file = self._connect()
+        self._file = file
+        self.finished = False
+
+    def poll(self, timeout=0.):
+        """Read all spectra available, waiting for new ones if necessary.
+
+        Parameters
+        ----------
+        timeout : :class:`float`
+            Time (in seconds) to wait for new data
+
+        Returns
+        -------
+        count : :class:`int`
+            Number of spectra received during this call
+
+        """
+        if not self._file:
+            self.open()
+        file_descriptor = self._file.fileno()
+        while not self.finished \
+                and select.select([file_descriptor], [], [], timeout)[0]:
+            chunk = os.read(file_descriptor, 1 << 20)
+            if not chunk:
+                self.finished = True
+            self._received.extend(chunk)
+            timeout = 0.
+        if not self.dataset and not self._read_header():
+            return 0
+        return self._read_spectra()
+
+    def run(self, duration=None):
+        """Read spectra until the sender closes the stream.
+
+        Parameters
+        ----------
+        duration : :class:`float`
+            Time (in seconds) to run at most
+
+            If None, runs until the stream is finished.
+
+        """
+        start = time.monotonic()
+        while not self.finished and (
+                duration is None or time.monotonic() - start < duration):
+            self.poll(timeout=self.interval)
+
+    def close(self):
+        """Close the socket or pipe."""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _connect(self):
+        if not self.source:
+            raise aspecd.exceptions.MissingSourceError(
+                'A source is required for reading a stream')
+        if stat.S_ISSOCK(os.stat(self.source).st_mode):
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.connect(self.source)
+            return connection
+        # pylint: disable=consider-using-with
+        return open(self.source, 'rb', buffering=0)
+
+    def _read_header(self):
+        if len(self._received) < _HEADER.size:
+            return False
+        magic, n_points = _HEADER.unpack_from(self._received)
+        if magic != _MAGIC:
+            raise ValueError('Not a stream of spectra: %s' % self.source)
+        end = _HEADER.size + 8 * n_points
+        if len(self._received) < end:
+            return False
+        wavelengths = np.frombuffer(self._received, dtype='<f8',
+                                    count=n_points,
+                                    offset=_HEADER.size).copy()
+        del self._received[:end]
+        self._create_dataset(wavelengths)
+        return True
+
+    def _create_dataset(self, wavelengths):
+        self._buffer = RingBuffer(n_points=wavelengths.size,
+                                  capacity=self.capacity)
+        self.dataset = uvvispy.dataset.ExperimentalDataset()
+        self.dataset.data.data = self._buffer.data
+        self.dataset.data.axes[0].values = wavelengths
+        self.dataset.data.axes[0].quantity = "wavelength"
+        self.dataset.data.axes[0].unit = "nm"
+        self.dataset.data.axes[1].quantity = "time"
+        self.dataset.data.axes[1].unit = "s"
+        self.dataset.data.axes[2].quantity = "absorbance"
+        self.dataset.data.axes[2].unit = ""
+        self._spectrum = uvvispy.dataset.ExperimentalDataset()
+        self._spectrum.data.data = np.zeros(wavelengths.size)
+        self._spectrum.data.axes[0].quantity = "wavelength"
+        self._spectrum.data.axes[0].unit = "nm"
+        self._spectrum.data.axes[1].quantity = "absorbance"
+        # Copies, as the steps store the dataset they are applied to
+        self._steps = copy.deepcopy(self.processing_steps)
+        for processing_step in self._steps:
+            self.dataset.append_history_record(
+                aspecd.history.ProcessingHistoryRecord(
+                    package=self.dataset.package_name,
+                    processing_step=processing_step))
+
+    def _read_spectra(self):
+        n_values = self._buffer.n_points + 1
+        count = len(self._received) // (8 * n_values)
+        if not count:
+            return 0
+        # Copied, as the received data cannot be removed while viewed
+        frames = np.frombuffer(self._received, dtype='<f8',
+                               count=count * n_values).reshape(
+                                   count, n_values).copy()
+        del self._received[:count * n_values * 8]
+        for frame in frames:
+            self._buffer.append(self._process(frame[1:]), frame[0])
+        self.dataset.data.data = self._buffer.data
+        self.dataset.data.axes[1].values = self._buffer.times
+        return count
+
+    def _process(self, values):
+        if not self._steps:
+            return values
+        self._spectrum.data.data = values.copy()
+        self._spectrum.data.axes[0].values = \
+            self.dataset.data.axes[0].values.copy()
+        for step in self._steps:
+            step.process(self._spectrum, from_dataset=True)
+        return self._spectrum.data.data
+
+
+class SimulatedSpectrometer:
+    """
+    Spectrometer sending synthetic spectra of a kinetics experiment.
+
+    Each spectrum consists of a band decaying and a band rising
+    exponentially with time, on top of a constant baseline, plus some
+    noise. The spectra are sent in the format described in the module
+    documentation.
+
+    Attributes
+    ----------
+    wavelengths : :class:`numpy.ndarray`
+        Wavelengths (in nm) of the spectra
+
+        Default: 300 to 800 nm in steps of 1 nm
+
+    n_spectra : :class:`int`
+        Number of spectra to send
+
+        Default: 10
+
+    interval : :class:`float`
+        Time (in seconds) between two spectra
+
+        Spectra are sent with this delay, and their times are multiples
+        of the interval.
+
+        Default: 0
+
+    time_constant : :class:`float`
+        Time constant (in seconds) of the kinetics
+
+        Default: 10
+
+    baseline : :class:`float`
+        Constant offset of the spectra
+
+        Default: 0.05
+
+    """
+
+    def __init__(self):
+        self.wavelengths = np.arange(300., 801.)
+        self.n_spectra = 10
+        self.interval = 0.
+        self.time_constant = 10.
+        self.baseline = 0.05
+        self._random = np.random.default_rng(0)
+
+    def spectrum(self, time_=0.):
+        """Return the spectrum at a given time.
+
+        Parameters
+        ----------
+        time_ : :class:`float`
+            Time (in seconds) since the start of the kinetics
+
+        Returns
+        -------
+        spectrum : :class:`numpy.ndarray`
+            Absorbance values for the wavelengths
+
+        """
+        decay = np.exp(-time_ / self.time_constant)
+        spectrum = self.baseline + self._random.normal(
+            scale=0.001, size=self.wavelengths.size)
+        for position, width, amplitude in [(450, 30, decay),
+                                           (600, 40, 1 - decay)]:
+            spectrum += amplitude * np.exp(
+                -(self.wavelengths - position) ** 2 / (2 * width ** 2))
+        return spectrum
+
+    def send(self, file=None):
+        """Send header and spectra.
+
+        Parameters
+        ----------
+        file : :class:`io.RawIOBase`
+            Binary file (or socket) to write to, such as the writing end
+            of a pipe
+
+        """
+        write = file.sendall if isinstance(file, socket.socket) \
+            else file.write
+        write(_HEADER.pack(_MAGIC, self.wavelengths.size)
+              + self.wavelengths.astype('<f8').tobytes())
+        for number in range(self.n_spectra):
+            if number and self.interval:
+                time.sleep(self.interval)
+            time_ = number * self.interval
+            write(np.concatenate([[time_], self.spectrum(time_)]).astype(
+                '<f8').tobytes())
+            if hasattr(file, 'flush'):
+                file.flush()
+
+    def serve(self, path=''):
+        """Send the spectra to the first client connecting to a socket.
+
+        The (Unix domain) socket is created before returning, hence
+        clients can connect right away. Sending is done in a separate
+        thread, and the socket removed afterwards.
+
+        Parameters
+        ----------
+        path : :class:`str`
+            Path of the socket to create
+
+        Returns
+        -------
+        thread : :class:`threading.Thread`
+            Thread sending the spectra
+
+        """
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(1)
+
+        def send():
+            try:
+                connection, _ = server.accept()
+                with connection:
+                    self.send(connection)
+            finally:
+                server.close()
+                os.remove(path)
+
+        thread = threading.Thread(target=send, daemon=True)
+        thread.start()
+        return thread